@@ -1,14 +1,49 @@
 from __future__ import annotations
 
+from collections import deque
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QObject, Property, QThread, QUrl, Signal, Slot
+from PySide6.QtCore import QObject, Property, QThread, QThreadPool, QUrl, Signal, Slot
 from PySide6.QtGui import QDesktopServices, QGuiApplication
 
 from app.models import PreviewModel, SuspectModel
-from app.worker import PipelineWorker, ValidationWorker
+from app.worker import PipelineWorker, ValidationTask
+from core.checkpoint import has_checkpoint
 from core.config import ColumnOverrides, Config
+from core.io.meta_cache import default_meta_cache
+from core.normalize.phone import CachedPhoneNormalizer
+
+# With "Salvar pontos de retomada" on, runs save a checkpoint this often so
+# "Retomar" can pick them up. Each save pickles the whole dedupe index
+# (plus once when reading ends), which pauses large runs and costs disk.
+CHECKPOINT_INTERVAL_S = 60.0
+LOG_MAX_LINES = 200
+PREVIEW_LIMIT = 50
+FAST_SCAN_LIMIT_BYTES = 200_000_000
+
+
+def _format_count(value: float) -> str:
+    return f"{int(value):,}".replace(",", ".")
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def format_progress(info: dict[str, Any]) -> str:
+    """Status line for a ``ProgressUpdate.as_dict()`` payload."""
+    rows = _format_count(info["rows"])
+    if info.get("rows_total"):
+        rows = f"{rows} de {_format_count(info['rows_total'])}"
+    parts = [f"{info['stage']}: {rows} linhas ({info['percent']}%)"]
+    if info.get("rows_per_s"):
+        parts.append(f"{_format_count(info['rows_per_s'])} linhas/s")
+    if info.get("eta_s") is not None:
+        parts.append(f"faltam ~{_format_duration(info['eta_s'])}")
+    return " · ".join(parts)
 
 
 class Controller(QObject):
@@ -16,7 +51,12 @@ class Controller(QObject):
     configChanged = Signal()
     overridesChanged = Signal()
     stateChanged = Signal()
+    statusChanged = Signal()
+    progressChanged = Signal()
     logChanged = Signal()
+    # Incremental log delivery: QML appends lines instead of re-reading logText.
+    logAppended = Signal(str)
+    logCleared = Signal()
     validationChanged = Signal()
     reportChanged = Signal()
 
@@ -37,6 +77,7 @@ class Controller(QObject):
         self._rename_phone_like_names = True
         self._explode_phones = True
         self._fallback_prefix = "Cliente"
+        self._checkpoint_enabled = False
 
         self._col_name = ""
         self._col_phone = ""
@@ -48,8 +89,9 @@ class Controller(QObject):
 
         self._busy = False
         self._progress = 0
+        self._progress_info: dict[str, Any] = {}
         self._status = ""
-        self._log_lines: list[str] = []
+        self._log_lines: deque[str] = deque(maxlen=LOG_MAX_LINES)
 
         self._validation_result: dict[str, Any] = {}
         self._validation_error = ""
@@ -60,6 +102,8 @@ class Controller(QObject):
         self._report_outputs: list[str] = []
         self._report_path = ""
         self._summary_text = ""
+        self._suspect_reasons: list[str] = []
+        self._suspect_sources: list[str] = []
 
         self._preview_model = PreviewModel()
         self._suspects_model = SuspectModel()
@@ -67,8 +111,14 @@ class Controller(QObject):
         self._worker_thread: QThread | None = None
         self._worker: PipelineWorker | None = None
 
-        self._validation_thread: QThread | None = None
-        self._validation_worker: ValidationWorker | None = None
+        # One pool for every validation; CRM and Google are scanned side by side.
+        self._validation_pool = QThreadPool(self)
+        self._validation_pool.setMaxThreadCount(2)
+        self._validation_tasks: dict[str, ValidationTask] = {}
+        # Cancelled tasks keep their Python wrapper (and signals) alive
+        # until they emit ``done``; the pool does not own them.
+        self._finishing_tasks: dict[tuple[int, str], ValidationTask] = {}
+        self._validation_generation = 0
 
     def _set_attr(self, name: str, value: Any, signal: Signal) -> None:
         if getattr(self, name) == value:
@@ -80,8 +130,11 @@ class Controller(QObject):
         if not message:
             return
         self._log_lines.append(message)
-        if len(self._log_lines) > 200:
-            self._log_lines = self._log_lines[-200:]
+        self.logAppended.emit(message)
+
+    def _clear_log(self) -> None:
+        self._log_lines.clear()
+        self.logCleared.emit()
         self.logChanged.emit()
 
     def _build_config(self) -> Config:
@@ -99,6 +152,7 @@ class Controller(QObject):
             rename_phone_like_names=self._rename_phone_like_names,
             explode_phones=self._explode_phones,
             fallback_prefix=self._fallback_prefix,
+            checkpoint_interval=CHECKPOINT_INTERVAL_S if self._checkpoint_enabled else 0.0,
         )
 
     def _build_overrides(self) -> ColumnOverrides:
@@ -116,7 +170,7 @@ class Controller(QObject):
         self._set_attr("_busy", value, self.stateChanged)
 
     def _set_status(self, value: str) -> None:
-        self._set_attr("_status", value, self.stateChanged)
+        self._set_attr("_status", value, self.statusChanged)
 
     def _reset_report(self) -> None:
         self._report_counts = {}
@@ -124,6 +178,8 @@ class Controller(QObject):
         self._report_outputs = []
         self._report_path = ""
         self._summary_text = ""
+        self._suspect_reasons = []
+        self._suspect_sources = []
         self._suspects_model.clear()
         self.reportChanged.emit()
 
@@ -133,6 +189,8 @@ class Controller(QObject):
 
     @crmPath.setter
     def crmPath(self, value: str) -> None:
+        if value != self._crm_path:
+            self._cancel_validation()
         self._set_attr("_crm_path", value, self.pathsChanged)
 
     @Property(str, notify=pathsChanged)
@@ -141,6 +199,8 @@ class Controller(QObject):
 
     @googlePath.setter
     def googlePath(self, value: str) -> None:
+        if value != self._google_path:
+            self._cancel_validation()
         self._set_attr("_google_path", value, self.pathsChanged)
 
     @Property(str, notify=pathsChanged)
@@ -150,6 +210,7 @@ class Controller(QObject):
     @outDir.setter
     def outDir(self, value: str) -> None:
         self._set_attr("_out_dir", value, self.pathsChanged)
+        self.stateChanged.emit()
 
     @Property(str, notify=configChanged)
     def ddiDefault(self) -> str:
@@ -239,6 +300,14 @@ class Controller(QObject):
     def protectGoodName(self, value: bool) -> None:
         self._set_attr("_protect_good_name", value, self.configChanged)
 
+    @Property(bool, notify=configChanged)
+    def checkpointEnabled(self) -> bool:
+        return self._checkpoint_enabled
+
+    @checkpointEnabled.setter
+    def checkpointEnabled(self, value: bool) -> None:
+        self._set_attr("_checkpoint_enabled", value, self.configChanged)
+
     @Property(str, notify=overridesChanged)
     def colName(self) -> str:
         return self._col_name
@@ -299,18 +368,31 @@ class Controller(QObject):
     def busy(self) -> bool:
         return self._busy
 
-    @Property(int, notify=stateChanged)
+    @Property(int, notify=progressChanged)
     def progress(self) -> int:
         return self._progress
 
-    @Property(str, notify=stateChanged)
+    @Property("QVariantMap", notify=progressChanged)
+    def progressInfo(self) -> dict[str, Any]:
+        return self._progress_info
+
+    @Property(str, notify=statusChanged)
     def status(self) -> str:
         return self._status
 
+    @Property(bool, notify=stateChanged)
+    def canResume(self) -> bool:
+        return not self._busy and bool(self._out_dir) and has_checkpoint(self._out_dir)
+
     @Property(str, notify=logChanged)
     def logText(self) -> str:
+        """Full log, for the initial fill; later lines come via logAppended."""
         return "\n".join(self._log_lines)
 
+    @Property(int, constant=True)
+    def logMaxLines(self) -> int:
+        return LOG_MAX_LINES
+
     @Property("QVariantMap", notify=validationChanged)
     def validationResult(self) -> dict[str, Any]:
         return self._validation_result
@@ -343,6 +425,14 @@ class Controller(QObject):
     def reportOutputs(self) -> list[str]:
         return self._report_outputs
 
+    @Property("QVariantList", notify=reportChanged)
+    def suspectReasons(self) -> list[str]:
+        return self._suspect_reasons
+
+    @Property("QVariantList", notify=reportChanged)
+    def suspectSources(self) -> list[str]:
+        return self._suspect_sources
+
     @Property(str, notify=reportChanged)
     def reportPath(self) -> str:
         return self._report_path
@@ -355,6 +445,7 @@ class Controller(QObject):
     def validateInputs(self) -> None:
         if self._busy:
             return
+        self._cancel_validation()
         if not self._crm_path and not self._google_path:
             self._validation_error = "Selecione o CSV do CRM ou do Google."
             self._validation_result = {}
@@ -371,23 +462,43 @@ class Controller(QObject):
         overrides = self._build_overrides()
         self._set_status("Validando entradas...")
 
-        self._validation_thread = QThread()
-        self._validation_worker = ValidationWorker(
-            crm_path=self._crm_path or None,
-            google_path=self._google_path or None,
-            config=config,
-            overrides=overrides,
-            preview_limit=50,
-            fast_scan_limit_bytes=5_000_000,
-        )
-        self._validation_worker.moveToThread(self._validation_thread)
-        self._validation_thread.started.connect(self._validation_worker.run)
-        self._validation_worker.finished.connect(self._on_validation_finished)
-        self._validation_worker.error.connect(self._on_validation_error)
-        self._validation_worker.finished.connect(self._validation_thread.quit)
-        self._validation_worker.finished.connect(self._validation_worker.deleteLater)
-        self._validation_thread.finished.connect(self._validation_thread.deleteLater)
-        self._validation_thread.start()
+        generation = self._validation_generation
+        phone_normalizer = CachedPhoneNormalizer(config.phone_cache_size)
+        meta_cache = default_meta_cache()
+        for source, path in (("crm", self._crm_path), ("google", self._google_path)):
+            if not path:
+                continue
+            task = ValidationTask(
+                generation=generation,
+                source=source,
+                path=path,
+                config=config,
+                overrides=overrides,
+                # The preview shows CRM rows when there is a CRM file.
+                preview_limit=0 if source == "google" and self._crm_path else PREVIEW_LIMIT,
+                fast_scan_limit_bytes=FAST_SCAN_LIMIT_BYTES,
+                phone_normalizer=phone_normalizer,
+                meta_cache=meta_cache,
+            )
+            task.signals.previewReady.connect(self._on_validation_preview)
+            task.signals.countsReady.connect(self._on_validation_counts)
+            task.signals.failed.connect(self._on_validation_error)
+            task.signals.done.connect(self._on_validation_done)
+            self._validation_tasks[source] = task
+            self._validation_pool.start(task)
+
+    def _cancel_validation(self) -> None:
+        """Stop running scans; anything they still emit is ignored."""
+        generation = self._validation_generation
+        self._validation_generation += 1
+        if not self._validation_tasks:
+            return
+        for source, task in self._validation_tasks.items():
+            task.cancel()
+            self._finishing_tasks[(generation, source)] = task
+        self._validation_tasks = {}
+        self._reset_validation()
+        self._set_status("Validação cancelada.")
 
     @Slot(QUrl)
     def setCrmPathFromUrl(self, url: QUrl) -> None:
@@ -423,7 +534,11 @@ class Controller(QObject):
     def startRun(self) -> None:
         self._start_pipeline(dry_run=False)
 
-    def _start_pipeline(self, dry_run: bool) -> None:
+    @Slot()
+    def resumeRun(self) -> None:
+        self._start_pipeline(dry_run=False, resume=True)
+
+    def _start_pipeline(self, dry_run: bool, resume: bool = False) -> None:
         if self._busy:
             return
         if not self._crm_path and not self._google_path:
@@ -433,10 +548,11 @@ class Controller(QObject):
             self._set_status("Selecione a pasta de saída.")
             return
         self._set_busy(True)
-        self._set_attr("_progress", 0, self.stateChanged)
+        self._progress = 0
+        self._progress_info = {}
+        self.progressChanged.emit()
         self._set_status("Iniciando processamento...")
-        self._log_lines = []
-        self.logChanged.emit()
+        self._clear_log()
         self._reset_report()
 
         config = self._build_config()
@@ -450,6 +566,7 @@ class Controller(QObject):
             config=config,
             overrides=overrides,
             dry_run=dry_run,
+            resume=resume,
         )
         self._worker.moveToThread(self._worker_thread)
         self._worker_thread.started.connect(self._worker.run)
@@ -491,26 +608,37 @@ class Controller(QObject):
         clipboard = QGuiApplication.clipboard()
         clipboard.setText(self._summary_text)
 
-    def _on_validation_finished(self, result: dict[str, Any]) -> None:
-        self._validation_result = result
-        self._validation_error = ""
-        self._preview_has_mojibake = bool(result.get("preview_has_mojibake"))
-        preview_rows = result.get("preview_rows", [])
-        formatted_rows = []
-        for row in preview_rows:
-            formatted_rows.append({
-                "name": row.get("name", ""),
-                "ddi": row.get("ddi", ""),
-                "phone": row.get("phone", ""),
-                "tags": row.get("tags", ""),
-                "created": row.get("created", ""),
-            })
-        self._preview_model.set_items(formatted_rows)
-        if result.get("crm") is None and result.get("google") is not None:
+    def _on_validation_preview(self, generation: int, source: str, payload: dict[str, Any]) -> None:
+        if generation != self._validation_generation:
+            return
+        self._validation_result = {**self._validation_result, source: payload["info"]}
+        if source == "crm" or not self._crm_path:
+            self._preview_has_mojibake = bool(payload.get("preview_has_mojibake"))
+            self._preview_model.set_items(payload.get("preview_rows", []))
+        self._set_status("Prévia pronta; contando linhas...")
+        self.validationChanged.emit()
+
+    def _on_validation_counts(self, generation: int, source: str, counts: dict[str, Any]) -> None:
+        if generation != self._validation_generation:
+            return
+        # Same keys as before: crm_line_count, google_duplicates, ...
+        self._validation_result = {
+            **self._validation_result,
+            **{f"{source}_{key}": value for key, value in counts.items()},
+        }
+        self.validationChanged.emit()
+
+    def _on_validation_done(self, generation: int, source: str) -> None:
+        self._finishing_tasks.pop((generation, source), None)
+        if generation != self._validation_generation:
+            return
+        self._validation_tasks.pop(source, None)
+        if self._validation_tasks or self._validation_error:
+            return
+        if self._validation_result.get("crm") is None and self._validation_result.get("google") is not None:
             self._set_status("Validação concluída (somente Google).")
         else:
             self._set_status("Validação concluída.")
-        self.validationChanged.emit()
 
     def _reset_validation(self) -> None:
         self._validation_result = {}
@@ -519,15 +647,19 @@ class Controller(QObject):
         self._preview_model.clear()
         self.validationChanged.emit()
 
-    def _on_validation_error(self, message: str) -> None:
+    def _on_validation_error(self, generation: int, source: str, message: str) -> None:
+        if generation != self._validation_generation:
+            return
         self._validation_error = message
         self._preview_has_mojibake = False
         self._set_status("Falha na validação.")
         self.validationChanged.emit()
 
-    def _on_progress(self, percent: int, status: str) -> None:
-        self._set_attr("_progress", percent, self.stateChanged)
-        self._set_status(status)
+    def _on_progress(self, info: dict[str, Any]) -> None:
+        self._progress = int(info.get("percent", 0))
+        self._progress_info = info
+        self.progressChanged.emit()
+        self._set_status(format_progress(info))
 
     def _on_finished(self, report: dict[str, Any]) -> None:
         self._set_busy(False)
@@ -537,20 +669,11 @@ class Controller(QObject):
         self._report_outputs = report.get("outputs", [])
         out_dir = Path(self._out_dir)
         self._report_path = str(out_dir / "report.json")
-        self._suspects_model.set_items(
-            [
-                {
-                    "reason": item.get("reason", ""),
-                    "source": item.get("source", ""),
-                    "raw_phone": item.get("raw_phone", ""),
-                    "normalized_phone": item.get("normalized_phone", ""),
-                    "name": item.get("name", ""),
-                    "suggested_fix": item.get("suggested_fix", "") or "",
-                    "line": str(item.get("line", "")),
-                }
-                for item in report.get("suspects", [])
-            ]
-        )
+        # The report only carries aggregates; rows are paged from suspects.jsonl.
+        suspects = report.get("suspects", {})
+        self._suspect_reasons = list(suspects.get("by_reason", {}))
+        self._suspect_sources = list(suspects.get("by_source", {}))
+        self._suspects_model.load(suspects.get("file", ""))
         self._summary_text = self._build_summary_text(report)
         self.reportChanged.emit()
 
@@ -561,6 +684,8 @@ class Controller(QObject):
 
     def _on_cancelled(self) -> None:
         self._append_log("Execução cancelada pelo usuário.")
+        if self._out_dir and has_checkpoint(self._out_dir):
+            self._append_log("Progresso salvo; use Retomar para continuar.")
         self._set_status("Cancelado.")
         self._set_busy(False)
 
@@ -573,8 +698,10 @@ class Controller(QObject):
             f"Contatos explodidos: {counts.get('contacts_exploded_total', 0)}",
             f"Duplicados fundidos: {counts.get('duplicates_merged', 0)}",
             f"Suspeitos: {counts.get('suspects', 0)}",
-            f"Arquivos gerados: {counts.get('output_files', 0)}",
         ]
+        for reason, total in report.get("suspects", {}).get("by_reason", {}).items():
+            lines.append(f"  {reason}: {total}")
+        lines.append(f"Arquivos gerados: {counts.get('output_files', 0)}")
         warnings = report.get("warnings", [])
         if warnings:
             lines.append("Avisos:")
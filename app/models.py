@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Slot
+
+from core.io.suspects import SuspectIndex
 
 
 class SimpleListModel(QAbstractListModel):
@@ -55,9 +59,103 @@ class PreviewModel(SimpleListModel):
         )
 
 
-class SuspectModel(SimpleListModel):
+class SuspectModel(QAbstractListModel):
+    """Suspects paged lazily from ``suspects.jsonl`` through ``SuspectIndex``.
+
+    Views only call ``fetchMore`` when they scroll near the end, so opening
+    the audit list reads one page regardless of how many suspects exist.
+    Recently shown rows are kept in a small cache.
+    """
+
+    PAGE_SIZE = 200
+    CACHE_SIZE = 1024
+    ROLES = ["reason", "source", "raw_phone", "normalized_phone", "name", "suggested_fix", "line"]
+
     def __init__(self, parent=None) -> None:
-        super().__init__(
-            ["reason", "source", "raw_phone", "normalized_phone", "name", "suggested_fix", "line"],
-            parent,
-        )
+        super().__init__(parent)
+        self._index: SuspectIndex | None = None
+        self._rows = 0
+        self._cache: OrderedDict[int, dict[str, str]] = OrderedDict()
+        self._reason = ""
+        self._source = ""
+        self._sort_key = ""
+        self._descending = False
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        return self._rows
+
+    def roleNames(self) -> dict[int, bytes]:  # noqa: N802
+        return {Qt.UserRole + idx: role.encode("utf-8") for idx, role in enumerate(self.ROLES, start=1)}
+
+    def data(self, index: QModelIndex, role: int):  # noqa: N802
+        if not index.isValid() or self._index is None:
+            return None
+        row = index.row()
+        role_idx = role - Qt.UserRole - 1
+        if row < 0 or row >= self._rows or not 0 <= role_idx < len(self.ROLES):
+            return None
+        item = self._cache.get(row)
+        if item is None:
+            item = self._index.item(row)
+            self._cache[row] = item
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        value = item.get(self.ROLES[role_idx], "")
+        return "" if value is None else str(value)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:  # noqa: N802
+        if parent.isValid() or self._index is None:
+            return False
+        return self._index.available() > self._rows or self._index.can_fetch_more()
+
+    def fetchMore(self, parent=QModelIndex()) -> None:  # noqa: N802
+        if parent.isValid() or self._index is None:
+            return
+        if self._index.available() <= self._rows:
+            self._index.fetch(self.PAGE_SIZE)
+        total = min(self._index.available(), self._rows + self.PAGE_SIZE)
+        if total <= self._rows:
+            return
+        self.beginInsertRows(QModelIndex(), self._rows, total - 1)
+        self._rows = total
+        self.endInsertRows()
+
+    def _reset(self) -> None:
+        self.beginResetModel()
+        self._rows = 0
+        self._cache.clear()
+        if self._index is not None:
+            self._index.set_view(self._reason or None, self._source or None, self._sort_key or None, self._descending)
+        self.endResetModel()
+
+    def load(self, path: str) -> None:
+        """Show ``path`` unfiltered, in file order."""
+        self.close()
+        self._index = SuspectIndex(path) if path else None
+        self._reason = ""
+        self._source = ""
+        self._sort_key = ""
+        self._descending = False
+        self._reset()
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def clear(self) -> None:
+        self.load("")
+
+    @Slot(str, str)
+    def setFilter(self, reason: str, source: str) -> None:  # noqa: N802
+        self._reason = reason
+        self._source = source
+        self._reset()
+
+    @Slot(str, bool)
+    def setSort(self, key: str, descending: bool) -> None:  # noqa: N802
+        self._sort_key = key
+        self._descending = descending
+        self._reset()
@@ -0,0 +1,83 @@
+"""Bytes per contact for the legacy and current ``Contact`` representations.
+
+Usage: ``python -m benchmarks.contact_memory --contacts 1000000``
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable
+
+from core.models import Contact, LabelInterner
+
+
+@dataclass
+class LegacyContact:
+    """Replica of the pre-slots model: own ``__dict__``, list and sets."""
+
+    name: str
+    phone: str
+    notes: list[str] = field(default_factory=list)
+    labels: set[str] = field(default_factory=set)
+    sources: set[str] = field(default_factory=set)
+
+
+def _build_legacy(count: int, label: str) -> list[Any]:
+    return [
+        LegacyContact(name=f"Cliente {idx}", phone=f"55119{idx:08d}", notes=[], labels={label}, sources={"crm"})
+        for idx in range(count)
+    ]
+
+
+def _build_current(count: int, label: str) -> list[Any]:
+    intern_labels = LabelInterner()
+    sources = intern_labels({"crm"})
+    return [
+        Contact(
+            name=f"Cliente {idx}",
+            phone=f"55119{idx:08d}",
+            notes=(),
+            labels=intern_labels({label}),
+            sources=sources,
+        )
+        for idx in range(count)
+    ]
+
+
+def measure_bytes_per_contact(builder: Callable[[int, str], list[Any]], count: int, label: str = "CRM_2025") -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        contacts = builder(count, label)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del contacts
+    return current / max(1, count)
+
+
+def run(count: int) -> dict[str, Any]:
+    legacy = measure_bytes_per_contact(_build_legacy, count)
+    current = measure_bytes_per_contact(_build_current, count)
+    return {
+        "scenario": "contact_memory",
+        "contacts": count,
+        "legacy_bytes_per_contact": round(legacy, 1),
+        "current_bytes_per_contact": round(current, 1),
+        "saved_ratio": round(1 - current / legacy, 3) if legacy else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure bytes per contact")
+    parser.add_argument("--contacts", type=int, default=1_000_000, help="Contacts to allocate")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.contacts), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""Deterministic synthetic CRM and Google Contacts CSVs.
+
+Usage: ``python -m benchmarks.generate crm crm.csv --rows 100000 --duplicate-ratio 0.2``
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import dataclass
+import random
+from pathlib import Path
+
+FIRST_NAMES = (
+    "Maria", "José", "Ana", "João", "Antônio", "Francisca", "Carlos", "Márcia",
+    "Paulo", "Adriana", "Lucas", "Juliana", "Luís", "Fernanda", "Sérgio", "Patrícia",
+)
+LAST_NAMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Conceição", "Pereira", "Lima", "Gonçalves",
+    "Araújo", "Ribeiro", "Almeida", "Magalhães", "Simões", "Brandão", "Carvalho", "Gomes",
+)
+AREA_CODES = ("11", "21", "31", "41", "48", "51", "61", "71", "81", "85")
+TAGS = ("", "VIP", "Lead", "Cliente", "Inativo")
+
+CRM_HEADERS = ["Nome", "Telefone", "DDI", "Tags", "Criado em", "Notas"]
+GOOGLE_HEADERS = [
+    "Name",
+    "Given Name",
+    "Additional Name",
+    "Family Name",
+    "Phone 1 - Type",
+    "Phone 1 - Value",
+    "Notes",
+    "Group Membership",
+]
+
+
+@dataclass(frozen=True)
+class GeneratorSpec:
+    rows: int = 10_000
+    extra_columns: int = 0
+    duplicate_ratio: float = 0.1
+    multi_phone_ratio: float = 0.1
+    mojibake_ratio: float = 0.02
+    encoding: str = "utf-8"
+    seed: int = 42
+
+
+def _phone(rng: random.Random) -> str:
+    area = rng.choice(AREA_CODES)
+    number = rng.randrange(10_000_000, 100_000_000)
+    style = rng.randrange(4)
+    if style == 0:
+        return f"({area}) 9{number // 10_000:04d}-{number % 10_000:04d}"
+    if style == 1:
+        return f"{area}9{number}"
+    if style == 2:
+        return f"+55 {area} 9{number // 10_000:04d}-{number % 10_000:04d}"
+    return f"{area} 9{number}"
+
+
+def _name(rng: random.Random, spec: GeneratorSpec) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    if rng.random() < spec.mojibake_ratio:
+        # UTF-8 bytes read as cp1252, the usual "JoÃ£o" damage.
+        return name.encode("utf-8").decode("cp1252", errors="replace")
+    return name
+
+
+class _PhonePicker:
+    """Fresh phones, or with ``duplicate_ratio`` one already handed out."""
+
+    def __init__(self, rng: random.Random, spec: GeneratorSpec) -> None:
+        self._rng = rng
+        self._spec = spec
+        self._used: list[str] = []
+
+    def __call__(self) -> str:
+        rng = self._rng
+        if self._used and rng.random() < self._spec.duplicate_ratio:
+            phone = rng.choice(self._used)
+        else:
+            phone = _phone(rng)
+            self._used.append(phone)
+        if rng.random() < self._spec.multi_phone_ratio:
+            phone = f"{phone} ::: {_phone(rng)}"
+        return phone
+
+
+def _write(path: str | Path, headers: list[str], rows, spec: GeneratorSpec, delimiter: str) -> Path:
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding=spec.encoding, errors="replace", newline="") as handle:
+        writer = csv.writer(handle, delimiter=delimiter)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    return output
+
+
+def generate_crm_csv(path: str | Path, spec: GeneratorSpec, delimiter: str = ";") -> Path:
+    rng = random.Random(spec.seed)
+    pick_phone = _PhonePicker(rng, spec)
+    headers = CRM_HEADERS + [f"Extra {idx + 1}" for idx in range(spec.extra_columns)]
+
+    def rows():
+        for idx in range(spec.rows):
+            row = [
+                _name(rng, spec),
+                pick_phone(),
+                "55" if rng.random() < 0.3 else "",
+                rng.choice(TAGS),
+                f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                "" if rng.random() < 0.8 else f"Observação {idx}",
+            ]
+            row.extend(f"valor {idx}-{col}" for col in range(spec.extra_columns))
+            yield row
+
+    return _write(path, headers, rows(), spec, delimiter)
+
+
+def generate_google_csv(path: str | Path, spec: GeneratorSpec) -> Path:
+    rng = random.Random(spec.seed + 1)
+    pick_phone = _PhonePicker(rng, spec)
+    headers = GOOGLE_HEADERS + [f"Custom Field {idx + 1}" for idx in range(spec.extra_columns)]
+
+    def rows():
+        for idx in range(spec.rows):
+            name = _name(rng, spec)
+            given, _, family = name.partition(" ")
+            row = [name, given, "", family, "Mobile", pick_phone(), "", "* myContacts"]
+            row.extend(f"valor {idx}-{col}" for col in range(spec.extra_columns))
+            yield row
+
+    return _write(path, headers, rows(), spec, ",")
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = GeneratorSpec()
+    parser.add_argument("--rows", type=int, default=defaults.rows, help="Data rows per file")
+    parser.add_argument("--extra-columns", type=int, default=defaults.extra_columns, help="Unused extra columns")
+    parser.add_argument("--duplicate-ratio", type=float, default=defaults.duplicate_ratio)
+    parser.add_argument("--multi-phone-ratio", type=float, default=defaults.multi_phone_ratio)
+    parser.add_argument("--mojibake-ratio", type=float, default=defaults.mojibake_ratio)
+    parser.add_argument("--encoding", default=defaults.encoding, help="File encoding (utf-8, cp1252, ...)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> GeneratorSpec:
+    return GeneratorSpec(
+        rows=args.rows,
+        extra_columns=args.extra_columns,
+        duplicate_ratio=args.duplicate_ratio,
+        multi_phone_ratio=args.multi_phone_ratio,
+        mojibake_ratio=args.mojibake_ratio,
+        encoding=args.encoding,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic contact CSVs")
+    parser.add_argument("kind", choices=("crm", "google"))
+    parser.add_argument("output", help="CSV path to write")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    spec = spec_from_args(args)
+    if args.kind == "crm":
+        generate_crm_csv(args.output, spec)
+    else:
+        generate_google_csv(args.output, spec)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,387 @@
+"""Timed pipeline scenarios with rows/sec and peak RSS, comparable to a baseline.
+
+Usage::
+
+    python -m benchmarks.suite --rows 200000 --output bench.json
+    python -m benchmarks.suite --rows 200000 --baseline bench.json
+
+Each scenario runs in a fresh process so its peak RSS is its own;
+``contact_memory`` also reports bytes per contact for the legacy and
+current models (``--contacts`` sets how many). The
+import time of ``core.cli`` (``python -X importtime``) is tracked alongside.
+With ``--baseline`` the run exits with status 1 when a scenario's rows/sec
+drops, or an import gets slower, by more than ``--tolerance`` against the
+stored result.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict
+import functools
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Any, Callable
+
+from benchmarks import contact_memory
+from benchmarks.generate import GeneratorSpec, add_spec_arguments, generate_crm_csv, generate_google_csv, spec_from_args
+from core.config import ColumnOverrides, Config
+from core.io.columns import resolve_crm_columns
+from core.io.read_csv import iter_csv_projected, prepare_csv
+from core.io.write_google_csv import write_google_csv_batches
+from core.merge.dedupe import ContactIndex
+from core.models import Contact
+from core.normalize.text import MojibakeAnalyzer
+from core.pipeline import run_pipeline
+from core.rows import RowNormalizer, iter_row_batches
+from core.timing import peak_rss_mb
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+IMPORT_TARGETS = ("core.cli",)
+# Optional or heavy modules the CLI should only import when a run needs them.
+LAZY_MODULES = ("ftfy", "PySide6", "sqlite3", "multiprocessing", "cProfile")
+# Contacts allocated by the ``contact_memory`` scenario; its own script
+# defaults to the 1M run, the suite keeps it quick.
+DEFAULT_CONTACTS = 50_000
+
+
+def _crm_normalizer(crm_path: Path, config: Config):
+    meta = prepare_csv(crm_path)
+    columns = resolve_crm_columns(meta.headers, ColumnOverrides())
+    return meta, RowNormalizer("crm", columns, config)
+
+
+def _normalized_rows(crm_path: Path, config: Config):
+    meta, normalizer = _crm_normalizer(crm_path, config)
+    rows = iter_csv_projected(meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields)
+    return [
+        result
+        for batch in iter_row_batches((line_num, values) for line_num, values, _ in rows)
+        for result in normalizer.normalize_many(batch)
+    ]
+
+
+def _contacts(crm_path: Path, config: Config) -> list[Contact]:
+    return [
+        Contact(name=result.name, phone=entry.normalized)
+        for result in _normalized_rows(crm_path, config)
+        for entry in result.phone_entries
+    ]
+
+
+def scenario_read(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    meta, normalizer = _crm_normalizer(inputs["crm"], config)
+
+    def run() -> int:
+        rows = iter_csv_projected(meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields)
+        return sum(1 for _ in rows)
+
+    return run
+
+
+def scenario_normalize(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    meta, normalizer = _crm_normalizer(inputs["crm"], config)
+    rows = iter_csv_projected(meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields)
+    batches = list(iter_row_batches((line_num, values) for line_num, values, _ in rows))
+
+    def run() -> int:
+        for batch in batches:
+            normalizer.normalize_many(batch)
+        return sum(len(batch) for batch in batches)
+
+    return run
+
+
+def scenario_mojibake(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    names = [result.raw_name for result in _normalized_rows(inputs["crm"], config)]
+
+    def run() -> int:
+        analyze = MojibakeAnalyzer(config.mojibake_cache_size)
+        for name in names:
+            analyze(name)
+        return len(names)
+
+    return run
+
+
+def scenario_dedupe(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    contacts = _contacts(inputs["crm"], config)
+
+    def run() -> int:
+        index = ContactIndex(config.treat_dot_as_empty, config.protect_good_name, config.dedupe_spill_threshold)
+        for contact in contacts:
+            index.add(Contact(name=contact.name, phone=contact.phone))
+        for _ in index.iter_sorted():
+            pass
+        index.close()
+        return len(contacts)
+
+    return run
+
+
+def scenario_write(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    contacts = _contacts(inputs["crm"], config)
+
+    def run() -> int:
+        write_google_csv_batches(contacts, work_dir / "write", config)
+        return len(contacts)
+
+    return run
+
+
+def scenario_end_to_end(inputs: dict[str, Path], config: Config, work_dir: Path) -> Callable[[], int]:
+    def run() -> int:
+        report = run_pipeline(inputs["crm"], work_dir / "end_to_end", config, google_path=inputs["google"])
+        return report["counts"]["total_rows"]
+
+    return run
+
+
+def scenario_contact_memory(
+    inputs: dict[str, Path],
+    config: Config,
+    work_dir: Path,
+    contacts: int = DEFAULT_CONTACTS,
+) -> Callable[[], dict[str, Any]]:
+    def run() -> dict[str, Any]:
+        result = contact_memory.run(contacts)
+        result.pop("scenario")
+        result["rows"] = result.pop("contacts")
+        return result
+
+    return run
+
+
+# A scenario returns the rows it handled, or a dict with ``rows`` plus extra
+# metrics to report next to the timings.
+SCENARIOS: dict[str, Callable[..., Callable[[], int | dict[str, Any]]]] = {
+    "read": scenario_read,
+    "normalize": scenario_normalize,
+    "mojibake": scenario_mojibake,
+    "dedupe": scenario_dedupe,
+    "write": scenario_write,
+    "end_to_end": scenario_end_to_end,
+    "contact_memory": scenario_contact_memory,
+}
+# Scenarios sized by ``--contacts`` rather than by the generated files.
+CONTACT_SCENARIOS = frozenset({"contact_memory"})
+
+
+def _run_scenario(
+    name: str,
+    inputs: dict[str, Path],
+    config: Config,
+    repeat: int,
+    contacts: int = DEFAULT_CONTACTS,
+) -> dict[str, Any]:
+    factory = SCENARIOS[name]
+    if name in CONTACT_SCENARIOS:
+        factory = functools.partial(factory, contacts=contacts)
+    with tempfile.TemporaryDirectory(prefix=f"stz-bench-{name}-") as temp_dir:
+        run = factory(inputs, config, Path(temp_dir))
+        best = None
+        rows = 0
+        extra: dict[str, Any] = {}
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            outcome = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+            if isinstance(outcome, dict):
+                extra = dict(outcome)
+                rows = extra.pop("rows")
+            else:
+                rows = outcome
+    return {
+        "seconds": round(best, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / best, 1) if best else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        **extra,
+    }
+
+
+def _scenario_entry(queue, name: str, inputs: dict[str, Path], config: Config, repeat: int, contacts: int) -> None:
+    queue.put(_run_scenario(name, inputs, config, repeat, contacts))
+
+
+def run_isolated(
+    name: str,
+    inputs: dict[str, Path],
+    config: Config,
+    repeat: int,
+    contacts: int = DEFAULT_CONTACTS,
+) -> dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_scenario_entry, args=(queue, name, inputs, config, repeat, contacts))
+    process.start()
+    try:
+        while True:
+            try:
+                return queue.get(timeout=1)
+            except Empty:
+                if not process.is_alive():
+                    raise RuntimeError(f"Scenario {name!r} failed (exit code {process.exitcode}).")
+    finally:
+        process.join()
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per module from ``-X importtime`` output."""
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+    return cumulative
+
+
+def measure_import(module: str, repeat: int = 3) -> dict[str, Any]:
+    """Best-of-``repeat`` import time of ``module`` in a fresh interpreter,
+    with its five slowest dependencies and which ``LAZY_MODULES`` it loaded."""
+    best: dict[str, int] | None = None
+    for _ in range(max(1, repeat)):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=REPO_ROOT,
+        )
+        cumulative = parse_importtime(completed.stderr)
+        if best is None or cumulative.get(module, 0) < best.get(module, 0):
+            best = cumulative
+    slowest = sorted((item for item in best.items() if item[0] != module), key=lambda item: -item[1])[:5]
+    return {
+        "ms": round(best.get(module, 0) / 1000, 2),
+        "slowest": {name: round(micros / 1000, 2) for name, micros in slowest},
+        "lazy_loaded": [name for name in LAZY_MODULES if name in best],
+    }
+
+
+def run_suite(
+    spec: GeneratorSpec,
+    scenarios: list[str],
+    config: Config,
+    repeat: int = 1,
+    isolate: bool = True,
+    import_modules: tuple[str, ...] | list[str] = IMPORT_TARGETS,
+    contacts: int = DEFAULT_CONTACTS,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="stz-bench-") as temp_dir:
+        temp_path = Path(temp_dir)
+        inputs = {
+            "crm": generate_crm_csv(temp_path / "crm.csv", spec),
+            "google": generate_google_csv(temp_path / "google.csv", spec),
+        }
+        results = {}
+        for name in scenarios:
+            if isolate:
+                results[name] = run_isolated(name, inputs, config, repeat, contacts)
+            else:
+                results[name] = _run_scenario(name, inputs, config, repeat, contacts)
+    imports = {module: measure_import(module, repeat) for module in import_modules}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spec": asdict(spec),
+            "workers": config.workers,
+            "contacts": contacts,
+            "repeat": repeat,
+        },
+        "scenarios": results,
+        "imports": imports,
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.1,
+) -> dict[str, dict[str, Any]]:
+    """Per-scenario rows/sec ratio against ``baseline``; ``regressed`` is set
+    when throughput fell by more than ``tolerance``. Imports are compared
+    by time under ``import:<module>`` keys."""
+    comparison = {}
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get("rows_per_sec"):
+            continue
+        ratio = result["rows_per_sec"] / previous["rows_per_sec"]
+        comparison[name] = {
+            "baseline_rows_per_sec": previous["rows_per_sec"],
+            "rows_per_sec": result["rows_per_sec"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio < 1 - tolerance,
+        }
+    for module, result in current.get("imports", {}).items():
+        previous = baseline.get("imports", {}).get(module)
+        if not previous or not previous.get("ms") or not result["ms"]:
+            continue
+        ratio = result["ms"] / previous["ms"]
+        comparison[f"import:{module}"] = {
+            "baseline_ms": previous["ms"],
+            "ms": result["ms"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + tolerance,
+        }
+    return comparison
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the pipeline benchmark suite")
+    add_spec_arguments(parser)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run (repeatable)")
+    parser.add_argument(
+        "--import-module",
+        action="append",
+        help=f"Module whose import time is tracked (repeatable, default {', '.join(IMPORT_TARGETS)})",
+    )
+    parser.add_argument(
+        "--contacts",
+        type=int,
+        default=DEFAULT_CONTACTS,
+        help="Contacts allocated by the contact_memory scenario",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the fastest is kept")
+    parser.add_argument("--workers", type=int, default=1, help="Config.workers for the pipeline")
+    parser.add_argument("--output", help="Write the results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed rows/sec drop (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    config = Config(workers=max(1, args.workers))
+    result = run_suite(
+        spec_from_args(args),
+        args.scenario or list(SCENARIOS),
+        config,
+        args.repeat,
+        import_modules=args.import_module or IMPORT_TARGETS,
+        contacts=max(1, args.contacts),
+    )
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        result["comparison"] = compare_to_baseline(result, baseline, args.tolerance)
+        if any(item["regressed"] for item in result["comparison"].values()):
+            exit_code = 1
+    payload = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload, encoding="utf-8")
+    print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Run many conversions from one manifest in a single process pool.
+
+A manifest is a JSON or TOML file with a ``jobs`` list; each job has
+``crm`` and/or ``google`` input paths, an ``out_dir`` and optional
+``name``, ``config`` (``Config`` field overrides), ``overrides`` (column
+overrides) and ``dry_run``. Relative paths are resolved against the
+manifest's directory. Top-level ``config`` values apply to every job.
+
+Every worker process keeps one phone/mojibake cache pair and the CSV
+metadata cache for all the jobs it runs.
+"""
+from __future__ import annotations
+
+import json
+import time
+import tomllib
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable
+
+from core.config import ColumnOverrides, Config
+from core.io.meta_cache import default_meta_cache
+from core.parallel import get_process_caches
+from core.pipeline import run_pipeline
+
+SUMMARY_COUNTS = ("total_rows", "without_phone", "duplicates_merged", "suspects", "deduped_contacts", "output_files")
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    name: str
+    out_dir: Path
+    crm_path: Path | None = None
+    google_path: Path | None = None
+    config: dict[str, Any] = field(default_factory=dict)
+    overrides: dict[str, Any] = field(default_factory=dict)
+    dry_run: bool = False
+
+
+def _build_dataclass(cls, values: dict[str, Any], what: str):
+    known = {item.name for item in fields(cls)}
+    unknown = sorted(set(values) - known)
+    if unknown:
+        raise ValueError(f"Unknown {what} keys: {', '.join(unknown)}")
+    return cls(**values)
+
+
+def load_manifest(path: str | Path) -> list[BatchJob]:
+    manifest_path = Path(path)
+    raw = manifest_path.read_bytes()
+    if manifest_path.suffix.lower() == ".toml":
+        manifest = tomllib.loads(raw.decode("utf-8"))
+    else:
+        manifest = json.loads(raw.decode("utf-8-sig"))
+    base_dir = manifest_path.parent
+    shared_config = manifest.get("config", {})
+    _build_dataclass(Config, shared_config, "config")
+
+    def resolve(value: str | None) -> Path | None:
+        return base_dir / value if value else None
+
+    jobs: list[BatchJob] = []
+    for position, entry in enumerate(manifest.get("jobs", []), start=1):
+        if not entry.get("crm") and not entry.get("google"):
+            raise ValueError(f"Job {position} needs a crm or google input.")
+        if not entry.get("out_dir"):
+            raise ValueError(f"Job {position} needs an out_dir.")
+        job_config = {**shared_config, **entry.get("config", {})}
+        _build_dataclass(Config, job_config, "config")
+        _build_dataclass(ColumnOverrides, entry.get("overrides", {}), "overrides")
+        jobs.append(
+            BatchJob(
+                name=entry.get("name") or f"job_{position:03d}",
+                out_dir=resolve(entry["out_dir"]),
+                crm_path=resolve(entry.get("crm")),
+                google_path=resolve(entry.get("google")),
+                config=job_config,
+                overrides=entry.get("overrides", {}),
+                dry_run=bool(entry.get("dry_run", False)),
+            )
+        )
+    if not jobs:
+        raise ValueError("Manifest has no jobs.")
+    return jobs
+
+
+def run_job(job: BatchJob) -> dict[str, Any]:
+    """Run one job with the process-wide caches; failures are reported in
+    the result instead of raised so one bad input does not stop the batch."""
+    started = time.perf_counter()
+    result: dict[str, Any] = {"name": job.name, "out_dir": str(job.out_dir)}
+    try:
+        config = Config(**job.config)
+        report = run_pipeline(
+            crm_path=job.crm_path,
+            google_path=job.google_path,
+            out_dir=job.out_dir,
+            config=config,
+            overrides=ColumnOverrides(**job.overrides),
+            dry_run=job.dry_run,
+            meta_cache=default_meta_cache(),
+            caches=get_process_caches(config),
+        )
+    except Exception as exc:
+        result.update(status="error", error=str(exc))
+    else:
+        counts = report["counts"]
+        result.update(
+            status="ok",
+            counts={key: counts.get(key, 0) for key in SUMMARY_COUNTS},
+            outputs=report["outputs"],
+            warnings=report["warnings"],
+        )
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    workers: int = 1,
+    on_job_done: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Run ``jobs`` (in-process when ``workers`` is 1) and return the
+    combined summary, with per-job results in manifest order."""
+    started = time.perf_counter()
+    results: list[dict[str, Any]] = []
+    if workers <= 1:
+        for job in jobs:
+            results.append(run_job(job))
+            if on_job_done:
+                on_job_done(results[-1])
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(run_job, jobs):
+                results.append(result)
+                if on_job_done:
+                    on_job_done(result)
+
+    totals = {key: 0 for key in SUMMARY_COUNTS}
+    for result in results:
+        for key, value in result.get("counts", {}).items():
+            totals[key] += value
+    return {
+        "jobs_total": len(results),
+        "jobs_ok": sum(1 for result in results if result["status"] == "ok"),
+        "jobs_failed": sum(1 for result in results if result["status"] != "ok"),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 3),
+        "totals": totals,
+        "jobs": results,
+    }
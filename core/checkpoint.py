@@ -0,0 +1,134 @@
+"""Periodic snapshots of a conversion so an interrupted run can resume.
+
+A checkpoint lives in ``<out_dir>/checkpoint`` and holds one pickled
+``CheckpointState`` plus copies of the dedupe index's spilled runs. It is
+taken between row batches while the inputs are being read, so it always
+describes a consistent point: every row before ``InputProgress.offset``
+has been counted, merged into the index and written to the suspects file
+(up to ``suspects["size"]`` bytes), and nothing after it has.
+
+A checkpoint only matches a run with the same inputs (path, size, mtime)
+and the same output-affecting settings; fields that only change speed are
+ignored so a resume can use another worker count.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from core.config import ColumnOverrides, Config
+from core.models import Contact
+
+CHECKPOINT_DIRNAME = "checkpoint"
+STATE_FILENAME = "state.pickle"
+INDEX_DIRNAME = "index"
+CHECKPOINT_VERSION = 1
+# Config fields that do not change the output.
+RUNTIME_FIELDS = (
+    "workers",
+    "phone_cache_size",
+    "mojibake_cache_size",
+    "vectorize_phones",
+    "dedupe_spill_threshold",
+    "stage_threads",
+    "stage_queue_size",
+    "checkpoint_interval",
+)
+
+
+@dataclass
+class InputProgress:
+    offset: int = 0
+    line_num: int = 1
+    done: bool = False
+
+
+@dataclass
+class CheckpointState:
+    inputs: dict[str, InputProgress]
+    counts: dict[str, int]
+    processed_rows: int
+    phones_unique: set[str]
+    suspects: dict[str, Any]
+    index: dict[str, Any]
+    contacts: list[Contact] = field(default_factory=list)
+
+
+def run_key(config: Config, overrides: ColumnOverrides, inputs: dict[str, str | Path | None]) -> dict[str, Any]:
+    """What a checkpoint must match to be resumed."""
+    settings = {name: value for name, value in asdict(config).items() if name not in RUNTIME_FIELDS}
+    files = {}
+    for source, path in inputs.items():
+        if path:
+            stat = os.stat(path)
+            files[source] = [str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns]
+    return {
+        "version": CHECKPOINT_VERSION,
+        "config": settings,
+        "overrides": asdict(overrides),
+        "inputs": files,
+    }
+
+
+def checkpoint_dir(out_dir: str | Path) -> Path:
+    return Path(out_dir) / CHECKPOINT_DIRNAME
+
+
+def has_checkpoint(out_dir: str | Path) -> bool:
+    return (checkpoint_dir(out_dir) / STATE_FILENAME).is_file()
+
+
+class Checkpointer:
+    """Saves and loads the checkpoint of one run; ``interval`` seconds
+    between saves (0 disables periodic saves)."""
+
+    def __init__(self, directory: str | Path, key: dict[str, Any], interval: float = 0.0) -> None:
+        self.directory = Path(directory)
+        self.key = key
+        self.interval = max(0.0, interval)
+        self._last_save = time.monotonic()
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / STATE_FILENAME
+
+    @property
+    def index_dir(self) -> Path:
+        """Where ``ContactIndex.snapshot`` keeps copies of spilled runs."""
+        return self.directory / INDEX_DIRNAME
+
+    def load(self) -> CheckpointState | None:
+        """The saved state, or ``None`` without a checkpoint; raises
+        ``ValueError`` when the checkpoint belongs to other inputs/settings."""
+        try:
+            with self.state_path.open("rb") as handle:
+                key, state = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        if key != self.key:
+            raise ValueError(
+                f"Checkpoint in {self.directory} was made with different inputs or settings; "
+                "delete it or run without resume."
+            )
+        return state
+
+    def due(self) -> bool:
+        return bool(self.interval) and time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: CheckpointState) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_suffix(".tmp")
+        with temp_path.open("wb") as handle:
+            pickle.dump((self.key, state), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.state_path)
+        self._last_save = time.monotonic()
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
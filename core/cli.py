@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import json
 import sys
+from pathlib import Path
 
 from core.config import ColumnOverrides, Config
-from core.pipeline import run_pipeline
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="CSV converter for Google Contacts")
     parser.add_argument("--input-crm", help="Path to CRM CSV")
     parser.add_argument("--input-google", help="Path to Google Contacts CSV (optional)")
-    parser.add_argument("--out-dir", required=True, help="Output directory")
+    parser.add_argument("--out-dir", help="Output directory")
     parser.add_argument("--ddi", default="55", help="Default DDI")
     parser.add_argument("--no-assume-ddi", action="store_true", help="Do not assume DDI when missing")
     parser.add_argument("--batch-size", type=int, default=3000, help="Contacts per output CSV")
@@ -23,6 +24,51 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-explode-phones", action="store_true", help="Do not explode multiple phones")
     parser.add_argument("--fallback-prefix", default="Cliente", help="Prefix for fallback names")
     parser.add_argument("--dry-run", action="store_true", help="Generate report only")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for normalization")
+    parser.add_argument(
+        "--dedupe-spill-threshold",
+        type=int,
+        default=0,
+        help="Contacts kept in memory before dedupe spills sorted runs to disk (0 = never)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write output files while reading (input order without dedupe; dedupe needs inputs sorted by phone)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the index in --out-dir and rewrite only the batches affected by changed rows",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Add per-stage timings to report.json and write profile.pstats to --out-dir",
+    )
+    parser.add_argument(
+        "--stage-threads",
+        action="store_true",
+        help="Run reading, parsing, normalization and sorting on separate threads (helps on slow disks)",
+    )
+    parser.add_argument("--stage-queue-size", type=int, default=8, help="Batches buffered between stage threads")
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=0,
+        help="Seconds between checkpoints in --out-dir/checkpoint so an interrupted run can resume (0 = off)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the checkpoint in --out-dir (starts over when there is none)",
+    )
+    parser.add_argument("--no-meta-cache", action="store_true", help="Do not reuse cached CSV metadata")
+    parser.add_argument("--no-mojibake", action="store_true", help="Skip the mojibake check on names")
+    parser.add_argument("--phone-cache-size", type=int, default=65536, help="Max cached phone normalizations")
+    parser.add_argument("--manifest", help="JSON/TOML manifest of jobs to run instead of a single conversion")
+    parser.add_argument("--jobs", type=int, default=1, help="Manifest jobs run concurrently")
+    parser.add_argument("--summary", help="Combined summary path (default: batch_summary.json next to the manifest)")
 
     parser.add_argument("--col-name", help="Override CRM name column")
     parser.add_argument("--col-phone", help="Override CRM phone column")
@@ -38,8 +84,16 @@ def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.manifest:
+        return run_manifest(args)
+    if not args.out_dir:
+        parser.error("--out-dir is required.")
     if not args.input_crm and not args.input_google:
         parser.error("Provide --input-crm or --input-google.")
+    if args.incremental and (args.dry_run or args.stream or args.profile):
+        parser.error("--incremental cannot be combined with --dry-run, --stream or --profile.")
+    if args.resume and (args.incremental or args.stream):
+        parser.error("--resume cannot be combined with --incremental or --stream.")
 
     config = Config(
         ddi_default=args.ddi,
@@ -52,6 +106,14 @@ def main() -> int:
         rename_phone_like_names=not args.no_rename_phone_like,
         explode_phones=not args.no_explode_phones,
         fallback_prefix=args.fallback_prefix,
+        workers=max(1, args.workers),
+        phone_cache_size=args.phone_cache_size,
+        dedupe_spill_threshold=max(0, args.dedupe_spill_threshold),
+        stream_output=args.stream,
+        check_mojibake=not args.no_mojibake,
+        stage_threads=args.stage_threads,
+        stage_queue_size=max(1, args.stage_queue_size),
+        checkpoint_interval=max(0.0, args.checkpoint_interval),
     )
     overrides = ColumnOverrides(
         name=args.col_name,
@@ -63,15 +125,36 @@ def main() -> int:
         labels=args.col_labels,
     )
 
+    # Imported here so --help and argument errors stay fast.
+    from core.incremental import run_incremental
+    from core.io.meta_cache import default_meta_cache
+    from core.pipeline import run_pipeline
+
+    meta_cache = None if args.no_meta_cache else default_meta_cache()
+
     try:
-        run_pipeline(
-            crm_path=args.input_crm,
-            google_path=args.input_google,
-            out_dir=args.out_dir,
-            config=config,
-            overrides=overrides,
-            dry_run=args.dry_run,
-        )
+        if args.incremental:
+            run_incremental(
+                crm_path=args.input_crm,
+                google_path=args.input_google,
+                out_dir=args.out_dir,
+                config=config,
+                overrides=overrides,
+                meta_cache=meta_cache,
+            )
+        else:
+            run_pipeline(
+                crm_path=args.input_crm,
+                google_path=args.input_google,
+                out_dir=args.out_dir,
+                config=config,
+                overrides=overrides,
+                dry_run=args.dry_run,
+                meta_cache=meta_cache,
+                collect_timings=args.profile,
+                profile_path=Path(args.out_dir) / "profile.pstats" if args.profile else None,
+                resume=args.resume,
+            )
     except Exception as exc:  # pragma: no cover - CLI guardrail
         print(f"Error: {exc}", file=sys.stderr)
         return 1
@@ -79,5 +162,26 @@ def main() -> int:
     return 0
 
 
+def run_manifest(args: argparse.Namespace) -> int:
+    from core.batch import load_manifest, run_batch
+
+    manifest_path = Path(args.manifest)
+    try:
+        jobs = load_manifest(manifest_path)
+    except Exception as exc:  # pragma: no cover - CLI guardrail
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    def report_job(result: dict) -> None:
+        detail = result.get("error") or f"{result['counts']['deduped_contacts']} contacts"
+        print(f"[{result['status']}] {result['name']}: {detail} ({result['seconds']}s)")
+
+    summary = run_batch(jobs, workers=max(1, args.jobs), on_job_done=report_job)
+    summary_path = Path(args.summary) if args.summary else manifest_path.parent / "batch_summary.json"
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"{summary['jobs_ok']}/{summary['jobs_total']} jobs ok; summary in {summary_path}")
+    return 1 if summary["jobs_failed"] else 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
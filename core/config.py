@@ -20,6 +20,18 @@ class Config:
     rename_phone_like_names: bool = True
     explode_phones: bool = True
     fallback_prefix: str = "Cliente"
+    workers: int = 1
+    phone_cache_size: int = 65536
+    mojibake_cache_size: int = 65536
+    check_mojibake: bool = True
+    vectorize_phones: bool = True
+    stage_threads: bool = False
+    stage_queue_size: int = 8
+    dedupe_spill_threshold: int = 0
+    stream_output: bool = False
+    suspects_sample_size: int = 100
+    # Seconds between resumable checkpoints in <out_dir>/checkpoint (0 = off).
+    checkpoint_interval: float = 0.0
 
 
 @dataclass(frozen=True)
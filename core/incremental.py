@@ -0,0 +1,476 @@
+"""Incremental re-runs backed by a SQLite index in the output directory.
+
+The store keeps every copy of every input row (identical rows share a
+fingerprint and are told apart by a copy number), the contacts each
+fingerprint contributed and the final deduped contacts with the batch file
+they were written to. A re-run still reads every row, but only rows whose
+fingerprint is new are normalized; phones touched by new or vanished copies
+are re-merged from their stored contributions and only the batch files
+holding those phones are rewritten. ``delta.csv`` lists the contacts added
+or renamed by the run and ``removed.csv`` the ones that are gone. Suspects
+are stored per fingerprint too, so ``suspects.jsonl`` is rebuilt with every
+suspect of the current inputs, not just those of new rows.
+
+Contacts keep the batch and position they got when first written, so later
+runs never shift phones between files. New contacts fill the last batch and
+then open new ones; rows added after the first run merge as if appended to
+the end of the inputs.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from core.config import ColumnOverrides, Config
+from core.io.columns import ColumnMap, resolve_crm_columns, resolve_google_columns
+from core.io.meta_cache import CsvMetaCache, cached_rows_total
+from core.io.read_csv import CsvMeta, iter_csv_projected, prepare_csv
+from core.io.suspects import SUSPECTS_FILENAME, SuspectSink
+from core.io.write_google_csv import write_batch_file
+from core.merge.dedupe import ContactIndex
+from core.models import Contact
+from core.normalize.name import build_fallback_name, is_phone_like_name
+from core.normalize.phone import CachedPhoneNormalizer
+from core.normalize.text import MojibakeAnalyzer
+from core.pipeline import (
+    PipelineCancelled,
+    _add_suspect,
+    _build_input_report,
+    _build_params,
+)
+from core.progress import PROGRESS_INTERVAL_S, ProgressReporter, ProgressUpdate
+from core.rows import RowNormalizer
+
+INDEX_FILENAME = "index.sqlite"
+DELTA_FILENAME = "delta.csv"
+REMOVED_FILENAME = "removed.csv"
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS rows (
+    fingerprint BLOB NOT NULL,
+    copy INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (fingerprint, copy)
+);
+CREATE TABLE IF NOT EXISTS contributions (
+    fingerprint BLOB NOT NULL,
+    phone TEXT NOT NULL,
+    name TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contributions_phone ON contributions (phone);
+CREATE INDEX IF NOT EXISTS contributions_fingerprint ON contributions (fingerprint);
+CREATE TABLE IF NOT EXISTS contacts (
+    phone TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    batch INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_batch ON contacts (batch);
+CREATE TABLE IF NOT EXISTS suspects (fingerprint BLOB NOT NULL, item TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS suspects_fingerprint ON suspects (fingerprint);
+"""
+
+
+def row_fingerprint(source: str, values: tuple[str, ...]) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(source.encode("utf-8"))
+    for value in values:
+        digest.update(b"\x1f")
+        digest.update(value.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+def _settings_key(config: Config, columns: dict[str, list[str] | None]) -> str:
+    settings = {
+        "schema": SCHEMA_VERSION,
+        "params": _build_params(config),
+        "google_group_separator": config.google_group_separator,
+        "fields": columns,
+    }
+    return json.dumps(settings, sort_keys=True, ensure_ascii=False)
+
+
+def _open_store(path: Path, settings_key: str) -> tuple[sqlite3.Connection, bool]:
+    """Open the index; returns ``(connection, reset)`` where ``reset`` means
+    the stored state was dropped because the settings changed."""
+    connection = sqlite3.connect(path)
+    row = None
+    if connection.execute("SELECT name FROM sqlite_master WHERE name = 'meta'").fetchone():
+        row = connection.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+    reset = row is not None and row[0] != settings_key
+    if row is None or reset:
+        # Older schema versions have other columns; start from scratch.
+        with connection:
+            for table in ("rows", "contributions", "contacts", "suspects", "meta"):
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+    connection.executescript(_SCHEMA)
+    if row is None or reset:
+        with connection:
+            connection.execute("INSERT INTO meta (key, value) VALUES ('settings', ?)", (settings_key,))
+    return connection, reset
+
+
+class _SuspectBuffer:
+    """Collects the ``_add_suspect`` items of one row for the store."""
+
+    def __init__(self) -> None:
+        self.items: list[dict[str, Any]] = []
+
+    def add(self, item: dict[str, Any]) -> None:
+        self.items.append(item)
+
+
+def _chunked(values: list[Any], size: int = 500) -> Iterator[list[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _merge_phones(connection: sqlite3.Connection, phones: list[str], config: Config) -> dict[str, Contact]:
+    """Merge the stored contributions of ``phones``, each copy of a row
+    counting once, in input order; phones left without any are missing."""
+    marks = ",".join("?" * len(phones))
+    rows = connection.execute(
+        f"""
+        SELECT c.phone, c.name, c.notes, c.labels, c.source
+        FROM contributions AS c JOIN rows AS r ON r.fingerprint = c.fingerprint
+        WHERE c.phone IN ({marks})
+        ORDER BY r.seq, c.rowid
+        """,
+        phones,
+    )
+    index = ContactIndex(config.treat_dot_as_empty, config.protect_good_name)
+    for phone, name, notes, labels, source in rows:
+        index.add(
+            Contact(
+                name=name,
+                phone=phone,
+                notes=tuple(json.loads(notes)),
+                labels=frozenset(json.loads(labels)),
+                sources=frozenset((source,)),
+            )
+        )
+    return {contact.phone: contact for contact in index.values()}
+
+
+def run_incremental(
+    crm_path: str | Path | None,
+    out_dir: str | Path,
+    config: Config,
+    google_path: str | Path | None = None,
+    overrides: ColumnOverrides | None = None,
+    on_progress: Callable[[ProgressUpdate], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    meta_cache: CsvMetaCache | None = None,
+    progress_interval: float = PROGRESS_INTERVAL_S,
+) -> dict[str, Any]:
+    """Update the outputs in ``out_dir`` from the rows that changed since the
+    previous run. The first run (or a run with different settings) rebuilds
+    everything and produces the same files as ``run_pipeline``."""
+    if not crm_path and not google_path:
+        raise ValueError("At least one input CSV is required.")
+    if not config.dedupe_enabled:
+        raise ValueError("Incremental mode requires dedupe to be enabled.")
+    overrides = overrides or ColumnOverrides()
+    out_dir_path = Path(out_dir)
+    out_dir_path.mkdir(parents=True, exist_ok=True)
+
+    # As in ``run_pipeline``, the readers handle bytes the sample missed.
+    inputs: list[tuple[str, CsvMeta, ColumnMap, str]] = []
+    if google_path:
+        google_meta = prepare_csv(google_path, meta_cache, verify_encoding=False)
+        inputs.append(("google", google_meta, resolve_google_columns(google_meta.headers), "Processando Google"))
+    if crm_path:
+        crm_meta = prepare_csv(crm_path, meta_cache, verify_encoding=False)
+        inputs.append(("crm", crm_meta, resolve_crm_columns(crm_meta.headers, overrides), "Processando CRM"))
+
+    caches = (CachedPhoneNormalizer(config.phone_cache_size), MojibakeAnalyzer(config.mojibake_cache_size))
+    normalizers = {source: RowNormalizer(source, columns, config, *caches) for source, _, columns, _ in inputs}
+    settings_key = _settings_key(config, {source: normalizer.fields for source, normalizer in normalizers.items()})
+    connection, reset = _open_store(out_dir_path / INDEX_FILENAME, settings_key)
+
+    suspects = SuspectSink(out_dir_path / SUSPECTS_FILENAME, config.suspects_sample_size)
+    counts = {
+        "crm_rows": 0,
+        "google_rows": 0,
+        "total_rows": 0,
+        "rows_new": 0,
+        "rows_removed": 0,
+        "without_phone": 0,
+        "duplicates_merged": 0,
+        "suspects": 0,
+        "suspects_new": 0,
+        "contacts_added": 0,
+        "contacts_updated": 0,
+        "contacts_removed": 0,
+    }
+    try:
+        # Copies of each fingerprint stored by the previous run.
+        previous = dict(connection.execute("SELECT fingerprint, MAX(copy) FROM rows GROUP BY fingerprint"))
+        next_seq = connection.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM rows").fetchone()[0]
+        seen: Counter[bytes] = Counter()
+        new_rows: list[tuple[bytes, int, int]] = []
+        new_contributions: list[tuple[bytes, str, str, str, str, str]] = []
+        new_suspects: list[tuple[bytes, str]] = []
+        row_suspects = _SuspectBuffer()
+        # Stored fingerprints that got more copies; their phones re-merge.
+        grown: set[bytes] = set()
+        affected: set[str] = set()
+        # Every copy of a row with suspects gets the line it is on in this run.
+        suspect_rows = {
+            fingerprint for (fingerprint,) in connection.execute("SELECT DISTINCT fingerprint FROM suspects")
+        }
+        suspect_lines: dict[tuple[bytes, int], int] = {}
+
+        total_bytes = sum(meta.path.stat().st_size for _, meta, _, _ in inputs)
+        report_progress = ProgressReporter(
+            on_progress,
+            total_bytes,
+            progress_interval,
+            rows_total=cached_rows_total(meta_cache, [meta.path for _, meta, _, _ in inputs]),
+        )
+        done_bytes = 0
+        for source, meta, _, stage in inputs:
+            normalizer = normalizers[source]
+            offset = 0
+            rows = iter_csv_projected(meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields)
+            for line_num, values, offset in rows:
+                if should_cancel and should_cancel():
+                    raise PipelineCancelled("Cancelled by user.")
+                counts[f"{source}_rows"] += 1
+                counts["total_rows"] += 1
+                report_progress(stage, counts["total_rows"], done_bytes + offset)
+                fingerprint = row_fingerprint(source, values)
+                seen[fingerprint] += 1
+                copy = seen[fingerprint]
+                if fingerprint in suspect_rows:
+                    suspect_lines[(fingerprint, copy)] = line_num
+                stored_copies = previous.get(fingerprint, 0)
+                if copy <= stored_copies:
+                    continue
+
+                counts["rows_new"] += 1
+                new_rows.append((fingerprint, copy, next_seq))
+                next_seq += 1
+                if stored_copies:
+                    grown.add(fingerprint)
+                if copy > 1:
+                    # The first copy already stored the contributions.
+                    continue
+                result = normalizer.normalize(line_num, values)
+                row_suspects.items.clear()
+                for reason, raw_phone, normalized_phone, extra in result.suspects:
+                    _add_suspect(
+                        row_suspects,
+                        reason,
+                        source,
+                        raw_phone,
+                        normalized_phone,
+                        result.raw_name,
+                        result.line_num,
+                        extra,
+                    )
+                if row_suspects.items:
+                    suspect_rows.add(fingerprint)
+                    suspect_lines[(fingerprint, copy)] = line_num
+                new_suspects.extend((fingerprint, json.dumps(item, ensure_ascii=False)) for item in row_suspects.items)
+                entries = result.phone_entries if config.explode_phones else result.phone_entries[:1]
+                notes = json.dumps(result.notes, ensure_ascii=False)
+                labels = json.dumps(sorted(result.labels), ensure_ascii=False)
+                for entry in entries:
+                    new_contributions.append((fingerprint, entry.normalized, result.name, notes, labels, source))
+                    affected.add(entry.normalized)
+            done_bytes += offset
+            if meta_cache is not None:
+                meta_cache.update(meta.path, row_count=counts[f"{source}_rows"])
+
+        # Fingerprints with fewer copies than before, and how many remain.
+        shrunk = [
+            (fingerprint, seen.get(fingerprint, 0))
+            for fingerprint, copies in previous.items()
+            if seen.get(fingerprint, 0) < copies
+        ]
+        counts["rows_removed"] = sum(previous[fingerprint] - kept for fingerprint, kept in shrunk)
+        gone = [fingerprint for fingerprint, kept in shrunk if kept == 0]
+
+        with connection:
+            changed = [fingerprint for fingerprint, _ in shrunk] + list(grown)
+            for chunk in _chunked(changed):
+                marks = ",".join("?" * len(chunk))
+                affected.update(
+                    phone
+                    for (phone,) in connection.execute(
+                        f"SELECT phone FROM contributions WHERE fingerprint IN ({marks})", chunk
+                    )
+                )
+            connection.executemany(
+                "DELETE FROM rows WHERE fingerprint = ? AND copy > ?",
+                shrunk,
+            )
+            for chunk in _chunked(gone):
+                marks = ",".join("?" * len(chunk))
+                connection.execute(f"DELETE FROM contributions WHERE fingerprint IN ({marks})", chunk)
+                connection.execute(f"DELETE FROM suspects WHERE fingerprint IN ({marks})", chunk)
+            connection.executemany("INSERT INTO rows (fingerprint, copy, seq) VALUES (?, ?, ?)", new_rows)
+            connection.executemany(
+                "INSERT INTO contributions (fingerprint, phone, name, notes, labels, source) VALUES (?, ?, ?, ?, ?, ?)",
+                new_contributions,
+            )
+            connection.executemany("INSERT INTO suspects (fingerprint, item) VALUES (?, ?)", new_suspects)
+            counts["suspects_new"] = len(new_suspects)
+
+            dirty_batches: set[int] = set()
+            delta: list[tuple[str, str]] = []
+            removed_contacts: list[tuple[str, str]] = []
+            added: list[Contact] = []
+            for chunk in _chunked(sorted(affected)):
+                marks = ",".join("?" * len(chunk))
+                merged = _merge_phones(connection, chunk, config)
+                stored_contacts = {
+                    phone: (name, position, batch)
+                    for phone, name, position, batch in connection.execute(
+                        f"SELECT phone, name, position, batch FROM contacts WHERE phone IN ({marks})", chunk
+                    )
+                }
+                for phone in chunk:
+                    stored = stored_contacts.get(phone)
+                    contact = merged.get(phone)
+                    if contact is None:
+                        if stored is not None:
+                            connection.execute("DELETE FROM contacts WHERE phone = ?", (phone,))
+                            dirty_batches.add(stored[2])
+                            removed_contacts.append((stored[0], phone))
+                        continue
+                    if stored is None:
+                        added.append(contact)
+                        continue
+                    name, position, batch = stored
+                    if config.rename_phone_like_names and is_phone_like_name(contact.name):
+                        contact.name = build_fallback_name(config.fallback_prefix, position, phone)
+                    if contact.name != name:
+                        connection.execute("UPDATE contacts SET name = ? WHERE phone = ?", (contact.name, phone))
+                        dirty_batches.add(batch)
+                        delta.append((contact.name, phone))
+                        counts["contacts_updated"] += 1
+            counts["contacts_removed"] = len(removed_contacts)
+
+            batch_size = max(1, config.batch_size)
+            position, batch, batch_fill = connection.execute(
+                """
+                SELECT
+                    COALESCE(MAX(position), 0),
+                    COALESCE(MAX(batch), 1),
+                    (SELECT COUNT(*) FROM contacts WHERE batch = (SELECT MAX(batch) FROM contacts))
+                FROM contacts
+                """
+            ).fetchone()
+            for contact in added:
+                if batch_fill >= batch_size:
+                    batch += 1
+                    batch_fill = 0
+                position += 1
+                batch_fill += 1
+                if config.rename_phone_like_names and is_phone_like_name(contact.name):
+                    contact.name = build_fallback_name(config.fallback_prefix, position, contact.phone)
+                connection.execute(
+                    "INSERT INTO contacts (phone, name, position, batch) VALUES (?, ?, ?, ?)",
+                    (contact.phone, contact.name, position, batch),
+                )
+                dirty_batches.add(batch)
+                delta.append((contact.name, contact.phone))
+            counts["contacts_added"] = len(added)
+
+            written: list[Path] = []
+            for batch_number in sorted(dirty_batches):
+                file_path = out_dir_path / f"saida_{batch_number:03d}.csv"
+                batch_rows = connection.execute(
+                    "SELECT name, phone FROM contacts WHERE batch = ? ORDER BY phone", (batch_number,)
+                ).fetchall()
+                if batch_rows:
+                    write_batch_file(file_path, batch_rows, config.phone_prefix_plus)
+                    written.append(file_path)
+                elif file_path.exists():
+                    file_path.unlink()
+
+            delta_path = out_dir_path / DELTA_FILENAME
+            delta.sort(key=lambda item: item[1])
+            write_batch_file(delta_path, delta, config.phone_prefix_plus)
+            removed_path = out_dir_path / REMOVED_FILENAME
+            write_batch_file(removed_path, removed_contacts, config.phone_prefix_plus)
+
+            contacts_total = connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+            outputs = [
+                str(out_dir_path / f"saida_{batch_number:03d}.csv")
+                for (batch_number,) in connection.execute("SELECT DISTINCT batch FROM contacts ORDER BY batch")
+            ]
+            # Totals over every stored copy, as a full run would count them.
+            counts["without_phone"] = connection.execute(
+                """
+                SELECT COUNT(*) FROM rows AS r
+                WHERE NOT EXISTS (SELECT 1 FROM contributions AS c WHERE c.fingerprint = r.fingerprint)
+                """
+            ).fetchone()[0]
+            contributions_total = connection.execute(
+                "SELECT COUNT(*) FROM contributions AS c JOIN rows AS r ON r.fingerprint = c.fingerprint"
+            ).fetchone()[0]
+            counts["duplicates_merged"] = contributions_total - contacts_total
+
+        with suspects:
+            stored_suspects = connection.execute(
+                """
+                SELECT s.fingerprint, r.copy, s.item
+                FROM suspects AS s JOIN rows AS r ON r.fingerprint = s.fingerprint
+                ORDER BY r.seq, s.rowid
+                """
+            )
+            for fingerprint, copy, item in stored_suspects:
+                item = json.loads(item)
+                item["line"] = suspect_lines.get((fingerprint, copy), item["line"])
+                suspects.add(item)
+    finally:
+        connection.close()
+        suspects.close()
+
+    report_progress("Concluído", counts["total_rows"], total_bytes, force=True)
+    warnings: list[str] = []
+    if reset:
+        warnings.append("Settings changed since the previous run; the incremental index was rebuilt.")
+    if contacts_total > config.contact_limit_warn:
+        warnings.append(
+            f"Total contacts {contacts_total} exceeds warning threshold {config.contact_limit_warn}."
+        )
+    counts["suspects"] = len(suspects)
+    reports = {source: _build_input_report(meta, columns) for source, meta, columns, _ in inputs}
+
+    report = {
+        "schema_version": 1,
+        "mode": "incremental",
+        "params": _build_params(config),
+        "inputs": {
+            "crm": reports.get("crm"),
+            "google": reports.get("google"),
+        },
+        "counts": {
+            **counts,
+            "deduped_contacts": contacts_total,
+            "output_files": len(outputs),
+            "files_written": len(written),
+        },
+        "outputs": outputs,
+        "written": [str(path) for path in written],
+        "delta": str(delta_path),
+        "removed": str(removed_path),
+        "warnings": warnings,
+        "suspects": suspects.summary(),
+    }
+    report_path = out_dir_path / "report.json"
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
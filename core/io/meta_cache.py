@@ -0,0 +1,114 @@
+"""Persistent cache of CSV metadata keyed by ``(path, size, mtime_ns)``."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+CACHE_VERSION = 1
+MAX_ENTRIES = 256
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("STZ_CACHE_DIR")
+    root = Path(base) if base else Path.home() / ".cache" / "stz-csv-converter"
+    return root / "csv_meta.json"
+
+
+class CsvMetaCache:
+    """Encoding, delimiter, headers, row count and record boundaries per file.
+
+    An entry is only returned while the file still has the size and
+    ``mtime_ns`` it had when the entry was written, so checking it costs one
+    ``stat`` and no ``open``. Entries are persisted as JSON (``path=None``
+    keeps the cache in memory). Writes are best effort: an unwritable cache
+    file never breaks a run. Safe to share between threads.
+    """
+
+    def __init__(self, path: str | Path | None = None, max_entries: int = MAX_ENTRIES) -> None:
+        self._path = Path(path) if path is not None else None
+        self._max_entries = max_entries
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            entries: dict[str, dict[str, Any]] = {}
+            if self._path is not None:
+                try:
+                    payload = json.loads(self._path.read_text(encoding="utf-8"))
+                    if payload.get("version") == CACHE_VERSION:
+                        entries = payload.get("entries", {})
+                except (OSError, ValueError, AttributeError):
+                    entries = {}
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        payload = {"version": CACHE_VERSION, "entries": self._entries}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp_path, self._path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _key(csv_path: str | Path) -> tuple[str, int, int]:
+        resolved = Path(csv_path).resolve()
+        stat = resolved.stat()
+        return str(resolved), stat.st_size, stat.st_mtime_ns
+
+    def get(self, csv_path: str | Path) -> dict[str, Any] | None:
+        """Cached fields for ``csv_path``, or ``None`` if missing or stale."""
+        key, size, mtime_ns = self._key(csv_path)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None or entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+                return None
+            return dict(entry)
+
+    def update(self, csv_path: str | Path, **fields: Any) -> None:
+        """Merge ``fields`` into the entry for the current version of the file."""
+        key, size, mtime_ns = self._key(csv_path)
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(key, None)
+            if entry is None or entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+                entry = {"size": size, "mtime_ns": mtime_ns}
+            entry.update(fields)
+            # Re-inserting keeps the dict in least-recently-written order.
+            entries[key] = entry
+            while len(entries) > self._max_entries:
+                entries.pop(next(iter(entries)))
+            self._save()
+
+
+def cached_rows_total(cache: CsvMetaCache | None, paths: list[str | Path]) -> int | None:
+    """Sum of the cached row counts of ``paths``; ``None`` unless every
+    file has a current one (from a validation or an earlier run)."""
+    if cache is None:
+        return None
+    total = 0
+    for csv_path in paths:
+        entry = cache.get(csv_path)
+        if entry is None or entry.get("row_count") is None:
+            return None
+        total += entry["row_count"]
+    return total
+
+
+_default_cache: CsvMetaCache | None = None
+
+
+def default_meta_cache() -> CsvMetaCache:
+    """Process-wide cache stored under the user cache directory."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CsvMetaCache(default_cache_path())
+    return _default_cache
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import codecs
 import csv
+import io
+import itertools
+import queue
+import threading
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from core.io.meta_cache import CsvMetaCache
+
+if TYPE_CHECKING:
+    from core.stages import StageGroup
 
 
 ENCODING_CANDIDATES = ("utf-8-sig", "cp1252", "latin-1")
+DELIMITER_CANDIDATES = (",", ";", "\t", "|")
+SAMPLE_BYTES = 64 * 1024
+SAMPLE_LINES = 5
+VERIFY_BLOCK_BYTES = 16 * 1024 * 1024
+READ_AHEAD_BYTES = 1024 * 1024
+
+
+class ReadCancelled(Exception):
+    pass
 
 
 @dataclass(frozen=True)
@@ -17,40 +38,174 @@ class CsvMeta:
     used_fallback: bool
 
 
-def detect_encoding(path: Path) -> tuple[str, bool]:
+def read_sample(path: Path) -> bytes:
+    with path.open("rb") as handle:
+        return handle.read(SAMPLE_BYTES)
+
+
+def detect_encoding_from_sample(sample: bytes) -> tuple[str, bool]:
     for idx, encoding in enumerate(ENCODING_CANDIDATES):
         try:
-            with path.open("r", encoding=encoding, newline="") as handle:
-                handle.read(4096)
+            # final=False tolerates a multi-byte character cut at the end.
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
             return encoding, idx != 0
         except UnicodeDecodeError:
             continue
     return ENCODING_CANDIDATES[-1], True
 
 
+def detect_delimiter_from_text(text: str) -> str:
+    sample_lines = [line for line in text.splitlines()[:SAMPLE_LINES] if line.strip()]
+    best = DELIMITER_CANDIDATES[0]
+    best_count = 0
+    for delimiter in DELIMITER_CANDIDATES:
+        count = sum(line.count(delimiter) for line in sample_lines)
+        if count > best_count:
+            best, best_count = delimiter, count
+    return best
+
+
+def detect_encoding(path: Path) -> tuple[str, bool]:
+    return detect_encoding_from_sample(read_sample(path))
+
+
 def detect_delimiter(path: Path, encoding: str) -> str:
-    sample_lines: list[str] = []
-    with path.open("r", encoding=encoding, newline="") as handle:
-        for _ in range(5):
-            line = handle.readline()
-            if not line:
-                break
-            if line.strip():
-                sample_lines.append(line)
-    comma_count = sum(line.count(",") for line in sample_lines)
-    semi_count = sum(line.count(";") for line in sample_lines)
-    if semi_count > comma_count:
-        return ";"
-    return ","
+    sample = read_sample(path)
+    return detect_delimiter_from_text(codecs.getincrementaldecoder(encoding)().decode(sample, final=False))
+
+
+def _iter_blocks(path: Path, block_bytes: int):
+    """Yield the file in blocks; the next block is read by a background
+    thread (file reads release the GIL) while the caller decodes."""
+    blocks: queue.Queue[bytes | BaseException | None] = queue.Queue(maxsize=2)
+    stop = threading.Event()
+
+    def reader() -> None:
+        try:
+            with path.open("rb") as handle:
+                while not stop.is_set():
+                    block = handle.read(block_bytes)
+                    if not block:
+                        break
+                    blocks.put(block)
+        except BaseException as exc:  # handed to the consumer
+            blocks.put(exc)
+            return
+        blocks.put(None)
 
+    thread = threading.Thread(target=reader, name="csv-encoding-check", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = blocks.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                blocks.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
 
-def prepare_csv(path: str | Path) -> CsvMeta:
+
+def decodes_cleanly(
+    path: Path,
+    encoding: str,
+    block_bytes: int = VERIFY_BLOCK_BYTES,
+    should_cancel: Callable[[], bool] | None = None,
+) -> bool:
+    """True if the whole file decodes with ``encoding``. ``should_cancel``
+    is polled between blocks; ``ReadCancelled`` is raised when it hits."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        for block in _iter_blocks(path, block_bytes):
+            if should_cancel is not None and should_cancel():
+                raise ReadCancelled("Encoding check cancelled.")
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def confirm_encoding(path: Path, encoding: str, should_cancel: Callable[[], bool] | None = None) -> str:
+    """Return ``encoding`` if the full file decodes with it, otherwise the
+    next candidate that does. latin-1 accepts any byte sequence."""
+    start = ENCODING_CANDIDATES.index(encoding) if encoding in ENCODING_CANDIDATES else 0
+    for candidate in ENCODING_CANDIDATES[start:]:
+        if candidate == "latin-1" or decodes_cleanly(path, candidate, should_cancel=should_cancel):
+            return candidate
+    return ENCODING_CANDIDATES[-1]
+
+
+def _headers_from_text(text: str, delimiter: str, complete: bool) -> list[str] | None:
+    """Header row as ``csv.DictReader`` would read it, or ``None`` when the
+    sample ends before the header record does."""
+    lines = text.splitlines(keepends=True)
+    if not complete:
+        # The last line may be cut short; never parse it.
+        lines = lines[:-1]
+    reader = csv.reader(lines, delimiter=delimiter)
+    try:
+        for row in reader:
+            if row:
+                return row
+    except csv.Error:
+        return None
+    return [] if complete else None
+
+
+def prepare_csv(
+    path: str | Path,
+    cache: CsvMetaCache | None = None,
+    verify_encoding: bool = True,
+    should_cancel: Callable[[], bool] | None = None,
+) -> CsvMeta:
+    """Detect encoding, delimiter and headers from one sample read.
+
+    With ``verify_encoding`` the whole file is decoded before returning, so
+    a bad byte far past the sample switches the reported encoding;
+    ``should_cancel`` can abort that check (``ReadCancelled``). The readers
+    never need it (see ``decode_line``), so runs skip it. Results are
+    stored in ``cache`` when given.
+    """
     csv_path = Path(path)
-    encoding, used_fallback = detect_encoding(csv_path)
-    delimiter = detect_delimiter(csv_path, encoding)
-    with csv_path.open("r", encoding=encoding, newline="") as handle:
-        reader = csv.DictReader(handle, delimiter=delimiter)
-        headers = reader.fieldnames or []
+    if cache is not None:
+        entry = cache.get(csv_path)
+        if entry is not None and "encoding" in entry and (entry.get("encoding_verified") or not verify_encoding):
+            return CsvMeta(
+                path=csv_path,
+                encoding=entry["encoding"],
+                delimiter=entry["delimiter"],
+                headers=list(entry["headers"]),
+                used_fallback=entry["used_fallback"],
+            )
+    sample = read_sample(csv_path)
+    encoding, used_fallback = detect_encoding_from_sample(sample)
+    if verify_encoding:
+        confirmed = confirm_encoding(csv_path, encoding, should_cancel)
+        if confirmed != encoding:
+            encoding, used_fallback = confirmed, True
+    complete = len(sample) < SAMPLE_BYTES
+    text = codecs.getincrementaldecoder(encoding)().decode(sample, final=complete)
+    delimiter = detect_delimiter_from_text(text)
+    headers = _headers_from_text(text, delimiter, complete)
+    if headers is None:
+        with csv_path.open("r", encoding=encoding, newline="") as handle:
+            headers = csv.DictReader(handle, delimiter=delimiter).fieldnames or []
+    if cache is not None:
+        cache.update(
+            csv_path,
+            encoding=encoding,
+            delimiter=delimiter,
+            headers=list(headers),
+            used_fallback=used_fallback,
+            encoding_verified=verify_encoding,
+        )
     return CsvMeta(
         path=csv_path,
         encoding=encoding,
@@ -66,3 +221,250 @@ def iter_csv_rows(path: str | Path, encoding: str, delimiter: str):
         reader = csv.DictReader(handle, delimiter=delimiter)
         for line_num, row in enumerate(reader, start=2):
             yield line_num, row
+
+
+def _strip_line_end(raw_line: bytes) -> bytes:
+    if raw_line.endswith(b"\r\n"):
+        return raw_line[:-2]
+    if raw_line.endswith((b"\n", b"\r")):
+        return raw_line[:-1]
+    return raw_line
+
+
+def decode_line(raw_line: bytes, encoding: str) -> str:
+    """``raw_line`` decoded with ``encoding``, or with the first later
+    candidate that accepts it (latin-1 accepts any byte sequence).
+
+    Readers decode line by line this way, so a byte the sample did not show
+    switches only its own line instead of failing the run. All candidates
+    keep ASCII (and so line breaks) intact, which makes lines independent.
+    """
+    try:
+        return raw_line.decode(encoding)
+    except UnicodeDecodeError:
+        pass
+    position = ENCODING_CANDIDATES.index(encoding) + 1 if encoding in ENCODING_CANDIDATES else 1
+    for candidate in ENCODING_CANDIDATES[position:-1]:
+        try:
+            return raw_line.decode(candidate)
+        except UnicodeDecodeError:
+            continue
+    return raw_line.decode(ENCODING_CANDIDATES[-1])
+
+
+def _iter_decoded_lines(raw_lines, encoding: str, progress: list[int]):
+    line_encoding = encoding
+    # A BOM can only open the first line.
+    rest_encoding = "utf-8" if encoding == "utf-8-sig" else encoding
+    for raw_line in raw_lines:
+        if b"\r" in _strip_line_end(raw_line):
+            # Lone CR line endings: split like text mode with newline="".
+            for part in raw_line.splitlines(keepends=True):
+                progress[0] += len(part)
+                yield decode_line(part, line_encoding)
+                line_encoding = rest_encoding
+        else:
+            progress[0] += len(raw_line)
+            yield decode_line(raw_line, line_encoding)
+            line_encoding = rest_encoding
+
+
+def _iter_line_blocks(path: Path, block_bytes: int = READ_AHEAD_BYTES, start: int = 0) -> Iterator[list[bytes]]:
+    """Raw lines in lists of about ``block_bytes`` (``readlines`` splits in C)."""
+    with path.open("rb") as handle:
+        handle.seek(start)
+        while True:
+            lines = handle.readlines(block_bytes)
+            if not lines:
+                return
+            yield lines
+
+
+def _projector(headers: list[str], fields: list[str]):
+    """Build ``row -> tuple`` extracting ``fields`` from a ``csv.reader`` row.
+
+    Like ``csv.DictReader``, a repeated header name resolves to its last
+    column; cells missing from short rows project as ``""``.
+    """
+    positions = {header: idx for idx, header in enumerate(headers)}
+    indexes = [positions[field] for field in fields]
+    if not indexes:
+        return lambda row: ()
+    needed = max(indexes) + 1
+    getter = itemgetter(*indexes)
+    single = len(indexes) == 1
+
+    def project(row: list[str]) -> tuple[str, ...]:
+        if len(row) < needed:
+            return tuple(row[idx] if idx < len(row) else "" for idx in indexes)
+        if single:
+            return (getter(row),)
+        return getter(row)
+
+    return project
+
+
+def iter_csv_projected(
+    path: str | Path,
+    encoding: str,
+    delimiter: str,
+    headers: list[str],
+    fields: list[str],
+    stages: StageGroup | None = None,
+    stage_name: str = "read",
+    start: int = 0,
+    line_num: int = 1,
+):
+    """Yield ``(line_num, values, offset)`` with only ``fields`` extracted.
+
+    Rows come from ``csv.reader`` and are never materialized as dicts;
+    ``values`` follows the order of ``fields`` and ``offset`` is the number of
+    bytes consumed once the row has been parsed. Blank rows are skipped and
+    line numbers follow ``csv.DictReader`` (first data row is line 2).
+
+    With ``stages`` the file is read ahead on a separate thread whose queue
+    is called ``stage_name``. A ``start`` past the header resumes at that
+    record boundary (an ``offset`` yielded earlier), numbering rows after
+    ``line_num``.
+    """
+    csv_path = Path(path)
+    project = _projector(headers, fields)
+    progress = [start]
+    if start > 0 and encoding == "utf-8-sig":
+        encoding = "utf-8"
+    if stages is not None:
+        blocks = _iter_line_blocks(csv_path, start=start)
+        raw_lines = itertools.chain.from_iterable(stages.thread(stage_name, blocks))
+        yield from _iter_projected_rows(raw_lines, encoding, delimiter, project, progress, start == 0, line_num)
+        return
+    with csv_path.open("rb") as handle:
+        handle.seek(start)
+        yield from _iter_projected_rows(handle, encoding, delimiter, project, progress, start == 0, line_num)
+
+
+def _iter_projected_rows(
+    raw_lines,
+    encoding: str,
+    delimiter: str,
+    project,
+    progress: list[int],
+    has_header: bool = True,
+    line_num: int = 1,
+):
+    reader = csv.reader(_iter_decoded_lines(raw_lines, encoding, progress), delimiter=delimiter)
+    if has_header and next(reader, None) is None:
+        return
+    for row in reader:
+        if not row:
+            continue
+        line_num += 1
+        yield line_num, project(row), progress[0]
+
+
+def _first_record_end(handle, start: int, quote_parity: int, block_size: int = 1 << 20) -> tuple[int, int] | None:
+    """Return ``(offset, parity)`` just past the first newline at or after
+    ``start`` that is outside a quoted field, given the quote parity at ``start``."""
+    handle.seek(start)
+    position = start
+    parity = quote_parity
+    while True:
+        block = handle.read(block_size)
+        if not block:
+            return None
+        search_from = 0
+        while True:
+            newline = block.find(b"\n", search_from)
+            if newline < 0:
+                break
+            parity ^= block.count(b'"', search_from, newline) & 1
+            if parity == 0:
+                return position + newline + 1, 0
+            search_from = newline + 1
+        parity ^= block.count(b'"', search_from) & 1
+        position += len(block)
+
+
+def find_record_boundaries(path: str | Path, chunk_bytes: int) -> list[int] | None:
+    """Split ``path`` into byte ranges that start and end on record boundaries.
+
+    Returns the sorted offsets ``[header_end, ..., file_size]`` or ``None`` when
+    the file cannot be split safely (lone CR line endings, unbalanced quotes).
+    Boundaries are found by tracking double-quote parity, which matches the
+    ``csv`` module for well-formed files.
+    """
+    csv_path = Path(path)
+    size = csv_path.stat().st_size
+    chunk_bytes = max(1, chunk_bytes)
+    with csv_path.open("rb") as handle:
+        header = _first_record_end(handle, 0, 0)
+        if header is None:
+            return None
+        boundaries = [header[0]]
+        parity_at = header[0]
+        parity = 0
+        while boundaries[-1] < size:
+            target = boundaries[-1] + chunk_bytes
+            if target >= size:
+                break
+            # Parity of quotes between the last boundary and the target.
+            handle.seek(parity_at)
+            remaining = target - parity_at
+            while remaining > 0:
+                block = handle.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                parity ^= block.count(b'"') & 1
+                remaining -= len(block)
+            found = _first_record_end(handle, target, parity)
+            if found is None:
+                break
+            boundaries.append(found[0])
+            parity_at, parity = found
+        # Every boundary sits at even parity, so the tail decides the balance.
+        handle.seek(boundaries[-1])
+        tail_quotes = 0
+        while True:
+            block = handle.read(1 << 20)
+            if not block:
+                break
+            tail_quotes += block.count(b'"')
+        if boundaries[-1] != size:
+            boundaries.append(size)
+    if tail_quotes % 2:
+        return None
+    return boundaries
+
+
+def iter_csv_chunk_projected(
+    path: str | Path,
+    encoding: str,
+    delimiter: str,
+    headers: list[str],
+    fields: list[str],
+    start: int,
+    end: int,
+):
+    """Yield ``(index, values)`` for the records stored in ``[start, end)``.
+
+    ``index`` counts parsed rows from zero within the chunk; the caller adds
+    the number of rows in previous chunks to obtain real line numbers.
+    """
+    csv_path = Path(path)
+    with csv_path.open("rb") as handle:
+        handle.seek(start)
+        payload = handle.read(end - start)
+    if start > 0 and encoding == "utf-8-sig":
+        encoding = "utf-8"
+    try:
+        text = payload.decode(encoding)
+    except UnicodeDecodeError:
+        # Same per-line fallback as ``iter_csv_projected``.
+        text = "".join(_iter_decoded_lines(payload.splitlines(keepends=True), encoding, [0]))
+    project = _projector(headers, fields)
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    index = 0
+    for row in reader:
+        if not row:
+            continue
+        yield index, project(row)
+        index += 1
@@ -0,0 +1,257 @@
+"""Suspects streamed to a JSONL file next to ``report.json``."""
+from __future__ import annotations
+
+import json
+import tempfile
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator
+
+SUSPECTS_FILENAME = "suspects.jsonl"
+
+
+class SuspectSink:
+    """Writes one JSON object per line as suspects are found.
+
+    Only per-reason/per-source counts and the first ``sample_size`` items
+    stay in memory; the full list lives in the file. ``resume`` takes a
+    ``state()`` from a checkpoint: the file is cut back to that point and
+    appended to. Items of a ``hold`` source wait in a temporary file until
+    ``release``, so sources read interleaved still land in source order.
+    """
+
+    def __init__(self, path: str | Path, sample_size: int = 100, resume: dict[str, Any] | None = None) -> None:
+        self.path = Path(path)
+        self._sample_size = max(0, sample_size)
+        self._sample: list[dict[str, Any]] = []
+        self._by_reason: Counter[str] = Counter()
+        self._by_source: Counter[str] = Counter()
+        self._handle = None
+        self._resume = resume
+        self._held: dict[str, Any] = {}
+
+    def open(self) -> SuspectSink:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._resume is None:
+            self._handle = self.path.open("w", encoding="utf-8", newline="\n")
+            return self
+        with self.path.open("r+b") as handle:
+            handle.truncate(self._resume["size"])
+        self._handle = self.path.open("a", encoding="utf-8", newline="\n")
+        self._by_reason = Counter(self._resume["by_reason"])
+        self._by_source = Counter(self._resume["by_source"])
+        self._sample = list(self._resume["sample"])
+        return self
+
+    def state(self) -> dict[str, Any]:
+        """Flush and describe what has been written so far."""
+        self._handle.flush()
+        return {
+            "size": self._handle.tell(),
+            "by_reason": dict(self._by_reason),
+            "by_source": dict(self._by_source),
+            "sample": list(self._sample),
+        }
+
+    def __enter__(self) -> SuspectSink:
+        return self.open()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for held in self._held.values():
+            held.close()
+        self._held = {}
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def hold(self, source: str) -> None:
+        self._held[source] = tempfile.TemporaryFile(
+            "w+", encoding="utf-8", newline="\n", dir=self.path.parent, suffix=".jsonl"
+        )
+
+    def release(self, source: str) -> None:
+        """Append the items held for ``source`` and count them."""
+        held = self._held.pop(source)
+        with held:
+            held.seek(0)
+            for line in held:
+                self._write(json.loads(line))
+
+    def add(self, item: dict[str, Any]) -> None:
+        held = self._held.get(item["source"])
+        if held is not None:
+            held.write(json.dumps(item, ensure_ascii=False))
+            held.write("\n")
+            return
+        self._write(item)
+
+    def _write(self, item: dict[str, Any]) -> None:
+        self._handle.write(json.dumps(item, ensure_ascii=False))
+        self._handle.write("\n")
+        self._by_reason[item["reason"]] += 1
+        self._by_source[item["source"]] += 1
+        if len(self._sample) < self._sample_size:
+            self._sample.append(item)
+
+    def __len__(self) -> int:
+        return sum(self._by_reason.values())
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "total": len(self),
+            "by_reason": dict(self._by_reason.most_common()),
+            "by_source": dict(self._by_source.most_common()),
+            "file": str(self.path),
+            "sample": self._sample,
+        }
+
+
+def iter_suspects(path: str | Path, start: int = 0, limit: int | None = None) -> Iterator[dict[str, Any]]:
+    """Read suspects back from a JSONL file, skipping the first ``start``."""
+    suspects_path = Path(path)
+    if not suspects_path.is_file():
+        return
+    with suspects_path.open("r", encoding="utf-8") as handle:
+        returned = 0
+        for position, line in enumerate(handle):
+            if position < start or not line.strip():
+                continue
+            if limit is not None and returned >= limit:
+                return
+            returned += 1
+            yield json.loads(line)
+
+
+class SuspectIndex:
+    """Random access to a suspects JSONL file through a line-offset index.
+
+    The index (byte offset plus reason/source codes per line) is built
+    lazily: ``fetch`` only scans as far as needed to make ``count`` more
+    rows of the current view available. Filtering by reason/source works
+    on the codes without parsing rows again; sorting by reason or source
+    needs the whole file scanned once. Rows themselves are read from disk
+    on demand in ``item``.
+    """
+
+    SORT_KEYS = ("reason", "source")
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle = self.path.open("rb") if self.path.is_file() else None
+        self._offsets = array("q")
+        self._reasons = array("H")
+        self._sources = array("H")
+        self._codes: dict[str, dict[str, int]] = {"reason": {}, "source": {}}
+        self._scan_pos = 0
+        self._scan_done = self._handle is None
+        self._filter: tuple[int | None, int | None] | None = None
+        self._sort: tuple[str, bool] | None = None
+        self._view: array | None = None
+        self._view_scanned = 0
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _code(self, kind: str, value: str) -> int:
+        codes = self._codes[kind]
+        return codes.setdefault(value, len(codes))
+
+    def _scan(self, lines: int | None) -> int:
+        """Index up to ``lines`` more lines (all remaining if ``None``)."""
+        if self._scan_done:
+            return 0
+        handle = self._handle
+        handle.seek(self._scan_pos)
+        added = 0
+        while lines is None or added < lines:
+            offset = handle.tell()
+            raw = handle.readline()
+            if not raw:
+                self._scan_done = True
+                break
+            if not raw.strip():
+                continue
+            item = json.loads(raw)
+            self._offsets.append(offset)
+            self._reasons.append(self._code("reason", item.get("reason", "")))
+            self._sources.append(self._code("source", item.get("source", "")))
+            added += 1
+        self._scan_pos = handle.tell()
+        return added
+
+    def _matches(self, position: int) -> bool:
+        reason, source = self._filter
+        if reason is not None and self._reasons[position] != reason:
+            return False
+        if source is not None and self._sources[position] != source:
+            return False
+        return True
+
+    def set_view(
+        self,
+        reason: str | None = None,
+        source: str | None = None,
+        sort_key: str | None = None,
+        descending: bool = False,
+    ) -> None:
+        """Filter by exact ``reason``/``source`` and optionally sort by
+        ``reason`` or ``source`` (ties keep file order)."""
+        if sort_key is not None and sort_key not in self.SORT_KEYS:
+            raise ValueError(f"Unsupported sort key: {sort_key}")
+        self._filter = None
+        if reason or source:
+            self._filter = (
+                # Codes are reserved up front so rows scanned later still match.
+                self._code("reason", reason) if reason else None,
+                self._code("source", source) if source else None,
+            )
+        self._sort = (sort_key, descending) if sort_key else None
+        self._view = None
+        self._view_scanned = 0
+        if self._sort is not None:
+            self._scan(None)
+            codes = self._reasons if sort_key == "reason" else self._sources
+            names = {code: name for name, code in self._codes[sort_key].items()}
+            positions = [
+                position for position in range(len(self._offsets)) if self._filter is None or self._matches(position)
+            ]
+            positions.sort(key=lambda position: names[codes[position]], reverse=descending)
+            self._view = array("q", positions)
+            self._view_scanned = len(self._offsets)
+        elif self._filter is not None:
+            self._view = array("q")
+
+    def _refresh_filtered(self) -> None:
+        for position in range(self._view_scanned, len(self._offsets)):
+            if self._matches(position):
+                self._view.append(position)
+        self._view_scanned = len(self._offsets)
+
+    def available(self) -> int:
+        """Rows of the current view that are indexed and can be shown."""
+        if self._view is None:
+            return len(self._offsets)
+        if self._sort is None:
+            self._refresh_filtered()
+        return len(self._view)
+
+    def can_fetch_more(self) -> bool:
+        return not self._scan_done and self._sort is None
+
+    def fetch(self, count: int) -> int:
+        """Make up to ``count`` more rows available; returns how many."""
+        before = self.available()
+        while self.available() - before < count and self.can_fetch_more():
+            self._scan(max(count, 256))
+        return min(count, self.available() - before)
+
+    def item(self, row: int) -> dict[str, Any]:
+        position = self._view[row] if self._view is not None else row
+        self._handle.seek(self._offsets[position])
+        return json.loads(self._handle.readline())
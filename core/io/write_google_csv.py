@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import csv
+import io
+from collections import deque
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from core.config import Config
 from core.models import Contact
 from core.normalize.phone import format_phone
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
 GOOGLE_HEADERS = [
     "First Name",
     "Middle Name",
@@ -30,35 +36,92 @@ GOOGLE_HEADERS = [
 ]
 
 
-def _contact_to_row(contact: Contact, config: Config) -> list[str]:
-    row = [""] * len(GOOGLE_HEADERS)
-    row[0] = contact.name
-    row[17] = "Mobile"
-    row[18] = format_phone(contact.phone, config.phone_prefix_plus)
-    return row
+def render_batch(batch: list[tuple[str, str]], prefix_plus: bool) -> str:
+    """Render ``(name, phone)`` pairs, header included, into one CSV string.
+
+    A single template row is refilled for every contact; ``csv.writer``
+    serializes each row before the next one is produced, so sharing it is safe.
+    """
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(GOOGLE_HEADERS)
+    template = [""] * len(GOOGLE_HEADERS)
+    template[17] = "Mobile"
+
+    def rows() -> Iterator[list[str]]:
+        for name, phone in batch:
+            template[0] = name
+            template[18] = format_phone(phone, prefix_plus)
+            yield template
+
+    writer.writerows(rows())
+    return buffer.getvalue()
+
+
+def write_batch_file(file_path: Path, batch: list[tuple[str, str]], prefix_plus: bool) -> None:
+    content = render_batch(batch, prefix_plus)
+    with file_path.open("w", encoding="utf-8-sig", newline="") as handle:
+        handle.write(content)
 
 
-def write_google_csv_batches(contacts: list[Contact], out_dir: str | Path, config: Config) -> list[Path]:
+def write_google_csv_batches(contacts: Iterable[Contact], out_dir: str | Path, config: Config) -> list[Path]:
+    """Write ``contacts`` into ``saida_NNN.csv`` files of ``batch_size`` rows.
+
+    ``contacts`` is consumed as a stream and grouped into batches of
+    ``(name, phone)`` pairs. With ``config.workers > 1`` full batches are
+    rendered and written by a process pool while the next batch is collected;
+    at most ``2 * workers`` batches are pending at once. The pool is only
+    started once a second batch exists, so a single batch is written
+    in-process.
+    """
     output_dir = Path(out_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     output_files: list[Path] = []
-    if not contacts:
-        return output_files
-
-    total = len(contacts)
     batch_size = max(1, config.batch_size)
-    batches = (total + batch_size - 1) // batch_size
-
-    for index in range(batches):
-        start = index * batch_size
-        end = min(start + batch_size, total)
-        file_path = output_dir / f"saida_{index + 1:03d}.csv"
-        with file_path.open("w", encoding="utf-8-sig", newline="") as handle:
-            writer = csv.writer(handle)
-            writer.writerow(GOOGLE_HEADERS)
-            for contact in contacts[start:end]:
-                writer.writerow(_contact_to_row(contact, config))
+    prefix_plus = config.phone_prefix_plus
+    workers = max(1, config.workers)
+    executor = None
+    held: list[tuple[Path, list[tuple[str, str]]]] = []
+    pending: deque[Future] = deque()
+
+    def submit(file_path: Path, batch: list[tuple[str, str]]) -> None:
+        while len(pending) >= workers * 2:
+            pending.popleft().result()
+        pending.append(executor.submit(write_batch_file, file_path, batch, prefix_plus))
+
+    def flush(batch: list[tuple[str, str]]) -> None:
+        nonlocal executor
+        file_path = output_dir / f"saida_{len(output_files) + 1:03d}.csv"
         output_files.append(file_path)
+        if workers == 1:
+            write_batch_file(file_path, batch, prefix_plus)
+            return
+        if executor is None:
+            if not held:
+                held.append((file_path, batch))
+                return
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(max_workers=workers)
+            submit(*held.pop())
+        submit(file_path, batch)
+
+    try:
+        batch: list[tuple[str, str]] = []
+        for contact in contacts:
+            batch.append((contact.name, contact.phone))
+            if len(batch) == batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        for file_path, held_batch in held:
+            write_batch_file(file_path, held_batch, prefix_plus)
+        while pending:
+            pending.popleft().result()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     return output_files
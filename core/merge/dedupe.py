@@ -1,32 +1,192 @@
+"""Merge and dedupe helpers."""
 from __future__ import annotations
 
-from core.merge.merge_rules import merge_contacts
+import heapq
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from core.merge.merge_rules import MergeAccumulator
 from core.models import Contact
 
 
+def _write_run(path: Path, contacts: list[Contact]) -> None:
+    with path.open("wb") as handle:
+        pickler = pickle.Pickler(handle, protocol=pickle.HIGHEST_PROTOCOL)
+        for contact in contacts:
+            pickler.dump((contact.phone, contact.name, contact.notes, contact.labels, contact.sources))
+
+
+def _read_run(path: Path) -> Iterator[Contact]:
+    with path.open("rb") as handle:
+        unpickler = pickle.Unpickler(handle)
+        while True:
+            try:
+                phone, name, notes, labels, sources = unpickler.load()
+            except EOFError:
+                return
+            yield Contact(name=name, phone=phone, notes=notes, labels=labels, sources=sources)
+
+
 class ContactIndex:
-    def __init__(self, treat_dot_as_empty: bool = True, protect_good_name: bool = True) -> None:
+    """Dedupes contacts by phone.
+
+    With ``spill_threshold`` set, the in-memory map is sorted and written to a
+    temporary run file whenever it reaches that many contacts; ``iter_sorted``
+    then k-way merges the runs by phone, folding duplicates in insertion
+    order, so the result matches the all-in-memory path. Duplicates are
+    merged in place through ``MergeAccumulator``.
+    """
+
+    def __init__(
+        self,
+        treat_dot_as_empty: bool = True,
+        protect_good_name: bool = True,
+        spill_threshold: int = 0,
+        spill_dir: str | Path | None = None,
+    ) -> None:
         self._by_phone: dict[str, Contact] = {}
-        self.duplicates_merged = 0
+        # Only phones that have been hit more than once get an accumulator.
+        self._accumulators: dict[str, MergeAccumulator] = {}
         self._treat_dot_as_empty = treat_dot_as_empty
         self._protect_good_name = protect_good_name
+        self._spill_threshold = max(0, spill_threshold)
+        self._spill_dir = spill_dir
+        self._temp_dir: tempfile.TemporaryDirectory | None = None
+        self._runs: list[Path] = []
+        self._memory_duplicates = 0
+        self._run_duplicates = 0
+
+    @property
+    def duplicates_merged(self) -> int:
+        """Merges done so far; duplicates across spilled runs are only
+        counted once ``iter_sorted`` has been consumed."""
+        return self._memory_duplicates + self._run_duplicates
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
 
     def add(self, contact: Contact) -> bool:
+        """Add ``contact``; returns True when it merged into an in-memory entry."""
         existing = self._by_phone.get(contact.phone)
         if existing is None:
             self._by_phone[contact.phone] = contact
+            if self._spill_threshold and len(self._by_phone) >= self._spill_threshold:
+                self._spill()
             return False
-        self._by_phone[contact.phone] = merge_contacts(
-            existing,
-            contact,
-            self._treat_dot_as_empty,
-            self._protect_good_name,
-        )
-        self.duplicates_merged += 1
+        accumulator = self._accumulators.get(contact.phone)
+        if accumulator is None:
+            accumulator = MergeAccumulator(existing, self._treat_dot_as_empty, self._protect_good_name)
+            self._accumulators[contact.phone] = accumulator
+            self._by_phone[contact.phone] = accumulator.contact
+        accumulator.merge(contact)
+        self._memory_duplicates += 1
         return True
 
+    def _run_dir(self) -> Path:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="stz-dedupe-", dir=self._spill_dir)
+        return Path(self._temp_dir.name)
+
+    def _spill(self) -> None:
+        run_path = self._run_dir() / f"run_{len(self._runs):05d}.pickle"
+        _write_run(run_path, sorted(self._by_phone.values(), key=lambda contact: contact.phone))
+        self._runs.append(run_path)
+        self._by_phone = {}
+        self._accumulators = {}
+
+    def snapshot(self, directory: str | Path) -> dict[str, Any]:
+        """Picklable state for a checkpoint; spilled runs (immutable once
+        written) are copied into ``directory`` the first time they are seen."""
+        target_dir = Path(directory)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for run_path in self._runs:
+            target = target_dir / run_path.name
+            if not target.exists():
+                partial = target.with_suffix(".tmp")
+                shutil.copyfile(run_path, partial)
+                partial.replace(target)
+        return {
+            "by_phone": self._by_phone,
+            "accumulators": self._accumulators,
+            "memory_duplicates": self._memory_duplicates,
+            "runs": [run_path.name for run_path in self._runs],
+        }
+
+    def restore(self, state: dict[str, Any], directory: str | Path) -> None:
+        """Load a ``snapshot`` taken into ``directory``. Runs spilled there
+        after the snapshot are deleted, since this run will write its own."""
+        self._by_phone = state["by_phone"]
+        self._accumulators = state["accumulators"]
+        self._memory_duplicates = state["memory_duplicates"]
+        self._runs = []
+        for name in state["runs"]:
+            run_path = self._run_dir() / name
+            shutil.copyfile(Path(directory) / name, run_path)
+            self._runs.append(run_path)
+        for stale in Path(directory).glob("run_*"):
+            if stale.name not in state["runs"]:
+                stale.unlink()
+
+    def iter_sorted(self) -> Iterator[Contact]:
+        """Yield deduped contacts ordered by phone."""
+        in_memory = sorted(self._by_phone.values(), key=lambda contact: contact.phone)
+        if not self._runs:
+            yield from in_memory
+            return
+        sources = [_read_run(path) for path in self._runs]
+        sources.append(iter(in_memory))
+        yield from self._fold_sorted(heapq.merge(*sources, key=lambda contact: contact.phone))
+
+    def iter_presorted(self, streams: Iterable[Iterator[Contact]]) -> Iterator[Contact]:
+        """Dedupe contact streams that are each already ordered by phone.
+
+        Nothing is buffered: streams are merged lazily and equal phones are
+        folded as they arrive, earlier streams first. Raises ``ValueError``
+        as soon as a phone arrives out of order.
+        """
+        merged_stream = heapq.merge(*streams, key=lambda contact: contact.phone)
+        yield from self._fold_sorted(merged_stream, check_order=True)
+
+    def _fold_sorted(self, merged_stream: Iterable[Contact], check_order: bool = False) -> Iterator[Contact]:
+        # heapq.merge is stable, so equal phones arrive in run (insertion) order.
+        self._run_duplicates = 0
+        current: Contact | None = None
+        accumulator: MergeAccumulator | None = None
+        for contact in merged_stream:
+            if current is not None and contact.phone == current.phone:
+                if accumulator is None:
+                    accumulator = MergeAccumulator(current, self._treat_dot_as_empty, self._protect_good_name)
+                    current = accumulator.contact
+                accumulator.merge(contact)
+                self._run_duplicates += 1
+                continue
+            if current is not None:
+                if check_order and contact.phone < current.phone:
+                    raise ValueError(
+                        f"Input is not sorted by phone: {contact.phone} after {current.phone}."
+                    )
+                yield current
+            current = contact
+            accumulator = None
+        if current is not None:
+            yield current
+
     def values(self) -> list[Contact]:
+        if self._runs:
+            return list(self.iter_sorted())
         return list(self._by_phone.values())
 
+    def close(self) -> None:
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+        self._runs = []
+
     def __len__(self) -> int:
+        if self._runs:
+            return sum(1 for _ in self.iter_sorted())
         return len(self._by_phone)
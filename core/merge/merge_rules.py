@@ -52,3 +52,50 @@ def merge_contacts(
         sources=existing.sources | incoming.sources,
     )
     return merged
+
+
+class MergeAccumulator:
+    """Mutable merge target for a phone that keeps receiving duplicates.
+
+    Produces the same result as folding ``merge_contacts`` over the same
+    sequence, but mutates one ``Contact`` in place, keeps a persistent set of
+    seen notes and remembers whether the current name is a good one. The
+    wrapped contact gets its own notes list and label/source sets on creation,
+    so containers shared between input contacts are never mutated.
+    """
+
+    __slots__ = ("contact", "_notes_seen", "_name_is_good", "_treat_dot_as_empty", "_protect_good_name")
+
+    def __init__(self, contact: Contact, treat_dot_as_empty: bool = True, protect_good_name: bool = True) -> None:
+        name = clean_name(contact.name, treat_dot_as_empty)
+        notes = merge_notes(contact.notes, [])
+        self.contact = Contact(
+            name=name,
+            phone=contact.phone,
+            notes=notes,
+            labels=set(contact.labels),
+            sources=set(contact.sources),
+        )
+        self._notes_seen = set(notes)
+        self._name_is_good = not is_phone_like_name(name)
+        self._treat_dot_as_empty = treat_dot_as_empty
+        self._protect_good_name = protect_good_name
+
+    def merge(self, incoming: Contact) -> None:
+        contact = self.contact
+        if not (self._protect_good_name and self._name_is_good):
+            incoming_clean = clean_name(incoming.name, self._treat_dot_as_empty)
+            if incoming_clean and not is_phone_like_name(incoming_clean):
+                contact.name = incoming_clean
+                self._name_is_good = True
+            elif not contact.name:
+                contact.name = incoming_clean
+
+        notes_seen = self._notes_seen
+        for note in incoming.notes:
+            note_clean = note.strip()
+            if note_clean and note_clean not in notes_seen:
+                contact.notes.append(note_clean)
+                notes_seen.add(note_clean)
+        contact.labels.update(incoming.labels)
+        contact.sources.update(incoming.sources)
@@ -1,42 +1,63 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
+EMPTY_SET: frozenset[str] = frozenset()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class PhoneEntry:
     raw: str
     normalized: str
 
 
-@dataclass
-class ContactSeed:
-    name: str
-    phones: list[PhoneEntry]
-    notes: list[str] = field(default_factory=list)
-    labels: set[str] = field(default_factory=set)
-    sources: set[str] = field(default_factory=set)
+@dataclass(slots=True)
+class Contact:
+    """A deduplicated contact.
 
+    ``notes`` may be a shared empty tuple and ``labels``/``sources`` may be
+    shared frozensets (see ``intern_labels``); the ``add_*`` helpers copy them
+    before the first mutation.
+    """
 
-@dataclass
-class Contact:
     name: str
     phone: str
-    notes: list[str] = field(default_factory=list)
-    labels: set[str] = field(default_factory=set)
-    sources: set[str] = field(default_factory=set)
+    notes: list[str] | tuple[str, ...] = ()
+    labels: set[str] | frozenset[str] = EMPTY_SET
+    sources: set[str] | frozenset[str] = EMPTY_SET
 
     def add_note(self, note: str) -> None:
         note_clean = note.strip()
         if note_clean and note_clean not in self.notes:
+            if not isinstance(self.notes, list):
+                self.notes = list(self.notes)
             self.notes.append(note_clean)
 
     def add_label(self, label: str) -> None:
         label_clean = label.strip()
         if label_clean:
+            if not isinstance(self.labels, set):
+                self.labels = set(self.labels)
             self.labels.add(label_clean)
 
     def add_source(self, source: str) -> None:
         source_clean = source.strip()
         if source_clean:
+            if not isinstance(self.sources, set):
+                self.sources = set(self.sources)
             self.sources.add(source_clean)
+
+
+class LabelInterner:
+    """Returns one shared frozenset per distinct label combination.
+
+    CRM rows nearly always carry the same ``{config.label}`` set, so storing
+    a single frozenset per combination saves a set object per contact.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[frozenset[str], frozenset[str]] = {EMPTY_SET: EMPTY_SET}
+
+    def __call__(self, values: set[str] | frozenset[str]) -> frozenset[str]:
+        key = values if isinstance(values, frozenset) else frozenset(values)
+        return self._cache.setdefault(key, key)
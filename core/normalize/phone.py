@@ -1,6 +1,43 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 import re
+from typing import Callable, Sequence
+
+NON_DIGITS_REGEX = re.compile(r"\D+")
+# Separators commonly found in formatted phones; removing them with
+# str.translate avoids the regex for values like "+55 (11) 91234-5678".
+_PHONE_SEPARATORS = str.maketrans("", "", " ()-+./")
+# Below this many values the NumPy setup costs more than it saves.
+VECTORIZE_MIN_VALUES = 64
+# The array path lays values out in rows as wide as the longest one; longer
+# cells (a note pasted into a phone column) are normalized one by one.
+VECTORIZE_MAX_CHARS = 64
+
+_UNLOADED = object()
+_numpy = _UNLOADED
+
+
+def load_numpy():
+    """Import the optional ``numpy`` on first use; ``None`` when missing."""
+    global _numpy
+    if _numpy is _UNLOADED:
+        try:
+            import numpy  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            _numpy = None
+        else:
+            _numpy = numpy
+    return _numpy
+
+
+def _only_digits(value: str) -> str:
+    if value.isascii():
+        stripped = value.translate(_PHONE_SEPARATORS)
+        if stripped.isdigit():
+            return stripped
+    return NON_DIGITS_REGEX.sub("", value)
 
 
 def normalize_phone(
@@ -12,11 +49,11 @@ def normalize_phone(
 ) -> str:
     if not value:
         return ""
-    digits = re.sub(r"\D+", "", value)
+    digits = _only_digits(value)
     if not digits:
         return ""
 
-    ddi_digits = re.sub(r"\D+", "", ddi_override or "")
+    ddi_digits = _only_digits(ddi_override) if ddi_override else ""
     if ddi_digits:
         if min_len and digits.startswith(ddi_digits) and len(digits) >= min_len:
             return digits
@@ -29,6 +66,161 @@ def normalize_phone(
     return digits
 
 
+@dataclass(frozen=True)
+class PhoneBatch:
+    """Normalized phones for a batch of raw values, in input order.
+
+    ``length_suspect`` flags non-empty results whose length is outside
+    ``[min_phone_len, max_phone_len]``; ``vectorized`` tells whether NumPy
+    did the work (and the per-value cache was bypassed).
+    """
+
+    normalized: list[str]
+    length_suspect: list[bool]
+    vectorized: bool = False
+
+
+def _length_suspects(normalized: list[str], min_phone_len: int, max_phone_len: int) -> list[bool]:
+    return [bool(value) and not min_phone_len <= len(value) <= max_phone_len for value in normalized]
+
+
+def _normalize_batch_numpy(
+    np,
+    values: Sequence[str],
+    ddi_overrides: Sequence[str | None],
+    ddi_default: str,
+    assume_ddi: bool,
+    min_len: int | None,
+):
+    """Array version of ``normalize_phone``.
+
+    Values are laid out as a 2-D array of code points and ASCII digits are
+    packed to the left of each row; the DDI prefix is then chosen per value
+    and applied with one vectorized concatenation. Returns the normalized
+    array and the positions of non-ASCII values, which the caller redoes
+    with ``normalize_phone``.
+    """
+    count = len(values)
+    raw = np.array(values, dtype=str)
+    width = raw.dtype.itemsize // 4
+    if width == 0:
+        return np.full(count, "", dtype="<U1"), ()
+    codes = raw.view(np.uint32).reshape(count, width)
+    is_digit = (codes >= 48) & (codes <= 57)
+    rows, cols = np.nonzero(is_digit)
+    packed = np.zeros_like(codes)
+    packed[rows, np.cumsum(is_digit, axis=1)[rows, cols] - 1] = codes[rows, cols]
+    digits = packed.view(raw.dtype).reshape(count)
+    lengths = is_digit.sum(axis=1)
+
+    override_digits = {override: _only_digits(override) for override in set(ddi_overrides) if override}
+    override_digits[None] = ""
+    overrides = np.array([override_digits[override or None] for override in ddi_overrides], dtype=str)
+    from_override = np.char.str_len(overrides) > 0
+    prefixes = np.where(from_override, overrides, ddi_default if assume_ddi else "")
+
+    starts = np.char.startswith(digits, prefixes)
+    has_prefix = np.char.str_len(prefixes) > 0
+    if min_len:
+        keep_override = starts & (lengths >= min_len)
+    else:
+        keep_override = np.zeros(count, dtype=bool)
+    add = has_prefix & (lengths > 0) & np.where(from_override, ~keep_override, ~starts)
+    normalized = np.where(add, np.char.add(prefixes, digits), digits)
+    return normalized, np.flatnonzero((codes > 127).any(axis=1)).tolist()
+
+
+def normalize_phone_batch(
+    values: Sequence[str],
+    ddi_overrides: Sequence[str | None],
+    ddi_default: str,
+    assume_ddi: bool,
+    min_len: int | None,
+    min_phone_len: int,
+    max_phone_len: int,
+    normalize: Callable[..., str] = normalize_phone,
+    vectorize: bool = True,
+) -> PhoneBatch:
+    """``normalize_phone`` over many values plus the phone_length check.
+
+    ``ddi_overrides`` holds the row DDI for each value. With NumPy available
+    and enough values the work is done on arrays (non-ASCII values still go
+    through ``normalize_phone`` so Unicode digits behave the same, as do
+    values longer than ``VECTORIZE_MAX_CHARS``); otherwise
+    each value goes through ``normalize`` (usually a ``CachedPhoneNormalizer``).
+    Both paths return the same result.
+    """
+    np = load_numpy() if vectorize and len(values) >= VECTORIZE_MIN_VALUES else None
+    if np is None:
+        normalized = [
+            normalize(value, ddi_default, assume_ddi, override, min_len)
+            for value, override in zip(values, ddi_overrides)
+        ]
+        return PhoneBatch(normalized, _length_suspects(normalized, min_phone_len, max_phone_len))
+
+    oversized = [position for position, value in enumerate(values) if len(value) > VECTORIZE_MAX_CHARS]
+    array_values = values
+    if oversized:
+        array_values = list(values)
+        for position in oversized:
+            array_values[position] = ""
+    result, non_ascii = _normalize_batch_numpy(np, array_values, ddi_overrides, ddi_default, assume_ddi, min_len)
+    lengths = np.char.str_len(result)
+    suspect = (lengths > 0) & ((lengths < min_phone_len) | (lengths > max_phone_len))
+    normalized = result.tolist()
+    length_suspect = suspect.tolist()
+    for position in [*non_ascii, *oversized]:
+        fixed = normalize_phone(values[position], ddi_default, assume_ddi, ddi_overrides[position], min_len)
+        normalized[position] = fixed
+        length_suspect[position] = _length_suspects([fixed], min_phone_len, max_phone_len)[0]
+    return PhoneBatch(normalized, length_suspect, vectorized=True)
+
+
+class CachedPhoneNormalizer:
+    """``normalize_phone`` behind a bounded LRU cache.
+
+    The cache key is the full argument tuple, so one instance can be shared
+    between runs with different DDI settings. ``lru_cache`` is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = max(0, maxsize)
+        self._normalize = lru_cache(maxsize=self.maxsize)(normalize_phone)
+        self._external_hits = 0
+        self._external_misses = 0
+        self._vectorized = 0
+
+    def __call__(
+        self,
+        value: str | None,
+        ddi_default: str,
+        assume_ddi: bool,
+        ddi_override: str | None = None,
+        min_len: int | None = None,
+    ) -> str:
+        return self._normalize(value, ddi_default, assume_ddi, ddi_override, min_len)
+
+    def record_vectorized(self, count: int) -> None:
+        """Count values normalized by ``normalize_phone_batch`` on arrays."""
+        self._vectorized += count
+
+    def record_external(self, hits: int, misses: int, vectorized: int = 0) -> None:
+        """Fold in counters gathered by caches living in worker processes."""
+        self._external_hits += hits
+        self._external_misses += misses
+        self._vectorized += vectorized
+
+    def stats(self) -> dict[str, int]:
+        info = self._normalize.cache_info()
+        return {
+            "hits": info.hits + self._external_hits,
+            "misses": info.misses + self._external_misses,
+            "vectorized": self._vectorized,
+            "maxsize": self.maxsize,
+            "currsize": info.currsize,
+        }
+
+
 def format_phone(value: str, prefix_plus: bool) -> str:
     if not value:
         return ""
@@ -1,13 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import re
 
-try:  # Optional dependency
-    import ftfy  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    ftfy = None
-
 REPLACEMENT_CHAR = "\ufffd"
 MOJIBAKE_REGEXES = (
     re.compile(r"Ã[\u0080-\u00BF]"),
@@ -15,6 +11,13 @@ MOJIBAKE_REGEXES = (
     re.compile(r"â€"),
 )
 FTFY_BADNESS_THRESHOLD = 1.0
+# Text limited to ASCII and the Latin-1 letters (U+00C0-U+00FF) cannot carry
+# UTF-8 mojibake: mis-decoded continuation bytes always land in U+0080-U+00BF
+# or on cp1252 symbols outside Latin-1.
+LATIN1_SAFE_REGEX = re.compile(r"[\x00-\x7f\u00c0-\u00ff]*")
+
+_UNLOADED = object()
+_ftfy = _UNLOADED
 
 
 @dataclass(frozen=True)
@@ -25,16 +28,41 @@ class MojibakeResult:
     badness: float | None
 
 
+NOT_SUSPECT = MojibakeResult(False, None, None, None)
+
+
+def load_ftfy():
+    """Import the optional ``ftfy`` on first use (it is slow to import and
+    most names never reach it); ``None`` when it is not installed."""
+    global _ftfy
+    if _ftfy is _UNLOADED:
+        try:
+            import ftfy  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            _ftfy = None
+        else:
+            _ftfy = ftfy
+    return _ftfy
+
+
+def is_mojibake_safe(value: str) -> bool:
+    return value.isascii() or LATIN1_SAFE_REGEX.fullmatch(value) is not None
+
+
 def analyze_mojibake(value: str | None) -> MojibakeResult:
-    if not value:
-        return MojibakeResult(False, None, None, None)
+    if not value or is_mojibake_safe(value):
+        return NOT_SUSPECT
+    return _analyze_mojibake_slow(value)
 
+
+def _analyze_mojibake_slow(value: str) -> MojibakeResult:
     reason = None
     if REPLACEMENT_CHAR in value:
         reason = "replacement_char"
     elif any(regex.search(value) for regex in MOJIBAKE_REGEXES):
         reason = "pattern"
 
+    ftfy = load_ftfy()
     badness_score = None
     if ftfy is not None:
         try:
@@ -55,3 +83,40 @@ def analyze_mojibake(value: str | None) -> MojibakeResult:
             suggested_fix = fixed
 
     return MojibakeResult(suspect, reason, suggested_fix, badness_score)
+
+
+class MojibakeAnalyzer:
+    """Per-run front-end for ``analyze_mojibake``.
+
+    Safe names are answered without touching the cache; the rest are looked up
+    in a bounded LRU so each distinct suspicious-looking name hits the regexes
+    and ftfy only once.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = max(0, maxsize)
+        self._analyze = lru_cache(maxsize=self.maxsize)(_analyze_mojibake_slow)
+        self._skipped = 0
+        self._external = [0, 0, 0]
+
+    def __call__(self, value: str | None) -> MojibakeResult:
+        if not value or is_mojibake_safe(value):
+            self._skipped += 1
+            return NOT_SUSPECT
+        return self._analyze(value)
+
+    def record_external(self, hits: int, misses: int, skipped: int) -> None:
+        """Fold in counters gathered by analyzers living in worker processes."""
+        self._external[0] += hits
+        self._external[1] += misses
+        self._external[2] += skipped
+
+    def stats(self) -> dict[str, int]:
+        info = self._analyze.cache_info()
+        return {
+            "hits": info.hits + self._external[0],
+            "misses": info.misses + self._external[1],
+            "skipped": self._skipped + self._external[2],
+            "maxsize": self.maxsize,
+            "currsize": info.currsize,
+        }
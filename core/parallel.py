@@ -0,0 +1,195 @@
+"""Multi-process row normalization over record-aligned byte ranges."""
+from __future__ import annotations
+
+import csv
+from collections import deque
+from typing import TYPE_CHECKING, Iterator
+
+from core.config import Config
+from core.io.columns import ColumnMap
+from core.io.meta_cache import CsvMetaCache
+from core.io.read_csv import CsvMeta, find_record_boundaries, iter_csv_chunk_projected
+from core.normalize.phone import CachedPhoneNormalizer
+from core.normalize.text import MojibakeAnalyzer
+from core.rows import NORMALIZE_BATCH_ROWS, RowNormalizer, RowResult, iter_row_batches
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+MIN_CHUNK_BYTES = 4 * 1024 * 1024
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+# Caches live for the whole process and are reused by every chunk (or every
+# job of a batch run).
+_worker_caches: tuple[CachedPhoneNormalizer, MojibakeAnalyzer] | None = None
+
+
+def get_process_caches(config: Config) -> tuple[CachedPhoneNormalizer, MojibakeAnalyzer]:
+    """Phone and mojibake caches shared by everything this process runs;
+    rebuilt only when ``config`` asks for different sizes."""
+    global _worker_caches
+    if (
+        _worker_caches is None
+        or _worker_caches[0].maxsize != max(0, config.phone_cache_size)
+        or _worker_caches[1].maxsize != max(0, config.mojibake_cache_size)
+    ):
+        _worker_caches = (
+            CachedPhoneNormalizer(config.phone_cache_size),
+            MojibakeAnalyzer(config.mojibake_cache_size),
+        )
+    return _worker_caches
+
+
+def stats_delta(before: dict[str, dict[str, int]], after: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    counters = ("hits", "misses", "skipped", "vectorized")
+    return {
+        name: {key: after[name][key] - before[name][key] for key in counters if key in after[name]}
+        for name in after
+    }
+
+
+def _chunk_bytes(size: int, workers: int) -> int:
+    target = size // max(1, workers * CHUNKS_PER_WORKER)
+    return max(MIN_CHUNK_BYTES, min(MAX_CHUNK_BYTES, target))
+
+
+def _boundaries_look_aligned(meta: CsvMeta, boundaries: list[int]) -> bool:
+    """Cheap sanity check: each inner boundary must start a full-width record."""
+    expected = len(meta.headers)
+    with meta.path.open("rb") as handle:
+        for offset in boundaries[1:-1]:
+            handle.seek(offset)
+            sample = handle.read(64 * 1024)
+            encoding = "utf-8" if meta.encoding == "utf-8-sig" else meta.encoding
+            text = sample.decode(encoding, errors="replace")
+            lines = text.splitlines(keepends=True)
+            try:
+                first = next(csv.reader(lines, delimiter=meta.delimiter), None)
+            except csv.Error:
+                return False
+            if first is not None and len(first) != expected:
+                return False
+    return True
+
+
+def plan_chunks(
+    meta: CsvMeta,
+    workers: int,
+    chunk_bytes: int | None = None,
+    cache: CsvMetaCache | None = None,
+) -> list[tuple[int, int]] | None:
+    """Return record-aligned ``(start, end)`` byte ranges, or ``None`` if the
+    file must be processed serially. Boundaries are reused from ``cache``
+    when the file has not changed."""
+    size = meta.path.stat().st_size
+    chunk_bytes = chunk_bytes or _chunk_bytes(size, workers)
+    cache_key = str(chunk_bytes)
+    cached = cache.get(meta.path) if cache is not None else None
+    if cached is not None and cache_key in cached.get("boundaries", {}):
+        boundaries = cached["boundaries"][cache_key]
+    else:
+        boundaries = find_record_boundaries(meta.path, chunk_bytes)
+        if boundaries is not None and not _boundaries_look_aligned(meta, boundaries):
+            boundaries = None
+        if cache is not None:
+            known = dict(cached.get("boundaries", {})) if cached is not None else {}
+            known[cache_key] = boundaries
+            cache.update(meta.path, boundaries=known)
+    if boundaries is None:
+        return None
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def normalize_chunk(
+    path: str,
+    encoding: str,
+    delimiter: str,
+    headers: list[str],
+    start: int,
+    end: int,
+    source: str,
+    columns: ColumnMap,
+    config: Config,
+) -> tuple[int, list[RowResult], dict[str, dict[str, int]]]:
+    """Worker entry point: normalize every record in ``[start, end)``.
+
+    Line numbers in the results are relative (the first row is line 2); the
+    parent shifts them by the number of rows in the preceding chunks. The
+    last item holds the cache counter deltas for this chunk.
+    """
+    normalizer = RowNormalizer(source, columns, config, *get_process_caches(config))
+    before = normalizer.cache_stats()
+    rows = iter_csv_chunk_projected(path, encoding, delimiter, headers, normalizer.fields, start, end)
+    results: list[RowResult] = []
+    for batch in iter_row_batches(((index + 2, row) for index, row in rows), NORMALIZE_BATCH_ROWS):
+        results.extend(normalizer.normalize_many(batch))
+    return end, results, stats_delta(before, normalizer.cache_stats())
+
+
+def iter_parallel_row_results(
+    meta: CsvMeta,
+    chunks: list[tuple[int, int]],
+    source: str,
+    columns: ColumnMap,
+    config: Config,
+    workers: int,
+    normalizer: RowNormalizer | None = None,
+    rows_before: int = 0,
+) -> Iterator[tuple[int, list[RowResult]]]:
+    """Yield ``(end_offset, results)`` per chunk, in file order.
+
+    Worker cache counters are folded into the caches of ``normalizer``.
+    ``rows_before`` is the number of rows preceding the first chunk, for
+    runs resumed mid-file.
+
+    At most ``2 * workers`` chunks are in flight so memory stays bounded when
+    the consumer is slower than the pool. Closing the generator early (for
+    example on cancellation) drops the chunks that have not started yet.
+    """
+    pending: deque[Future] = deque()
+    chunk_iter = iter(chunks)
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit_next() -> None:
+        chunk = next(chunk_iter, None)
+        if chunk is None:
+            return
+        pending.append(
+            executor.submit(
+                normalize_chunk,
+                str(meta.path),
+                meta.encoding,
+                meta.delimiter,
+                meta.headers,
+                chunk[0],
+                chunk[1],
+                source,
+                columns,
+                config,
+            )
+        )
+
+    try:
+        for _ in range(workers * 2):
+            submit_next()
+        while pending:
+            end, results, cache_delta = pending.popleft().result()
+            submit_next()
+            if normalizer is not None:
+                phone_delta = cache_delta["phone_normalize"]
+                normalizer.phone_normalizer.record_external(
+                    phone_delta["hits"], phone_delta["misses"], phone_delta["vectorized"]
+                )
+                mojibake_delta = cache_delta["mojibake"]
+                normalizer.mojibake_analyzer.record_external(
+                    mojibake_delta["hits"], mojibake_delta["misses"], mojibake_delta["skipped"]
+                )
+            for result in results:
+                result.line_num += rows_before
+            rows_before += len(results)
+            yield end, results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
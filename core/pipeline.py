@@ -1,75 +1,41 @@
 from __future__ import annotations
 
+import cProfile
+import contextlib
+import functools
+import itertools
 import json
+import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Iterator
 
+from core.checkpoint import Checkpointer, CheckpointState, InputProgress, checkpoint_dir, run_key
 from core.config import ColumnOverrides, Config
 from core.io.columns import ColumnMap, resolve_crm_columns, resolve_google_columns
-from core.io.read_csv import CsvMeta, iter_csv_rows, prepare_csv
+from core.io.meta_cache import CsvMetaCache, cached_rows_total
+from core.io.read_csv import CsvMeta, iter_csv_projected, prepare_csv
+from core.io.suspects import SUSPECTS_FILENAME, SuspectSink
 from core.io.write_google_csv import write_google_csv_batches
 from core.merge.dedupe import ContactIndex
-from core.models import Contact, PhoneEntry
-from core.normalize.name import build_fallback_name, clean_name, is_phone_like_name
-from core.normalize.phone import normalize_phone
-from core.normalize.text import analyze_mojibake
+from core.models import Contact, LabelInterner
+from core.normalize.name import build_fallback_name, is_phone_like_name
+from core.normalize.phone import CachedPhoneNormalizer
+from core.normalize.text import MojibakeAnalyzer
+from core.parallel import iter_parallel_row_results, plan_chunks, stats_delta
+from core.progress import PROGRESS_INTERVAL_S, ProgressReporter, ProgressUpdate
+from core.rows import RowNormalizer, RowResult, iter_row_batches
+from core.stages import StageGroup
+from core.timing import NULL_TIMER, NullTimer, StageTimer
 
 
 class PipelineCancelled(Exception):
     pass
 
-def _parse_labels(raw: str | None, separator_hint: str) -> set[str]:
-    if not raw:
-        return set()
-    if separator_hint in raw:
-        parts = raw.split(separator_hint)
-    elif "," in raw:
-        parts = raw.split(",")
-    else:
-        parts = [raw]
-    return {part.strip() for part in parts if part.strip()}
-
-
-def _build_crm_notes(row: dict[str, Any], column_map: ColumnMap) -> list[str]:
-    return []
-
-
-def _split_phone_values(raw_value: str | None) -> list[str]:
-    if not raw_value:
-        return []
-    parts = [part.strip() for part in raw_value.split(":::")]
-    return [part for part in parts if part]
-
-
-def _normalize_phone_entries(
-    raw_values: list[str],
-    config: Config,
-    ddi_override: str | None = None,
-) -> tuple[list[PhoneEntry], int]:
-    entries: list[PhoneEntry] = []
-    seen: set[str] = set()
-    found_total = 0
-    for raw in raw_values:
-        normalized = normalize_phone(
-            raw,
-            config.ddi_default,
-            config.assume_ddi,
-            ddi_override,
-            config.min_phone_len,
-        )
-        if not normalized:
-            continue
-        found_total += 1
-        if normalized in seen:
-            continue
-        seen.add(normalized)
-        entries.append(PhoneEntry(raw=raw, normalized=normalized))
-    entries.sort(key=lambda entry: entry.normalized)
-    return entries, found_total
-
 
 def _add_suspect(
-    suspects: list[dict[str, Any]],
+    suspects: SuspectSink,
     reason: str,
     source: str,
     raw_phone: str,
@@ -88,41 +54,127 @@ def _add_suspect(
     }
     if extra:
         item.update(extra)
-    suspects.append(item)
+    suspects.add(item)
 
 
-def _record_suspects(
-    suspects: list[dict[str, Any]],
+def _iter_row_results(
+    meta: CsvMeta,
     source: str,
-    raw_phone: str,
-    normalized_phone: str,
-    name: str,
-    line_num: int,
+    columns: ColumnMap,
     config: Config,
-) -> None:
-    if normalized_phone:
-        if len(normalized_phone) < config.min_phone_len or len(normalized_phone) > config.max_phone_len:
-            _add_suspect(suspects, "phone_length", source, raw_phone, normalized_phone, name, line_num)
-
-    mojibake_result = analyze_mojibake(name)
-    if mojibake_result.suspect:
-        extra = {
-            "suggested_fix": mojibake_result.suggested_fix or "",
-            "badness": mojibake_result.badness,
-        }
-        _add_suspect(suspects, "name_mojibake", source, raw_phone, normalized_phone, name, line_num, extra)
-
-
-def _emit_progress(
-    on_progress: Callable[[int, str], None] | None,
-    processed: int,
-    total: int,
-    stage: str,
-) -> None:
-    if not on_progress:
+    caches: tuple[CachedPhoneNormalizer, MojibakeAnalyzer],
+    meta_cache: CsvMetaCache | None = None,
+    timer: StageTimer | NullTimer = NULL_TIMER,
+    stages: StageGroup | None = None,
+    start: InputProgress | None = None,
+) -> Iterator[tuple[int, list[RowResult]]]:
+    """Yield ``(bytes_consumed, results)`` for one input in file order, in
+    batches of ``NORMALIZE_BATCH_ROWS`` rows or one chunk at a time from the
+    worker pool.
+
+    With a worker pool, reading and normalization happen in the workers and
+    the time spent waiting for chunks is charged to the read stage. With
+    ``stages``, reading, parsing and normalization each get a thread.
+    ``start`` resumes after the rows a checkpoint already covers.
+    """
+    read_stage = f"read_{source}"
+    offset, line_num = (start.offset, start.line_num) if start is not None else (0, 1)
+    normalizer = RowNormalizer(source, columns, config, *caches, timer=timer)
+    if config.workers > 1:
+        chunks = plan_chunks(meta, config.workers, cache=meta_cache)
+        if chunks and offset:
+            # Workers can only pick up from a chunk boundary; otherwise the
+            # rest of the file is read serially.
+            starts = [chunk_start for chunk_start, _ in chunks]
+            chunks = chunks[starts.index(offset):] if offset in starts else None
+        if chunks and len(chunks) > 1:
+            parallel_results = iter_parallel_row_results(
+                meta, chunks, source, columns, config, config.workers, normalizer, rows_before=line_num - 1
+            )
+            for offset, results in timer.iter(read_stage, parallel_results):
+                timer.add_rows(read_stage, len(results))
+                yield offset, results
+            return
+    if stages is not None:
+        rows = iter_csv_projected(
+            meta.path,
+            meta.encoding,
+            meta.delimiter,
+            meta.headers,
+            normalizer.fields,
+            stages,
+            read_stage,
+            start=offset,
+            line_num=line_num,
+        )
+        batches = stages.thread(f"parse_{source}", iter_row_batches(rows))
+        yield from stages.thread(
+            f"normalize_{source}",
+            (
+                (batch[-1][2], normalizer.normalize_many([(line_num, values) for line_num, values, _ in batch]))
+                for batch in batches
+            ),
+        )
         return
-    percent = int((processed / total) * 100) if total else 0
-    on_progress(percent, f"{stage}: {processed}/{total}")
+    rows = iter_csv_projected(
+        meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields, start=offset, line_num=line_num
+    )
+    normalize_many = timer.wrap("normalize", normalizer.normalize_many)
+    row_count = 0
+    for batch in iter_row_batches(timer.iter(read_stage, rows)):
+        row_count += len(batch)
+        yield batch[-1][2], normalize_many([(line_num, values) for line_num, values, _ in batch])
+    timer.add_rows(read_stage, row_count)
+    timer.add_rows("normalize", row_count)
+
+
+def _cache_report(
+    before: dict[str, dict[str, int]],
+    caches: tuple[CachedPhoneNormalizer, MojibakeAnalyzer],
+) -> dict[str, dict[str, int]]:
+    after = {"phone_normalize": caches[0].stats(), "mojibake": caches[1].stats()}
+    report = {}
+    for name, stats in after.items():
+        delta = stats_delta({name: before[name]}, {name: stats})[name]
+        report[name] = {**stats, **delta}
+    return report
+
+
+def _write_streamed(contacts: Iterable[Contact], out_dir: str | Path, config: Config) -> list[Path]:
+    """``write_google_csv_batches`` for stream mode. Unsorted input is only
+    found mid-write, so batches go to a scratch directory and are moved into
+    ``out_dir`` once all of them are written; a failed run leaves none."""
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(prefix=".saida-", dir=out_path))
+    try:
+        outputs = []
+        for written in write_google_csv_batches(contacts, scratch, config):
+            target = out_path / written.name
+            os.replace(written, target)
+            outputs.append(target)
+        return outputs
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _build_params(config: Config) -> dict[str, Any]:
+    return {
+        "ddi_default": config.ddi_default,
+        "assume_ddi": config.assume_ddi,
+        "batch_size": config.batch_size,
+        "label": config.label,
+        "phone_prefix_plus": config.phone_prefix_plus,
+        "min_phone_len": config.min_phone_len,
+        "max_phone_len": config.max_phone_len,
+        "dedupe_enabled": config.dedupe_enabled,
+        "treat_dot_as_empty": config.treat_dot_as_empty,
+        "protect_good_name": config.protect_good_name,
+        "rename_phone_like_names": config.rename_phone_like_names,
+        "explode_phones": config.explode_phones,
+        "fallback_prefix": config.fallback_prefix,
+        "check_mojibake": config.check_mojibake,
+    }
 
 
 def _build_input_report(meta: CsvMeta, column_map: ColumnMap) -> dict[str, Any]:
@@ -153,14 +205,112 @@ def run_pipeline(
     google_path: str | Path | None = None,
     overrides: ColumnOverrides | None = None,
     dry_run: bool = False,
-    on_progress: Callable[[int, str], None] | None = None,
+    on_progress: Callable[[ProgressUpdate], None] | None = None,
     should_cancel: Callable[[], bool] | None = None,
-    progress_every: int = 200,
+    progress_interval: float = PROGRESS_INTERVAL_S,
+    meta_cache: CsvMetaCache | None = None,
+    collect_timings: bool = False,
+    profile_path: str | Path | None = None,
+    caches: tuple[CachedPhoneNormalizer, MojibakeAnalyzer] | None = None,
+    resume: bool = False,
 ) -> dict[str, Any]:
+    """Convert the inputs and write ``report.json`` into ``out_dir``.
+
+    ``caches`` lets several runs share one phone/mojibake cache pair; the
+    report then shows the counters of this run only.
+
+    ``on_progress`` gets a ``ProgressUpdate`` (rows, bytes, rate, ETA) at
+    most once per ``progress_interval`` seconds, plus one per stage change.
+
+    ``collect_timings`` adds a ``timings`` section with per-stage wall/CPU
+    time, row throughput and peak RSS; ``profile_path`` also runs the whole
+    conversion under cProfile and dumps pstats there.
+
+    With ``config.stage_threads`` reading, parsing, normalization and the
+    sort feeding the writer run on their own threads (see ``core.stages``)
+    and the report gets a ``stages`` section with queue metrics.
+
+    With ``config.checkpoint_interval`` the state of the run is saved to
+    ``<out_dir>/checkpoint`` that often while reading (and on cancellation);
+    ``resume`` continues from there and writes the same files an
+    uninterrupted run would. ``should_cancel`` is polled once per batch of
+    rows, so it should be cheap, e.g. ``threading.Event.is_set``.
+    """
+    # Checked before the suspects file is opened (and truncated).
     if not crm_path and not google_path:
         raise ValueError("At least one input CSV is required.")
+    if resume and config.stream_output:
+        raise ValueError("Resume is not supported with stream output.")
+    timer = StageTimer() if collect_timings or profile_path else NULL_TIMER
+    checkpointer = None
+    resume_state = None
+    if (config.checkpoint_interval or resume) and not config.stream_output:
+        key = run_key(config, overrides or ColumnOverrides(), {"crm": crm_path, "google": google_path})
+        checkpointer = Checkpointer(checkpoint_dir(out_dir), key, config.checkpoint_interval)
+        if resume:
+            resume_state = checkpointer.load()
+    suspects = SuspectSink(
+        Path(out_dir) / SUSPECTS_FILENAME,
+        config.suspects_sample_size,
+        resume=resume_state.suspects if resume_state is not None else None,
+    )
+    stages = None
+    if config.stage_threads:
+        stages = StageGroup(config.stage_queue_size, should_cancel, PipelineCancelled)
+    run = functools.partial(
+        _run_pipeline,
+        crm_path,
+        out_dir,
+        config,
+        google_path,
+        overrides,
+        dry_run,
+        on_progress,
+        should_cancel,
+        progress_interval,
+        meta_cache,
+        timer,
+        profile_path,
+        suspects,
+        caches,
+        stages,
+        checkpointer,
+        resume_state,
+    )
+    if not profile_path:
+        with suspects, stages or contextlib.nullcontext():
+            return run()
+    Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        with suspects, stages or contextlib.nullcontext():
+            return run()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(profile_path))
+
+
+def _run_pipeline(
+    crm_path: str | Path | None,
+    out_dir: str | Path,
+    config: Config,
+    google_path: str | Path | None,
+    overrides: ColumnOverrides | None,
+    dry_run: bool,
+    on_progress: Callable[[ProgressUpdate], None] | None,
+    should_cancel: Callable[[], bool] | None,
+    progress_interval: float,
+    meta_cache: CsvMetaCache | None,
+    timer: StageTimer | NullTimer,
+    profile_path: str | Path | None,
+    suspects: SuspectSink,
+    caches: tuple[CachedPhoneNormalizer, MojibakeAnalyzer] | None,
+    stages: StageGroup | None,
+    checkpointer: Checkpointer | None,
+    resume_state: CheckpointState | None,
+) -> dict[str, Any]:
     overrides = overrides or ColumnOverrides()
-    suspects: list[dict[str, Any]] = []
     counts = {
         "crm_rows": 0,
         "google_rows": 0,
@@ -174,154 +324,234 @@ def run_pipeline(
         "contacts_exploded_total": 0,
     }
     phones_unique_set: set[str] = set()
-
-    index = ContactIndex(config.treat_dot_as_empty, config.protect_good_name)
+    if caches is None:
+        caches = (CachedPhoneNormalizer(config.phone_cache_size), MojibakeAnalyzer(config.mojibake_cache_size))
+    cache_stats_before = {"phone_normalize": caches[0].stats(), "mojibake": caches[1].stats()}
+
+    index = ContactIndex(
+        config.treat_dot_as_empty,
+        config.protect_good_name,
+        spill_threshold=config.dedupe_spill_threshold,
+    )
     contacts_list: list[Contact] = []
-
-    total_rows = 0
+    intern_labels = LabelInterner()
+
+    # Progress is measured in bytes consumed so each input is read only once.
+    total_bytes = 0
+    for input_path in (google_path, crm_path):
+        if input_path:
+            total_bytes += Path(input_path).stat().st_size
+    report_progress = ProgressReporter(
+        on_progress,
+        total_bytes,
+        progress_interval,
+        rows_total=cached_rows_total(meta_cache, [path for path in (google_path, crm_path) if path]),
+    )
     processed_rows = 0
+    input_progress: dict[str, InputProgress] = {}
+    if resume_state is not None:
+        counts.update(resume_state.counts)
+        processed_rows = resume_state.processed_rows
+        phones_unique_set = resume_state.phones_unique
+        input_progress = resume_state.inputs
+        if config.dedupe_enabled:
+            index.restore(resume_state.index, checkpointer.index_dir)
+        else:
+            contacts_list = resume_state.contacts
+    consumed: dict[str, int] = {source: progress.offset for source, progress in input_progress.items()}
+
+    def done_bytes() -> int:
+        return sum(consumed.values())
+
+    def save_checkpoint() -> None:
+        # Only called between batches, when every row before the recorded
+        # offsets has been counted, indexed and written to the suspects file.
+        checkpointer.save(
+            CheckpointState(
+                inputs=input_progress,
+                counts=dict(counts),
+                processed_rows=processed_rows,
+                phones_unique=phones_unique_set,
+                suspects=suspects.state(),
+                index=index.snapshot(checkpointer.index_dir) if config.dedupe_enabled else {},
+                contacts=[] if config.dedupe_enabled else contacts_list,
+            )
+        )
 
-    google_report = None
-    if google_path:
-        google_meta = prepare_csv(google_path)
-        google_columns = resolve_google_columns(google_meta.headers)
-        google_report = _build_input_report(google_meta, google_columns)
-        if on_progress:
-            total_rows += sum(1 for _ in iter_csv_rows(google_meta.path, google_meta.encoding, google_meta.delimiter))
-        for line_num, row in iter_csv_rows(google_meta.path, google_meta.encoding, google_meta.delimiter):
-            if should_cancel and should_cancel():
-                raise PipelineCancelled("Cancelled by user.")
-            counts["google_rows"] += 1
+    def iter_input_contacts(meta: CsvMeta, source: str, columns: ColumnMap, stage: str) -> Iterator[Contact]:
+        rows_key = f"{source}_rows"
+        sources = intern_labels({source})
+        progress = input_progress.setdefault(source, InputProgress())
+        if progress.done:
+            return
+        row_results = _iter_row_results(
+            meta, source, columns, config, caches, meta_cache, timer, stages, progress
+        )
+        try:
+            for offset, results in row_results:
+                # The previous batch has been fully consumed at this point.
+                if should_cancel and should_cancel():
+                    raise PipelineCancelled("Cancelled by user.")
+                if checkpointer is not None and checkpointer.due():
+                    save_checkpoint()
+                yield from batch_contacts(source, sources, results)
+                progress.offset = offset
+                if results:
+                    progress.line_num = results[-1].line_num
+                consumed[source] = offset
+                report_progress(stage, processed_rows, done_bytes())
+        except PipelineCancelled:
+            if checkpointer is not None:
+                save_checkpoint()
+            raise
+        progress.done = True
+        if meta_cache is not None:
+            meta_cache.update(meta.path, row_count=counts[rows_key])
+
+    def batch_contacts(source: str, sources: frozenset[str], results: list[RowResult]) -> Iterator[Contact]:
+        nonlocal processed_rows
+        rows_key = f"{source}_rows"
+        for result in results:
+            counts[rows_key] += 1
             counts["total_rows"] += 1
             processed_rows += 1
-            raw_name = str(row.get(google_columns.name, "")).strip() if google_columns.name else ""
-            if not raw_name:
-                given = str(row.get(google_columns.given_name, "")).strip() if google_columns.given_name else ""
-                family = str(row.get(google_columns.family_name, "")).strip() if google_columns.family_name else ""
-                raw_name = " ".join(part for part in (given, family) if part)
-            name = clean_name(raw_name, config.treat_dot_as_empty)
-
-            raw_phone_values: list[str] = []
-            for phone_column in google_columns.phones:
-                raw_value = str(row.get(phone_column, "")).strip()
-                raw_phone_values.extend(_split_phone_values(raw_value))
-            phone_entries, found_total = _normalize_phone_entries(raw_phone_values, config, None)
-            counts["phones_found_total"] += found_total
-            for entry in phone_entries:
+            for reason, raw_phone, normalized_phone, extra in result.suspects:
+                _add_suspect(
+                    suspects,
+                    reason,
+                    source,
+                    raw_phone,
+                    normalized_phone,
+                    result.raw_name,
+                    result.line_num,
+                    extra,
+                )
+            counts["phones_found_total"] += result.found_total
+            for entry in result.phone_entries:
                 phones_unique_set.add(entry.normalized)
-            entries_to_use = phone_entries if config.explode_phones else phone_entries[:1]
+            entries_to_use = result.phone_entries if config.explode_phones else result.phone_entries[:1]
             counts["contacts_exploded_total"] += len(entries_to_use)
-
             if not entries_to_use:
                 counts["without_phone"] += 1
-                if analyze_mojibake(raw_name).suspect:
-                    _record_suspects(
-                        suspects,
-                        "google",
-                        "",
-                        "",
-                        raw_name,
-                        line_num,
-                        config,
-                    )
                 continue
 
+            notes = tuple(result.notes)
+            labels = intern_labels(result.labels)
+
             for entry in entries_to_use:
-                _record_suspects(suspects, "google", entry.raw, entry.normalized, raw_name, line_num, config)
-                contact = Contact(name=name, phone=entry.normalized, notes=[], labels=set(), sources={"google"})
-                if config.dedupe_enabled:
-                    merged = index.add(contact)
-                    if merged:
-                        counts["duplicates_merged"] += 1
-                else:
-                    contacts_list.append(contact)
-            if on_progress and processed_rows % progress_every == 0:
-                _emit_progress(on_progress, processed_rows, total_rows, "Processando Google")
+                yield Contact(
+                    name=result.name,
+                    phone=entry.normalized,
+                    notes=notes,
+                    labels=labels,
+                    sources=sources,
+                )
+
+    # Only the sample is sniffed: the readers fall back per line on bytes the
+    # sample did not show, so a full-file encoding check would just read
+    # every input one more time.
+    inputs: list[Iterator[Contact]] = []
+    google_report = None
+    if google_path:
+        with timer.stage("prepare_csv"):
+            google_meta = prepare_csv(google_path, meta_cache, verify_encoding=False)
+        google_columns = resolve_google_columns(google_meta.headers)
+        google_report = _build_input_report(google_meta, google_columns)
+        inputs.append(iter_input_contacts(google_meta, "google", google_columns, "Processando Google"))
 
     crm_report = None
     if crm_path:
-        crm_meta = prepare_csv(crm_path)
+        with timer.stage("prepare_csv"):
+            crm_meta = prepare_csv(crm_path, meta_cache, verify_encoding=False)
         crm_columns = resolve_crm_columns(crm_meta.headers, overrides)
         crm_report = _build_input_report(crm_meta, crm_columns)
-        if on_progress:
-            total_rows += sum(1 for _ in iter_csv_rows(crm_meta.path, crm_meta.encoding, crm_meta.delimiter))
-        _emit_progress(on_progress, processed_rows, total_rows, "Processando CRM")
-        for line_num, row in iter_csv_rows(crm_meta.path, crm_meta.encoding, crm_meta.delimiter):
+        inputs.append(iter_input_contacts(crm_meta, "crm", crm_columns, "Processando CRM"))
+
+    if config.stream_output:
+        # Contacts go straight from the readers to the writer. Without dedupe
+        # they keep input order; with dedupe each input must already be
+        # sorted by phone so duplicates are adjacent after the merge.
+        if config.dedupe_enabled:
+            if google_path and crm_path:
+                # The merge reads both inputs at once; CRM suspects follow
+                # the Google ones, as in the default mode.
+                suspects.hold("crm")
+            sorted_contacts = timer.iter("dedupe", index.iter_presorted(inputs))
+        else:
+            sorted_contacts = itertools.chain.from_iterable(inputs)
+    else:
+        add_contact = timer.wrap("dedupe", index.add) if config.dedupe_enabled else contacts_list.append
+        added = 0
+        with timer.stage("collect"):
+            for position, contacts in enumerate(inputs):
+                if crm_path and position == len(inputs) - 1:
+                    report_progress("Processando CRM", processed_rows, done_bytes())
+                for contact in contacts:
+                    add_contact(contact)
+                    added += 1
+        timer.add_rows("dedupe", added)
+        if checkpointer is not None:
+            # Everything is read; a crash from here on only redoes the sort
+            # and write. Sorting renames contacts, so this is the last point.
             if should_cancel and should_cancel():
+                save_checkpoint()
                 raise PipelineCancelled("Cancelled by user.")
-            counts["crm_rows"] += 1
-            counts["total_rows"] += 1
-            processed_rows += 1
-            raw_name = str(row.get(crm_columns.name, "")).strip() if crm_columns.name else ""
-            name = clean_name(raw_name, config.treat_dot_as_empty)
-            raw_ddi = str(row.get(crm_columns.ddi, "")).strip() if crm_columns.ddi else ""
-            raw_phone_values: list[str] = []
-            for phone_column in crm_columns.phones:
-                raw_phone_values.extend(
-                    _split_phone_values(str(row.get(phone_column, "")).strip())
-                )
-            phone_entries, found_total = _normalize_phone_entries(raw_phone_values, config, raw_ddi)
-            counts["phones_found_total"] += found_total
-            for entry in phone_entries:
-                phones_unique_set.add(entry.normalized)
-            entries_to_use = phone_entries if config.explode_phones else phone_entries[:1]
-            counts["contacts_exploded_total"] += len(entries_to_use)
-
-            if not entries_to_use:
-                counts["without_phone"] += 1
-                if analyze_mojibake(raw_name).suspect:
-                    _record_suspects(
-                        suspects,
-                        "crm",
-                        "",
-                        "",
-                        raw_name,
-                        line_num,
-                        config,
-                    )
-                continue
-
-            labels = set()
-            if config.label:
-                labels.add(config.label)
-            if crm_columns.labels:
-                labels.update(_parse_labels(str(row.get(crm_columns.labels, "")), config.google_group_separator))
-            notes = _build_crm_notes(row, crm_columns)
-
-            for entry in entries_to_use:
-                _record_suspects(suspects, "crm", entry.raw, entry.normalized, raw_name, line_num, config)
-                contact = Contact(name=name, phone=entry.normalized, notes=notes, labels=labels, sources={"crm"})
-                if config.dedupe_enabled:
-                    merged = index.add(contact)
-                    if merged:
-                        counts["duplicates_merged"] += 1
-                else:
-                    contacts_list.append(contact)
-            if on_progress and processed_rows % progress_every == 0:
-                _emit_progress(on_progress, processed_rows, total_rows, "Processando CRM")
-
-    if config.dedupe_enabled:
-        contacts = sorted(index.values(), key=lambda contact: contact.phone)
-    else:
-        contacts = sorted(contacts_list, key=lambda contact: contact.phone)
-
-    if config.rename_phone_like_names:
-        for seq, contact in enumerate(contacts, start=1):
-            if is_phone_like_name(contact.name):
+            if checkpointer.interval:
+                save_checkpoint()
+        if config.dedupe_enabled:
+            sorted_contacts = timer.iter("sort", index.iter_sorted())
+        else:
+            with timer.stage("sort"):
+                contacts_list.sort(key=lambda contact: contact.phone)
+            sorted_contacts = iter(contacts_list)
+
+    contacts_total = 0
+
+    def finalize_contacts() -> Iterator[Contact]:
+        nonlocal contacts_total
+        for seq, contact in enumerate(sorted_contacts, start=1):
+            if config.rename_phone_like_names and is_phone_like_name(contact.name):
                 contact.name = build_fallback_name(config.fallback_prefix, seq, contact.phone)
                 counts["names_rewritten"] += 1
+            contacts_total = seq
+            yield contact
+
+    final_contacts: Iterable[Contact] = timer.iter("rename", finalize_contacts())
+    if stages is not None:
+        # Sorting (or the streaming merge) and renaming feed the writer
+        # from their own thread.
+        final_contacts = itertools.chain.from_iterable(
+            stages.thread("merge" if config.stream_output else "sort", iter_row_batches(finalize_contacts()))
+        )
+
     output_files: list[Path] = []
     if not dry_run:
         if should_cancel and should_cancel():
             raise PipelineCancelled("Cancelled by user.")
-        _emit_progress(on_progress, processed_rows, total_rows, "Escrevendo CSVs")
-        output_files = write_google_csv_batches(contacts, out_dir, config)
-    _emit_progress(on_progress, total_rows, total_rows, "Concluído")
+        if not config.stream_output:
+            report_progress("Escrevendo CSVs", processed_rows, done_bytes())
+        with timer.stage("write"):
+            if config.stream_output:
+                output_files = _write_streamed(final_contacts, out_dir, config)
+            else:
+                output_files = write_google_csv_batches(final_contacts, out_dir, config)
+        timer.add_rows("write", contacts_total)
+    else:
+        for _ in final_contacts:
+            pass
+    if config.stream_output and config.dedupe_enabled and google_path and crm_path:
+        suspects.release("crm")
+    timer.add_rows("rename", contacts_total)
+    if not config.stream_output:
+        timer.add_rows("sort", contacts_total)
+    counts["duplicates_merged"] = index.duplicates_merged
+    index.close()
+    report_progress("Concluído", processed_rows, total_bytes, force=True)
 
     warnings: list[str] = []
-    if len(contacts) > config.contact_limit_warn:
+    if contacts_total > config.contact_limit_warn:
         warnings.append(
-            f"Total contacts {len(contacts)} exceeds warning threshold {config.contact_limit_warn}."
+            f"Total contacts {contacts_total} exceeds warning threshold {config.contact_limit_warn}."
         )
 
     counts["suspects"] = len(suspects)
@@ -329,38 +559,37 @@ def run_pipeline(
 
     report = {
         "schema_version": 1,
-        "params": {
-            "ddi_default": config.ddi_default,
-            "assume_ddi": config.assume_ddi,
-            "batch_size": config.batch_size,
-            "label": config.label,
-            "phone_prefix_plus": config.phone_prefix_plus,
-            "min_phone_len": config.min_phone_len,
-            "max_phone_len": config.max_phone_len,
-            "dedupe_enabled": config.dedupe_enabled,
-            "treat_dot_as_empty": config.treat_dot_as_empty,
-            "protect_good_name": config.protect_good_name,
-            "rename_phone_like_names": config.rename_phone_like_names,
-            "explode_phones": config.explode_phones,
-            "fallback_prefix": config.fallback_prefix,
-        },
+        "params": _build_params(config),
         "inputs": {
             "crm": crm_report,
             "google": google_report,
         },
         "counts": {
             **counts,
-            "deduped_contacts": len(contacts),
+            "deduped_contacts": contacts_total,
             "output_files": len(output_files),
         },
         "outputs": [str(path) for path in output_files],
         "warnings": warnings,
-        "suspects": suspects,
+        "caches": _cache_report(cache_stats_before, caches),
+        "suspects": suspects.summary(),
     }
+    if stages is not None:
+        report["stages"] = stages.metrics()
 
     out_dir_path = Path(out_dir)
     out_dir_path.mkdir(parents=True, exist_ok=True)
     report_path = out_dir_path / "report.json"
-    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    with timer.stage("report"):
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if timer.enabled:
+        # The report stage above is the cost of serializing everything else.
+        report["timings"] = timer.summary()
+        if profile_path:
+            report["timings"]["profile"] = str(profile_path)
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+    report_path.write_text(payload, encoding="utf-8")
+    if checkpointer is not None:
+        checkpointer.clear()
 
     return report
@@ -0,0 +1,96 @@
+"""Structured, time-throttled progress updates for long runs."""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+# Default gap between two updates of the same stage: 10 per second is
+# smooth for a progress bar and cheap for a GUI event loop.
+PROGRESS_INTERVAL_S = 0.1
+
+
+@dataclass(frozen=True)
+class ProgressUpdate:
+    """One progress sample. Rates cover this run only (not rows restored
+    from a checkpoint); ``eta_s`` is ``None`` until it can be estimated
+    and once every input byte has been read. ``rows_total`` is known when
+    every input's row count is cached from an earlier pass."""
+
+    stage: str
+    rows: int
+    bytes_done: int
+    bytes_total: int
+    elapsed_s: float
+    rows_per_s: float
+    bytes_per_s: float
+    eta_s: float | None
+    rows_total: int | None = None
+
+    @property
+    def percent(self) -> int:
+        return min(100, int(self.bytes_done * 100 / self.bytes_total)) if self.bytes_total else 0
+
+    def message(self) -> str:
+        return f"{self.stage}: {self.rows} linhas ({self.percent}%)"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "percent": self.percent}
+
+
+class ProgressReporter:
+    """Builds ``ProgressUpdate``s from ``(stage, rows, bytes_done)`` samples
+    and passes them to ``callback``.
+
+    Samples are cheap to take: one arriving less than ``interval`` seconds
+    after the last update is dropped, unless it starts a new stage or is
+    forced, so the callback rate does not depend on the row rate.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[ProgressUpdate], None] | None,
+        bytes_total: int,
+        interval: float = PROGRESS_INTERVAL_S,
+        clock: Callable[[], float] = time.monotonic,
+        rows_total: int | None = None,
+    ) -> None:
+        self._callback = callback
+        self._bytes_total = bytes_total
+        self._rows_total = rows_total
+        self._interval = max(0.0, interval)
+        self._clock = clock
+        self._started: float | None = None
+        self._start_rows = 0
+        self._start_bytes = 0
+        self._last_emit = 0.0
+        self._last_stage: str | None = None
+
+    def __call__(self, stage: str, rows: int, bytes_done: int, force: bool = False) -> None:
+        if self._callback is None:
+            return
+        now = self._clock()
+        if self._started is None:
+            self._started, self._start_rows, self._start_bytes = now, rows, bytes_done
+        elif not force and stage == self._last_stage and now - self._last_emit < self._interval:
+            return
+        self._last_emit = now
+        self._last_stage = stage
+        elapsed = now - self._started
+        rows_per_s = (rows - self._start_rows) / elapsed if elapsed > 0 else 0.0
+        bytes_per_s = (bytes_done - self._start_bytes) / elapsed if elapsed > 0 else 0.0
+        remaining = self._bytes_total - bytes_done
+        eta = remaining / bytes_per_s if remaining > 0 and bytes_per_s > 0 else None
+        self._callback(
+            ProgressUpdate(
+                stage=stage,
+                rows=rows,
+                bytes_done=bytes_done,
+                bytes_total=self._bytes_total,
+                elapsed_s=round(elapsed, 3),
+                rows_per_s=round(rows_per_s, 1),
+                bytes_per_s=round(bytes_per_s, 1),
+                eta_s=round(eta, 1) if eta is not None else None,
+                rows_total=self._rows_total,
+            )
+        )
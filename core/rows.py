@@ -0,0 +1,248 @@
+"""Per-row normalization shared by the serial and parallel pipeline paths."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, TypeVar
+
+from core.config import Config
+from core.io.columns import ColumnMap
+from core.models import PhoneEntry
+from core.normalize.name import clean_name
+from core.normalize.phone import CachedPhoneNormalizer, normalize_phone_batch
+from core.normalize.text import NOT_SUSPECT, MojibakeAnalyzer, MojibakeResult
+from core.timing import NULL_TIMER, NullTimer, StageTimer
+
+# (reason, raw_phone, normalized_phone, extra)
+SuspectEntry = tuple[str, str, str, "dict[str, Any] | None"]
+# Rows handed to ``RowNormalizer.normalize_many`` at a time.
+NORMALIZE_BATCH_ROWS = 2048
+
+T = TypeVar("T")
+
+
+@dataclass
+class RowResult:
+    line_num: int
+    raw_name: str
+    name: str
+    phone_entries: list[PhoneEntry]
+    found_total: int
+    labels: set[str] = field(default_factory=set)
+    notes: list[str] = field(default_factory=list)
+    suspects: list[SuspectEntry] = field(default_factory=list)
+
+
+def parse_labels(raw: str | None, separator_hint: str) -> set[str]:
+    if not raw:
+        return set()
+    if separator_hint in raw:
+        parts = raw.split(separator_hint)
+    elif "," in raw:
+        parts = raw.split(",")
+    else:
+        parts = [raw]
+    return {part.strip() for part in parts if part.strip()}
+
+
+def build_crm_notes(values: tuple[str, ...], column_map: ColumnMap) -> list[str]:
+    return []
+
+
+def split_phone_values(raw_value: str | None) -> list[str]:
+    if not raw_value:
+        return []
+    parts = [part.strip() for part in raw_value.split(":::")]
+    return [part for part in parts if part]
+
+
+def iter_row_batches(rows: Iterable[T], size: int = NORMALIZE_BATCH_ROWS) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_phone_entries(raw_values: list[str], normalized_values: list[str]) -> tuple[list[PhoneEntry], int]:
+    """Drop empty and repeated phones and sort what is left."""
+    entries: list[PhoneEntry] = []
+    seen: set[str] = set()
+    found_total = 0
+    for raw, normalized in zip(raw_values, normalized_values):
+        if not normalized:
+            continue
+        found_total += 1
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        entries.append(PhoneEntry(raw=raw, normalized=normalized))
+    entries.sort(key=lambda entry: entry.normalized)
+    return entries, found_total
+
+
+def _skip_mojibake(value: str | None) -> MojibakeResult:
+    return NOT_SUSPECT
+
+
+class RowNormalizer:
+    """Turns one parsed CSV row into a ``RowResult``.
+
+    Rows arrive projected: ``fields`` lists the header names the normalizer
+    needs and every row is a tuple of those values in the same order.
+    Instances can be rebuilt inside worker processes from the same
+    ``source``, ``columns`` and ``config``; the phone and mojibake caches are
+    shared by every input of a run (or every chunk of a worker process).
+    """
+
+    def __init__(
+        self,
+        source: str,
+        columns: ColumnMap,
+        config: Config,
+        phone_normalizer: CachedPhoneNormalizer | None = None,
+        mojibake_analyzer: MojibakeAnalyzer | None = None,
+        timer: StageTimer | NullTimer = NULL_TIMER,
+    ) -> None:
+        self.source = source
+        self.columns = columns
+        self.config = config
+        self.phone_normalizer = phone_normalizer or CachedPhoneNormalizer(config.phone_cache_size)
+        self.mojibake_analyzer = mojibake_analyzer or MojibakeAnalyzer(config.mojibake_cache_size)
+        if config.check_mojibake:
+            self._analyze_mojibake = timer.wrap("mojibake", self.mojibake_analyzer)
+        else:
+            self._analyze_mojibake = _skip_mojibake
+
+        if source == "google":
+            wanted = [columns.name, columns.given_name, columns.family_name, *columns.phones]
+        else:
+            wanted = [columns.name, columns.ddi, columns.labels, *columns.phones]
+        self.fields: list[str] = list(dict.fromkeys(column for column in wanted if column))
+        positions = {column: idx for idx, column in enumerate(self.fields)}
+        self._name_pos = positions.get(columns.name) if columns.name else None
+        self._given_pos = positions.get(columns.given_name) if columns.given_name else None
+        self._family_pos = positions.get(columns.family_name) if columns.family_name else None
+        self._ddi_pos = positions.get(columns.ddi) if columns.ddi else None
+        self._labels_pos = positions.get(columns.labels) if columns.labels else None
+        self._phone_positions = [positions[column] for column in columns.phones]
+
+    def normalize(self, line_num: int, values: tuple[str, ...]) -> RowResult:
+        return self.normalize_many([(line_num, values)])[0]
+
+    def normalize_many(self, rows: list[tuple[int, tuple[str, ...]]]) -> list[RowResult]:
+        """Normalize a batch of ``(line_num, values)`` rows.
+
+        The phones of every row go through ``normalize_phone_batch`` at once,
+        which is what lets the NumPy path pay off.
+        """
+        config = self.config
+        split_rows = [self._split(values) for _, values in rows]
+        raw_phones: list[str] = []
+        ddi_overrides: list[str | None] = []
+        for _, raw_ddi, raw_phone_values in split_rows:
+            raw_phones.extend(raw_phone_values)
+            ddi_overrides.extend([raw_ddi] * len(raw_phone_values))
+        batch = normalize_phone_batch(
+            raw_phones,
+            ddi_overrides,
+            config.ddi_default,
+            config.assume_ddi,
+            config.min_phone_len,
+            config.min_phone_len,
+            config.max_phone_len,
+            normalize=self.phone_normalizer,
+            vectorize=config.vectorize_phones,
+        )
+        if batch.vectorized:
+            self.phone_normalizer.record_vectorized(len(raw_phones))
+
+        results = []
+        start = 0
+        for (line_num, values), (raw_name, _, raw_phone_values) in zip(rows, split_rows):
+            end = start + len(raw_phone_values)
+            length_suspects = {
+                normalized
+                for normalized, suspect in zip(batch.normalized[start:end], batch.length_suspect[start:end])
+                if suspect
+            }
+            results.append(
+                self._finish(line_num, values, raw_name, raw_phone_values, batch.normalized[start:end], length_suspects)
+            )
+            start = end
+        return results
+
+    def _split(self, values: tuple[str, ...]) -> tuple[str, str | None, list[str]]:
+        raw_name = values[self._name_pos].strip() if self._name_pos is not None else ""
+        if not raw_name and self.source == "google":
+            given = values[self._given_pos].strip() if self._given_pos is not None else ""
+            family = values[self._family_pos].strip() if self._family_pos is not None else ""
+            raw_name = " ".join(part for part in (given, family) if part)
+        raw_ddi = None
+        if self.source == "crm":
+            raw_ddi = values[self._ddi_pos].strip() if self._ddi_pos is not None else ""
+
+        raw_phone_values: list[str] = []
+        for position in self._phone_positions:
+            raw_phone_values.extend(split_phone_values(values[position].strip()))
+        return raw_name, raw_ddi, raw_phone_values
+
+    def _finish(
+        self,
+        line_num: int,
+        values: tuple[str, ...],
+        raw_name: str,
+        raw_phone_values: list[str],
+        normalized_values: list[str],
+        length_suspects: set[str],
+    ) -> RowResult:
+        config = self.config
+        name = clean_name(raw_name, config.treat_dot_as_empty)
+        phone_entries, found_total = build_phone_entries(raw_phone_values, normalized_values)
+        result = RowResult(line_num, raw_name, name, phone_entries, found_total)
+
+        entries_to_use = phone_entries if config.explode_phones else phone_entries[:1]
+        mojibake_result = self._analyze_mojibake(raw_name)
+        if not entries_to_use:
+            if mojibake_result.suspect:
+                self._record_suspects(result, "", "", mojibake_result, False)
+            return result
+
+        if self.source == "crm":
+            if config.label:
+                result.labels.add(config.label)
+            if self._labels_pos is not None:
+                result.labels.update(parse_labels(values[self._labels_pos], config.google_group_separator))
+            result.notes = build_crm_notes(values, self.columns)
+
+        for entry in entries_to_use:
+            self._record_suspects(
+                result, entry.raw, entry.normalized, mojibake_result, entry.normalized in length_suspects
+            )
+        return result
+
+    def _record_suspects(
+        self,
+        result: RowResult,
+        raw_phone: str,
+        normalized_phone: str,
+        mojibake_result: MojibakeResult,
+        length_suspect: bool,
+    ) -> None:
+        if length_suspect:
+            result.suspects.append(("phone_length", raw_phone, normalized_phone, None))
+
+        if mojibake_result.suspect:
+            extra = {
+                "suggested_fix": mojibake_result.suggested_fix or "",
+                "badness": mojibake_result.badness,
+            }
+            result.suspects.append(("name_mojibake", raw_phone, normalized_phone, extra))
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "phone_normalize": self.phone_normalizer.stats(),
+            "mojibake": self.mojibake_analyzer.stats(),
+        }
@@ -0,0 +1,180 @@
+"""Pipeline stages on their own threads, connected by bounded queues.
+
+``StageGroup.thread`` moves the iteration of a generator to a background
+thread and hands its items over through a ``queue.Queue`` with
+``maxsize``; a full queue blocks the producer (backpressure) and an empty
+one blocks the consumer. Chaining several calls gives a read -> parse ->
+normalize pipeline where a slow disk does not stall parsing and the
+other way round. Items should be batches: a queue hand-off costs a few
+microseconds.
+
+Cancellation and errors are shared by the whole group: the first failure
+or a ``should_cancel`` hit sets one event that every producer and consumer
+polls at least every ``poll_interval`` seconds, so all stages stop within
+milliseconds and the consumer re-raises the original error.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+@dataclass
+class QueueStats:
+    maxsize: int
+    items: int = 0
+    depth_total: int = 0
+    max_depth: int = 0
+    producer_wait_s: float = 0.0
+    consumer_wait_s: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "maxsize": self.maxsize,
+            "items": self.items,
+            "mean_depth": round(self.depth_total / self.items, 2) if self.items else 0.0,
+            "max_depth": self.max_depth,
+            # Producer waits mean the next stage is the bottleneck; consumer
+            # waits mean this one is.
+            "producer_wait_s": round(self.producer_wait_s, 4),
+            "consumer_wait_s": round(self.consumer_wait_s, 4),
+        }
+
+
+class StageGroup:
+    """Threads and queues of one run; use as a context manager so every
+    thread is stopped and joined on the way out."""
+
+    def __init__(
+        self,
+        queue_size: int = 8,
+        should_cancel: Callable[[], bool] | None = None,
+        cancelled: type[BaseException] = RuntimeError,
+        poll_interval: float = 0.005,
+    ) -> None:
+        self.queue_size = max(1, queue_size)
+        self.poll_interval = poll_interval
+        self._should_cancel = should_cancel
+        self._cancelled = cancelled
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._threads: list[threading.Thread] = []
+        self._stats: dict[str, QueueStats] = {}
+
+    def __enter__(self) -> StageGroup:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def check(self) -> None:
+        """Raise if the group was cancelled or another stage failed."""
+        if not self._stop.is_set() and self._should_cancel is not None and self._should_cancel():
+            self._stop.set()
+        if self._stop.is_set():
+            raise self._error if self._error is not None else self._cancelled("Cancelled by user.")
+
+    def _cancel_requested(self) -> bool:
+        if self._should_cancel is not None and self._should_cancel():
+            self._stop.set()
+        return self._stop.is_set() and self._error is None
+
+    def thread(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterate ``iterable`` on a new thread and yield its items here."""
+        if name in self._stats:
+            name = f"{name}_{len(self._stats)}"
+        stats = QueueStats(self.queue_size)
+        self._stats[name] = stats
+        items: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = self._stop
+        poll = self.poll_interval
+
+        def put(item: object) -> bool:
+            started = None
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=poll)
+                    break
+                except queue.Full:
+                    started = started or time.perf_counter()
+            else:
+                return False
+            if started is not None:
+                stats.producer_wait_s += time.perf_counter() - started
+            return True
+
+        def produce() -> None:
+            iterator = iter(iterable)
+            try:
+                for item in iterator:
+                    depth = items.qsize()
+                    stats.items += 1
+                    stats.depth_total += depth
+                    stats.max_depth = max(stats.max_depth, depth)
+                    if not put(item):
+                        return
+                put(_DONE)
+            except BaseException as exc:
+                # Consumers re-raise it once they have drained their queues.
+                self._fail(exc)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+        worker = threading.Thread(target=produce, name=f"stage-{name}", daemon=True)
+        self._threads.append(worker)
+        worker.start()
+        return self._consume(items, stats)
+
+    def _consume(self, items: queue.Queue, stats: QueueStats) -> Iterator[Any]:
+        # Cancellation is checked before every item; a failure only once the
+        # queue runs dry, so items produced before an error still arrive.
+        finished = False
+        try:
+            while True:
+                if self._cancel_requested():
+                    self.check()
+                try:
+                    item = items.get_nowait()
+                except queue.Empty:
+                    self.check()
+                    started = time.perf_counter()
+                    try:
+                        item = items.get(timeout=self.poll_interval)
+                    except queue.Empty:
+                        continue
+                    finally:
+                        stats.consumer_wait_s += time.perf_counter() - started
+                if item is _DONE:
+                    finished = True
+                    return
+                yield item
+        finally:
+            if not finished:
+                # Abandoned early (error or cancellation downstream).
+                self._stop.set()
+
+    def close(self) -> None:
+        self._stop.set()
+        for worker in self._threads:
+            worker.join()
+        self._threads.clear()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.summary() for name, stats in self._stats.items()}
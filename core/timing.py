@@ -0,0 +1,151 @@
+"""Opt-in per-stage wall/CPU timing for pipeline runs."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+T = TypeVar("T")
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process, or ``None`` if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageTimer:
+    """Accumulates exclusive wall and CPU time per named stage.
+
+    Stages nest: time is always charged to the innermost active stage, so a
+    writer pulling contacts through sort and rename generators only gets
+    the time spent in its own code. ``iter`` and ``wrap`` switch stages
+    around every ``next()`` or call, which lets interleaved per-row work
+    (read, normalize, mojibake, dedupe) be split apart.
+
+    Each thread keeps its own stage stack and CPU clock, so stages running
+    on ``core.stages`` threads are charged separately; their wall times
+    overlap and may add up to more than the run took.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._wall: dict[str, float] = {}
+        self._cpu: dict[str, float] = {}
+        self._rows: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+
+    def _stack(self) -> list[str]:
+        local = self._local
+        stack = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+            local.mark_wall = time.perf_counter()
+            local.mark_cpu = time.thread_time()
+        return stack
+
+    def _charge(self, stack: list[str]) -> None:
+        local = self._local
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        if stack:
+            name = stack[-1]
+            with self._lock:
+                self._wall[name] = self._wall.get(name, 0.0) + wall - local.mark_wall
+                self._cpu[name] = self._cpu.get(name, 0.0) + cpu - local.mark_cpu
+        local.mark_wall = wall
+        local.mark_cpu = cpu
+
+    def push(self, name: str) -> None:
+        stack = self._stack()
+        self._charge(stack)
+        stack.append(name)
+
+    def pop(self) -> None:
+        stack = self._stack()
+        self._charge(stack)
+        stack.pop()
+
+    @contextmanager
+    def stage(self, name: str):
+        self.push(name)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def add_rows(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            self._rows[name] = self._rows.get(name, 0) + count
+
+    def iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        iterator = iter(iterable)
+        while True:
+            self.push(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.pop()
+            yield item
+
+    def wrap(self, name: str, function: Callable[..., T]) -> Callable[..., T]:
+        def timed(*args: Any, **kwargs: Any) -> T:
+            self.push(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.pop()
+
+        return timed
+
+    def summary(self) -> dict[str, Any]:
+        stages = {}
+        for name, wall in self._wall.items():
+            rows = self._rows.get(name)
+            stages[name] = {
+                "wall_s": round(wall, 4),
+                "cpu_s": round(self._cpu.get(name, 0.0), 4),
+                "rows": rows,
+                "rows_per_sec": round(rows / wall, 1) if rows and wall else None,
+            }
+        return {
+            "stages": stages,
+            "total_wall_s": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+class NullTimer:
+    """Drop-in ``StageTimer`` that records nothing and adds no per-row cost."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def add_rows(self, name: str, count: int = 1) -> None:
+        pass
+
+    def iter(self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        return iterable
+
+    def wrap(self, name: str, function: Callable[..., T]) -> Callable[..., T]:
+        return function
+
+
+NULL_TIMER = NullTimer()
@@ -0,0 +1,136 @@
+"""Input validation for the import screen.
+
+``validate_input`` checks one CSV: it sniffs the format from a sample,
+resolves the columns and scans the file once, handing over the format and
+the first rows (``on_preview``) before the record, missing-phone and
+duplicate counts are done. The full-file encoding check comes last. The
+GUI runs one call per input concurrently.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable
+
+from core.config import ColumnOverrides, Config
+from core.io.columns import ColumnMap, resolve_crm_columns, resolve_google_columns
+from core.io.meta_cache import CsvMetaCache
+from core.io.read_csv import CsvMeta, prepare_csv
+from core.io.scan import ScanResult, scan_phone_stats
+from core.normalize.phone import CachedPhoneNormalizer
+from core.normalize.text import analyze_mojibake
+
+
+def input_info(meta: CsvMeta, columns: ColumnMap) -> dict[str, Any]:
+    return {
+        "path": str(meta.path),
+        "encoding": meta.encoding,
+        "delimiter": meta.delimiter,
+        "used_fallback": meta.used_fallback,
+        "columns": asdict(columns),
+    }
+
+
+def _preview_columns(columns: ColumnMap) -> list[str]:
+    wanted = [columns.name, columns.given_name, columns.family_name, columns.ddi, columns.tags, columns.created]
+    return list(dict.fromkeys(column for column in [*wanted, *columns.phones] if column))
+
+
+def _first_phone(cells: dict[str, str], columns: ColumnMap) -> str:
+    for column in columns.phones:
+        for part in cells[column].split(":::"):
+            if part.strip():
+                return part.strip()
+    return ""
+
+
+def _preview_row(source: str, columns: ColumnMap, cells: dict[str, str]) -> dict[str, str]:
+    def cell(column: str | None) -> str:
+        return cells[column].strip() if column else ""
+
+    name = cell(columns.name)
+    if source == "google":
+        if not name:
+            name = " ".join(part for part in (cell(columns.given_name), cell(columns.family_name)) if part)
+        # Google exports have no DDI/tags/created worth previewing.
+        return {"name": name, "ddi": "", "phone": _first_phone(cells, columns), "tags": "", "created": ""}
+    return {
+        "name": name,
+        "ddi": cell(columns.ddi),
+        "phone": _first_phone(cells, columns),
+        "tags": cell(columns.tags),
+        "created": cell(columns.created),
+    }
+
+
+def validate_input(
+    source: str,
+    path: str | Path,
+    config: Config,
+    overrides: ColumnOverrides | None = None,
+    preview_limit: int = 50,
+    exact_limit_bytes: int = 200_000_000,
+    on_preview: Callable[[dict[str, Any]], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    meta_cache: CsvMetaCache | None = None,
+    phone_normalizer: CachedPhoneNormalizer | None = None,
+) -> dict[str, Any]:
+    """Validate the ``source`` ("crm" or "google") input at ``path``.
+
+    ``on_preview`` gets ``{"info", "preview_rows", "preview_has_mojibake"}``
+    as soon as the first ``preview_limit`` rows are read; the counts are
+    returned once the scan and the encoding check end. If the check finds an
+    encoding other than the sniffed one, the file is scanned again and
+    ``on_preview`` is called a second time with the corrected data. Raises
+    ``ReadCancelled`` (``ScanCancelled`` during the scan) when
+    ``should_cancel`` returns True.
+    """
+
+    def scan_input(meta: CsvMeta) -> ScanResult:
+        if source == "crm":
+            columns = resolve_crm_columns(meta.headers, overrides or ColumnOverrides())
+        else:
+            columns = resolve_google_columns(meta.headers)
+        info = input_info(meta, columns)
+        preview_columns = _preview_columns(columns)
+
+        def deliver(rows: list[list[str]]) -> None:
+            preview_rows = [_preview_row(source, columns, dict(zip(preview_columns, row))) for row in rows]
+            on_preview(
+                {
+                    "info": info,
+                    "preview_rows": preview_rows,
+                    "preview_has_mojibake": any(analyze_mojibake(row["name"]).suspect for row in preview_rows),
+                }
+            )
+
+        return scan_phone_stats(
+            meta,
+            columns,
+            config,
+            exact_limit_bytes,
+            phone_normalizer,
+            preview_columns=preview_columns,
+            preview_limit=preview_limit,
+            on_preview=deliver if on_preview is not None else None,
+            should_cancel=should_cancel,
+        )
+
+    # Sniffing reads one sample, so the preview does not wait for the
+    # full-file encoding check (already cached for files seen before).
+    meta = prepare_csv(path, meta_cache, verify_encoding=False)
+    try:
+        scan = scan_input(meta)
+    except UnicodeDecodeError:
+        scan = None
+    verified = prepare_csv(path, meta_cache, should_cancel=should_cancel)
+    if scan is None or verified != meta:
+        scan = scan_input(verified)
+    if meta_cache is not None:
+        meta_cache.update(verified.path, row_count=scan.line_count)
+    return {
+        "line_count": scan.line_count,
+        "without_phone": scan.without_phone,
+        "duplicates": scan.duplicates,
+        "duplicates_estimated": scan.duplicates_estimated,
+    }
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from core.batch import load_manifest, run_batch
+from core.config import Config
+from core.pipeline import run_pipeline
+
+
+def _write_crm(path: Path, count: int) -> None:
+    lines = ["Nome;Telefone"] + [f"Cliente {idx};11 9{idx:04d}-0000" for idx in range(count)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_manifest_jobs_match_single_runs(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        monkeypatch.setenv("STZ_CACHE_DIR", str(temp_path / "cache"))
+        _write_crm(temp_path / "a.csv", 30)
+        _write_crm(temp_path / "b.csv", 12)
+        manifest = {
+            "config": {"batch_size": 10},
+            "jobs": [
+                {"name": "a", "crm": "a.csv", "out_dir": "out_a"},
+                {"crm": "b.csv", "out_dir": "out_b", "config": {"label": "B"}},
+            ],
+        }
+        manifest_path = temp_path / "jobs.json"
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+        jobs = load_manifest(manifest_path)
+        assert [job.name for job in jobs] == ["a", "job_002"]
+        assert jobs[1].config == {"batch_size": 10, "label": "B"}
+
+        summary = run_batch(jobs)
+        assert summary["jobs_ok"] == 2
+        assert summary["totals"]["deduped_contacts"] == 42
+        assert summary["totals"]["output_files"] == 5
+
+        single = run_pipeline(temp_path / "b.csv", temp_path / "single", Config(batch_size=10, label="B"))
+        batch_report = json.loads((temp_path / "out_b" / "report.json").read_text(encoding="utf-8"))
+        assert batch_report["counts"] == single["counts"]
+        # The second job reused the phone cache warmed by the first.
+        assert batch_report["caches"]["phone_normalize"]["hits"] > 0
+
+
+def test_failed_job_does_not_stop_batch(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        monkeypatch.setenv("STZ_CACHE_DIR", str(temp_path / "cache"))
+        _write_crm(temp_path / "a.csv", 5)
+        manifest_path = temp_path / "jobs.toml"
+        manifest_path.write_text(
+            '[[jobs]]\nname = "missing"\ncrm = "nope.csv"\nout_dir = "out_missing"\n\n'
+            '[[jobs]]\nname = "ok"\ncrm = "a.csv"\nout_dir = "out_ok"\n',
+            encoding="utf-8",
+        )
+        summary = run_batch(load_manifest(manifest_path), workers=2)
+        assert [job["status"] for job in summary["jobs"]] == ["error", "ok"]
+        assert summary["jobs_failed"] == 1
+        assert summary["totals"]["deduped_contacts"] == 5
+
+
+def test_manifest_rejects_unknown_config_keys():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest_path = Path(temp_dir) / "jobs.json"
+        manifest_path.write_text(
+            json.dumps({"jobs": [{"crm": "a.csv", "out_dir": "out", "config": {"bogus": 1}}]}),
+            encoding="utf-8",
+        )
+        with pytest.raises(ValueError, match="bogus"):
+            load_manifest(manifest_path)
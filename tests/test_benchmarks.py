@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+from pathlib import Path
+
+from benchmarks.generate import GeneratorSpec, generate_crm_csv, generate_google_csv
+from benchmarks.suite import compare_to_baseline, parse_importtime, run_suite
+from core.config import Config
+
+
+def test_generators_are_deterministic():
+    spec = GeneratorSpec(rows=200, extra_columns=2, multi_phone_ratio=0.5, encoding="cp1252")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        first = generate_crm_csv(temp_path / "a.csv", spec).read_bytes()
+        second = generate_crm_csv(temp_path / "b.csv", spec).read_bytes()
+        google = generate_google_csv(temp_path / "g.csv", spec)
+        with google.open(encoding="cp1252", newline="") as handle:
+            google_rows = list(csv.reader(handle))
+
+    assert first == second
+    rows = list(csv.reader(first.decode("cp1252").splitlines(), delimiter=";"))
+    assert rows[0][-1] == "Extra 2"
+    assert len(rows) == 201
+    assert 60 < sum(":::" in row[1] for row in rows[1:]) < 140
+    assert len(google_rows) == 201
+
+
+def test_suite_reports_and_compares():
+    result = run_suite(GeneratorSpec(rows=300), ["read", "end_to_end"], Config(), isolate=False)
+    assert set(result["scenarios"]) == {"read", "end_to_end"}
+    assert result["scenarios"]["read"]["rows"] == 300
+    assert result["scenarios"]["end_to_end"]["rows"] == 600
+
+    baseline = {"scenarios": {"read": {"rows_per_sec": result["scenarios"]["read"]["rows_per_sec"] * 2}}}
+    comparison = compare_to_baseline(result, baseline, tolerance=0.1)
+    assert list(comparison) == ["read"]
+    assert comparison["read"]["regressed"]
+
+
+def test_suite_reports_bytes_per_contact():
+    result = run_suite(GeneratorSpec(rows=10), ["contact_memory"], Config(), isolate=False, contacts=2000)
+    memory = result["scenarios"]["contact_memory"]
+    assert memory["rows"] == 2000
+    assert result["meta"]["contacts"] == 2000
+    assert 0 < memory["current_bytes_per_contact"] < memory["legacy_bytes_per_contact"]
+
+
+def test_cli_import_stays_lazy():
+    result = run_suite(GeneratorSpec(rows=10), [], Config(), isolate=False)
+    cli = result["imports"]["core.cli"]
+    assert cli["ms"] > 0
+    assert cli["lazy_loaded"] == []
+
+    baseline = {"imports": {"core.cli": {"ms": cli["ms"] / 2}}}
+    assert compare_to_baseline(result, baseline)["import:core.cli"]["regressed"]
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:        80 |        200 | json\n"
+    )
+    assert parse_importtime(stderr) == {"json.decoder": 120, "json": 200}
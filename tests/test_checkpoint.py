@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.generate import GeneratorSpec, generate_crm_csv, generate_google_csv
+from core.checkpoint import has_checkpoint
+from core.config import Config
+from core.pipeline import PipelineCancelled, run_pipeline
+
+
+def _cancel_after(calls: int):
+    seen = [0]
+
+    def should_cancel() -> bool:
+        seen[0] += 1
+        return seen[0] > calls
+
+    return should_cancel
+
+
+def _outputs(out_dir: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(out_dir.iterdir()) if path.suffix in (".csv", ".jsonl")}
+
+
+def _comparable(report: dict) -> dict:
+    return {"counts": report["counts"], "suspects": {**report["suspects"], "file": None}}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"dedupe_spill_threshold": 700},
+        {"dedupe_enabled": False},
+        {"stage_threads": True},
+    ],
+)
+def test_resume_matches_uninterrupted_run(tmp_path, options):
+    spec = GeneratorSpec(rows=9000, duplicate_ratio=0.3)
+    crm_path = generate_crm_csv(tmp_path / "crm.csv", spec)
+    google_path = generate_google_csv(tmp_path / "google.csv", GeneratorSpec(rows=3000, seed=7))
+    config = Config(batch_size=2000, checkpoint_interval=1e-9, **options)
+
+    expected = run_pipeline(crm_path, tmp_path / "full", config, google_path=google_path)
+    assert not has_checkpoint(tmp_path / "full")
+
+    out_dir = tmp_path / "resumed"
+    with pytest.raises(PipelineCancelled):
+        run_pipeline(crm_path, out_dir, config, google_path=google_path, should_cancel=_cancel_after(3))
+    assert has_checkpoint(out_dir)
+    with pytest.raises(PipelineCancelled):
+        run_pipeline(crm_path, out_dir, config, google_path=google_path, should_cancel=_cancel_after(2), resume=True)
+    report = run_pipeline(crm_path, out_dir, config, google_path=google_path, resume=True)
+
+    assert not has_checkpoint(out_dir)
+    assert _comparable(report) == _comparable(expected)
+    assert _outputs(out_dir) == _outputs(tmp_path / "full")
+
+
+def test_resume_rejects_checkpoint_of_other_settings(tmp_path):
+    crm_path = generate_crm_csv(tmp_path / "crm.csv", GeneratorSpec(rows=5000))
+    config = Config(checkpoint_interval=1e-9)
+    with pytest.raises(PipelineCancelled):
+        run_pipeline(crm_path, tmp_path / "out", config, should_cancel=_cancel_after(1))
+
+    # Speed-only settings may change between runs; the output ones may not.
+    with pytest.raises(ValueError, match="different inputs or settings"):
+        run_pipeline(crm_path, tmp_path / "out", Config(label="OTHER"), resume=True)
+    report = run_pipeline(crm_path, tmp_path / "out", Config(workers=2, phone_cache_size=16), resume=True)
+    assert report["counts"]["crm_rows"] == 5000
@@ -19,6 +19,39 @@ class TestDedupe(unittest.TestCase):
         self.assertEqual(index.duplicates_merged, 1)
         self.assertEqual(index.values()[0].name, "Maria")
 
+    def test_spilled_runs_match_in_memory(self) -> None:
+        def build_contacts() -> list[Contact]:
+            contacts = []
+            for idx in range(60):
+                phone = f"55119{idx % 17:08d}"
+                name = "." if idx % 4 == 0 else f"Nome {idx}"
+                if idx % 5 == 0:
+                    name = phone
+                contacts.append(
+                    Contact(
+                        name=name,
+                        phone=phone,
+                        notes=[f"nota {idx % 3}"],
+                        labels={f"L{idx % 2}"},
+                        sources={"crm" if idx % 2 else "google"},
+                    )
+                )
+            return contacts
+
+        in_memory = ContactIndex()
+        spilling = ContactIndex(spill_threshold=5)
+        for contact in build_contacts():
+            in_memory.add(contact)
+        for contact in build_contacts():
+            spilling.add(contact)
+
+        expected = sorted(in_memory.values(), key=lambda contact: contact.phone)
+        actual = list(spilling.iter_sorted())
+        self.assertGreater(spilling.spilled_runs, 1)
+        self.assertEqual(actual, expected)
+        self.assertEqual(spilling.duplicates_merged, in_memory.duplicates_merged)
+        spilling.close()
+
 
 if __name__ == "__main__":
     unittest.main()
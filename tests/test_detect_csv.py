@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from core.config import Config
+from core.io import read_csv
+from core.io.read_csv import iter_csv_rows, prepare_csv
+from core.pipeline import run_pipeline
+
+
+def test_detects_tab_and_pipe_delimiters():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        tab_path = temp_path / "tab.csv"
+        pipe_path = temp_path / "pipe.csv"
+        tab_path.write_text("Nome\tTelefone\nMaria, Silva\t11912345678\n", encoding="utf-8")
+        pipe_path.write_text("Nome|Telefone|DDI\nMaria|11912345678|55\n", encoding="utf-8")
+        tab_meta = prepare_csv(tab_path)
+        pipe_meta = prepare_csv(pipe_path)
+
+    assert (tab_meta.delimiter, tab_meta.headers) == ("\t", ["Nome", "Telefone"])
+    assert (pipe_meta.delimiter, pipe_meta.headers) == ("|", ["Nome", "Telefone", "DDI"])
+
+
+def test_late_cp1252_byte_switches_encoding(monkeypatch):
+    monkeypatch.setattr(read_csv, "SAMPLE_BYTES", 256)
+    monkeypatch.setattr(read_csv, "VERIFY_BLOCK_BYTES", 1000)
+    lines = ["Nome;Telefone"] + [f"Cliente {idx};1191234{idx:04d}" for idx in range(400)]
+    lines.append("João;11900000000")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "crm.csv"
+        csv_path.write_bytes(("\n".join(lines) + "\n").encode("cp1252"))
+        sampled_only = prepare_csv(csv_path, verify_encoding=False)
+        meta = prepare_csv(csv_path)
+        rows = list(iter_csv_rows(meta.path, meta.encoding, meta.delimiter))
+
+    assert sampled_only.encoding == "utf-8-sig"
+    assert (meta.encoding, meta.used_fallback) == ("cp1252", True)
+    assert rows[-1][1]["Nome"] == "João"
+
+
+def test_run_reads_each_input_once_despite_late_byte(monkeypatch, tmp_path):
+    monkeypatch.setattr(read_csv, "SAMPLE_BYTES", 256)
+    lines = ["Nome;Telefone"] + [f"Cliente {idx};1191234{idx:04d}" for idx in range(400)]
+    lines.append("João;11900000000")
+    csv_path = tmp_path / "crm.csv"
+    csv_path.write_bytes(("\n".join(lines) + "\n").encode("cp1252"))
+
+    def no_full_check(*args, **kwargs):
+        raise AssertionError("the run should not decode the file before reading it")
+
+    monkeypatch.setattr(read_csv, "decodes_cleanly", no_full_check)
+    report = run_pipeline(csv_path, tmp_path / "out", Config(dedupe_enabled=False))
+    output = b"".join(Path(path).read_bytes() for path in report["outputs"]).decode("utf-8")
+
+    assert report["counts"]["total_rows"] == 401
+    assert "João" in output
+
+
+def test_header_longer_than_sample(monkeypatch):
+    monkeypatch.setattr(read_csv, "SAMPLE_BYTES", 16)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "wide.csv"
+        csv_path.write_text("Nome;Telefone;Observacoes;Criado em\nMaria;1;;\n", encoding="utf-8")
+        meta = prepare_csv(csv_path)
+
+    assert meta.headers == ["Nome", "Telefone", "Observacoes", "Criado em"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+from pathlib import Path
+
+from core.config import Config
+from core.incremental import run_incremental
+from core.io.suspects import iter_suspects
+from core.pipeline import run_pipeline
+
+
+def _crm_lines(count: int) -> list[str]:
+    lines = ["Nome;Telefone;Labels"]
+    for idx in range(count):
+        name = "." if idx % 7 == 0 else f"Cliente {idx}"
+        phone = f"11 9{idx % 90:04d}-0000"
+        if idx % 5 == 0:
+            phone = f"{phone} ::: 11 98888-{idx % 4:04d}"
+        lines.append(f"{name};{phone};L{idx % 3}")
+    return lines
+
+
+def _write(path: Path, lines: list[str]) -> None:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _rows(path: Path) -> list[list[str]]:
+    with path.open(encoding="utf-8-sig", newline="") as handle:
+        return list(csv.reader(handle))[1:]
+
+
+def test_first_run_matches_full_pipeline():
+    config = Config(batch_size=25)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        _write(crm_path, _crm_lines(150))
+        full = run_pipeline(crm_path, temp_path / "full", config)
+        incremental = run_incremental(crm_path, temp_path / "inc", config)
+
+        assert [Path(path).name for path in incremental["outputs"]] == [Path(path).name for path in full["outputs"]]
+        for left, right in zip(full["outputs"], incremental["outputs"]):
+            assert Path(left).read_bytes() == Path(right).read_bytes()
+    assert incremental["counts"]["rows_new"] == 150
+    assert incremental["counts"]["deduped_contacts"] == full["counts"]["deduped_contacts"]
+
+
+def test_rerun_only_touches_changed_batches():
+    config = Config(batch_size=25)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        out_dir = temp_path / "out"
+        lines = _crm_lines(150)
+        _write(crm_path, lines)
+        first = run_incremental(crm_path, out_dir, config)
+
+        unchanged = run_incremental(crm_path, out_dir, config)
+        assert unchanged["counts"]["rows_new"] == 0
+        assert unchanged["written"] == []
+        assert _rows(out_dir / "delta.csv") == []
+
+        lines[4] = "Renomeado;11 90003-0000;L0"
+        lines.append("Novo Contato;11 95555-1234;L1")
+        _write(crm_path, lines)
+        second = run_incremental(crm_path, out_dir, config)
+
+        assert second["counts"]["rows_new"] == 2
+        assert second["counts"]["rows_removed"] == 1
+        assert second["counts"]["contacts_added"] == 1
+        assert len(second["written"]) < len(first["outputs"])
+        delta = {row[18]: row[0] for row in _rows(out_dir / "delta.csv")}
+        assert delta["5511955551234"] == "Novo Contato"
+        assert delta["5511900030000"] == "Cliente 93"
+        all_rows = [row for path in second["outputs"] for row in _rows(Path(path))]
+        phones = [row[18] for row in all_rows]
+        assert len(phones) == len(set(phones)) == second["counts"]["deduped_contacts"]
+        assert "5511955551234" in phones
+
+
+def test_rerun_keeps_suspects_of_unchanged_rows():
+    config = Config(batch_size=25)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        out_dir = temp_path / "out"
+        lines = _crm_lines(40)
+        lines[3] = "Curto;11 9123;L0"
+        lines[9] = "Longo;11 91234-5678-9999;L1"
+        _write(crm_path, lines)
+        full = run_pipeline(crm_path, temp_path / "full", config)
+        first = run_incremental(crm_path, out_dir, config)
+        assert first["counts"]["suspects"] == full["suspects"]["total"] == 2
+        assert (out_dir / "suspects.jsonl").read_bytes() == (temp_path / "full" / "suspects.jsonl").read_bytes()
+
+        del lines[3]
+        lines.insert(1, "Novo Contato;11 95555-1234;L1")
+        _write(crm_path, lines)
+        second = run_incremental(crm_path, out_dir, config)
+
+        assert second["counts"]["suspects_new"] == 0
+        assert second["counts"]["suspects"] == second["suspects"]["total"] == 1
+        assert [(item["name"], item["line"]) for item in iter_suspects(out_dir / "suspects.jsonl")] == [("Longo", 10)]
+
+
+
+def test_identical_rows_count_like_a_full_run():
+    config = Config(batch_size=25, protect_good_name=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        out_dir = temp_path / "out"
+        lines = _crm_lines(60)
+        lines += ["Alfa;11 97777-0000;L1", "Beta;11 97777-0000;L1", "Alfa;11 97777-0000;L1"]
+        lines += ["Sem Telefone;;L0", "Sem Telefone;;L0"]
+        _write(crm_path, lines)
+        full = run_pipeline(crm_path, temp_path / "full", config)
+        first = run_incremental(crm_path, out_dir, config)
+
+        assert [Path(path).read_bytes() for path in first["outputs"]] == [
+            Path(path).read_bytes() for path in full["outputs"]
+        ]
+        for key in ("without_phone", "duplicates_merged", "deduped_contacts"):
+            assert first["counts"][key] == full["counts"][key]
+
+        rerun = run_incremental(crm_path, out_dir, config)
+        assert rerun["counts"]["rows_new"] == 0
+        assert rerun["counts"]["without_phone"] == 2
+
+        # Drop one copy of each duplicated row and every row of one phone.
+        del lines[-1]
+        del lines[-2]
+        lines = [line for line in lines if "90005-0000" not in line]
+        _write(crm_path, lines)
+        shrunk = run_incremental(crm_path, out_dir, config)
+        assert shrunk["counts"]["rows_removed"] == 3
+        assert shrunk["counts"]["without_phone"] == 1
+        removed = _rows(out_dir / "removed.csv")
+        assert [row[18] for row in removed] == ["5511900050000"]
+        assert shrunk["counts"]["contacts_removed"] == 1
+        delta = {row[18]: row[0] for row in _rows(out_dir / "delta.csv")}
+        assert delta == {"5511977770000": "Beta"}
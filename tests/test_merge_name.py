@@ -1,6 +1,7 @@
 import unittest
 
-from core.merge.merge_rules import merge_name
+from core.merge.merge_rules import MergeAccumulator, merge_contacts, merge_name
+from core.models import Contact
 
 
 class TestMergeName(unittest.TestCase):
@@ -11,5 +12,44 @@ class TestMergeName(unittest.TestCase):
         self.assertEqual(merge_name(".", "Joao"), "Joao")
 
 
+class TestMergeAccumulator(unittest.TestCase):
+    def _contacts(self) -> list[Contact]:
+        names = [" 5511912345678 ", ".", "", "Maria", " Joao ", "(11) 9123", "Ana"]
+        shared_labels = {"CRM_2025"}
+        return [
+            Contact(
+                name=name,
+                phone="5511912345678",
+                notes=[f" nota {idx % 3} ", ""],
+                labels=shared_labels if idx % 2 else {f"L{idx}"},
+                sources={"crm" if idx % 2 else "google"},
+            )
+            for idx, name in enumerate(names)
+        ]
+
+    def test_matches_merge_contacts_fold(self) -> None:
+        for protect in (True, False):
+            with self.subTest(protect_good_name=protect):
+                contacts = self._contacts()
+                expected = contacts[0]
+                for incoming in contacts[1:]:
+                    expected = merge_contacts(expected, incoming, True, protect)
+
+                contacts = self._contacts()
+                accumulator = MergeAccumulator(contacts[0], True, protect)
+                for incoming in contacts[1:]:
+                    accumulator.merge(incoming)
+
+                self.assertEqual(accumulator.contact, expected)
+
+    def test_does_not_mutate_shared_sets(self) -> None:
+        shared_labels = {"CRM_2025"}
+        first = Contact(name="Maria", phone="1", labels=shared_labels)
+        accumulator = MergeAccumulator(first)
+        accumulator.merge(Contact(name="Maria", phone="1", labels={"VIP"}))
+        self.assertEqual(shared_labels, {"CRM_2025"})
+        self.assertEqual(accumulator.contact.labels, {"CRM_2025", "VIP"})
+
+
 if __name__ == "__main__":
     unittest.main()
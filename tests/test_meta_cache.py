@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks.generate import GeneratorSpec, generate_crm_csv
+from core import parallel
+from core.config import Config
+from core.io import read_csv
+from core.io.meta_cache import CsvMetaCache
+from core.io.read_csv import prepare_csv
+from core.pipeline import run_pipeline
+from core.validate import validate_input
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("file metadata should come from the cache")
+
+
+def test_prepare_csv_reuses_cache_across_instances(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        csv_path = temp_path / "crm.csv"
+        csv_path.write_text("Nome;Telefone\nMaria;11912345678\n", encoding="cp1252")
+        cache_path = temp_path / "cache" / "csv_meta.json"
+
+        first = prepare_csv(csv_path, CsvMetaCache(cache_path))
+        with monkeypatch.context() as patched:
+            patched.setattr(read_csv, "read_sample", _fail)
+            patched.setattr(read_csv, "confirm_encoding", _fail)
+            second = prepare_csv(csv_path, CsvMetaCache(cache_path))
+        assert second == first
+
+        csv_path.write_text("Nome,Telefone,DDI\nMaria,11912345678,55\n", encoding="utf-8")
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        with monkeypatch.context() as patched:
+            patched.setattr(read_csv, "read_sample", _fail)
+            with pytest.raises(AssertionError):
+                prepare_csv(csv_path, CsvMetaCache(cache_path))
+        third = prepare_csv(csv_path, CsvMetaCache(cache_path))
+
+    assert third.delimiter == ","
+    assert third.headers == ["Nome", "Telefone", "DDI"]
+
+
+def test_plan_chunks_reuses_cached_boundaries(monkeypatch):
+    cache = CsvMetaCache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "crm.csv"
+        lines = ["Nome,Telefone"] + [f"Cliente {idx},1190000{idx:04d}" for idx in range(400)]
+        csv_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        meta = prepare_csv(csv_path, cache)
+        chunks = parallel.plan_chunks(meta, 2, chunk_bytes=512, cache=cache)
+        monkeypatch.setattr(parallel, "find_record_boundaries", _fail)
+        assert parallel.plan_chunks(meta, 2, chunk_bytes=512, cache=cache) == chunks
+
+    assert len(chunks) > 1
+
+
+def test_cached_row_count_sizes_progress(tmp_path):
+    crm_path = generate_crm_csv(tmp_path / "crm.csv", GeneratorSpec(rows=3000))
+    cache = CsvMetaCache(None)
+    first = []
+    run_pipeline(crm_path, tmp_path / "first", Config(), on_progress=first.append, meta_cache=cache)
+    assert first[0].rows_total is None
+
+    second = []
+    run_pipeline(crm_path, tmp_path / "second", Config(), on_progress=second.append, meta_cache=cache)
+    assert {update.rows_total for update in second} == {3000}
+
+    fresh = CsvMetaCache(None)
+    counts = validate_input("crm", crm_path, Config(), meta_cache=fresh)
+    validated = []
+    run_pipeline(crm_path, tmp_path / "third", Config(), on_progress=validated.append, meta_cache=fresh)
+    assert validated[-1].rows_total == counts["line_count"] == validated[-1].rows
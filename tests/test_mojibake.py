@@ -1,7 +1,11 @@
+import tempfile
 import unittest
+from pathlib import Path
 
+from core.config import Config
 from core.normalize import text
-from core.normalize.text import analyze_mojibake
+from core.normalize.text import MojibakeAnalyzer, analyze_mojibake, is_mojibake_safe
+from core.pipeline import run_pipeline
 
 
 class TestMojibakeDetection(unittest.TestCase):
@@ -21,13 +25,52 @@ class TestMojibakeDetection(unittest.TestCase):
     def test_mojibake_is_suspect(self) -> None:
         result = analyze_mojibake("MÃ¡rcio")
         self.assertTrue(result.suspect)
-        if text.ftfy is not None:
+        if text.load_ftfy() is not None:
             self.assertEqual(result.suggested_fix, "Márcio")
 
     def test_replacement_char_is_suspect(self) -> None:
         result = analyze_mojibake("Nome \ufffd")
         self.assertTrue(result.suspect)
 
+    def test_latin1_letters_short_circuit(self) -> None:
+        self.assertTrue(is_mojibake_safe("Mariano Ângelo"))
+        self.assertTrue(is_mojibake_safe("Maria"))
+        self.assertFalse(is_mojibake_safe("MÃ¡rcio"))
+        self.assertFalse(is_mojibake_safe("João 😊"))
+
+    def test_analyzer_caches_distinct_names(self) -> None:
+        analyzer = MojibakeAnalyzer()
+        for _ in range(3):
+            self.assertTrue(analyzer("MÃ¡rcio").suspect)
+            self.assertFalse(analyzer("Maria").suspect)
+        stats = analyzer.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["skipped"], 3)
+
+    def test_ftfy_is_not_imported_for_safe_names(self) -> None:
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from core.normalize.text import analyze_mojibake\n"
+            "analyze_mojibake('Maria')\n"
+            "print('ftfy' in sys.modules)\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def test_check_can_be_disabled(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            crm_path = Path(temp_dir) / "crm.csv"
+            crm_path.write_text("Nome;Telefone\nMÃ¡rcio;11 91234-5678\n", encoding="utf-8")
+            checked = run_pipeline(crm_path, Path(temp_dir) / "on", Config(), dry_run=True)
+            skipped = run_pipeline(crm_path, Path(temp_dir) / "off", Config(check_mojibake=False), dry_run=True)
+        self.assertEqual(checked["suspects"]["by_reason"].get("name_mojibake"), 1)
+        self.assertNotIn("name_mojibake", skipped["suspects"]["by_reason"])
+        self.assertFalse(skipped["params"]["check_mojibake"])
+
 
 if __name__ == "__main__":
     unittest.main()
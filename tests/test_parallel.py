@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from core import parallel
+from core.config import Config
+from core.io.read_csv import find_record_boundaries, iter_csv_rows, prepare_csv
+from core.pipeline import run_pipeline
+
+
+def _build_crm_csv(rows: int) -> str:
+    lines = ["Nome,Telefone,DDI,Labels"]
+    for idx in range(rows):
+        name = f"Cliente {idx}"
+        if idx % 7 == 0:
+            name = f"\"Linha\nQuebrada {idx}\""
+        if idx % 11 == 0:
+            name = "MÃ¡rcio"
+        phone = f"11 9{idx % 50:04d}-{idx % 13:04d}"
+        if idx % 5 == 0:
+            phone = f"{phone} ::: 11 98888-{idx % 9:04d}"
+        ddi = "1" if idx % 17 == 0 else ""
+        labels = "\"VIP, Ouro\"" if idx % 3 == 0 else ""
+        lines.append(f"{name},{phone},{ddi},{labels}")
+    return "\n".join(lines) + "\n"
+
+
+def test_record_boundaries_respect_quoted_newlines():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "crm.csv"
+        path.write_text(_build_crm_csv(300), encoding="utf-8")
+        boundaries = find_record_boundaries(path, 512)
+        payload = path.read_bytes()
+
+    assert boundaries is not None
+    assert boundaries[-1] == len(payload)
+    assert len(boundaries) > 3
+    for offset in boundaries[:-1]:
+        assert payload[offset - 1:offset] == b"\n"
+        assert payload[:offset].count(b'"') % 2 == 0
+
+
+def test_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_CHUNK_BYTES", 256)
+    monkeypatch.setattr(parallel, "MAX_CHUNK_BYTES", 1024)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        crm_path.write_text(_build_crm_csv(400), encoding="utf-8")
+        assert len(list(iter_csv_rows(crm_path, "utf-8-sig", ","))) == 400
+        assert len(parallel.plan_chunks(prepare_csv(crm_path), 3)) > 1
+
+        serial = run_pipeline(crm_path=crm_path, out_dir=temp_path / "serial", config=Config(), dry_run=True)
+        parallel_report = run_pipeline(
+            crm_path=crm_path,
+            out_dir=temp_path / "parallel",
+            config=Config(workers=3),
+            dry_run=True,
+        )
+        serial_suspects = Path(serial["suspects"].pop("file")).read_bytes()
+        parallel_suspects = Path(parallel_report["suspects"].pop("file")).read_bytes()
+
+    assert parallel_suspects == serial_suspects
+    serial_caches = serial.pop("caches")
+    parallel_caches = parallel_report.pop("caches")
+    assert parallel_report == serial
+    phone_counters = ("hits", "misses", "vectorized")
+    assert sum(parallel_caches["phone_normalize"][key] for key in phone_counters) == sum(
+        serial_caches["phone_normalize"][key] for key in phone_counters
+    )
+    assert serial["counts"]["crm_rows"] == 400
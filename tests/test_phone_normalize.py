@@ -1,6 +1,12 @@
+import random
+import tempfile
 import unittest
+from pathlib import Path
 
-from core.normalize.phone import normalize_phone
+from benchmarks.generate import GeneratorSpec, generate_crm_csv
+from core.config import Config
+from core.normalize.phone import CachedPhoneNormalizer, load_numpy, normalize_phone, normalize_phone_batch
+from core.pipeline import run_pipeline
 
 
 class TestPhoneNormalize(unittest.TestCase):
@@ -22,6 +28,60 @@ class TestPhoneNormalize(unittest.TestCase):
             "111912345678",
         )
 
+    def test_letters_are_stripped(self) -> None:
+        self.assertEqual(normalize_phone("tel: 11 9123", "55", False), "119123")
+
+    def test_cached_normalizer_counts_hits(self) -> None:
+        normalizer = CachedPhoneNormalizer(maxsize=8)
+        for _ in range(3):
+            self.assertEqual(normalizer("(11) 91234-5678", "55", True), "5511912345678")
+        stats = normalizer.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["maxsize"], 8)
+
+    def test_batch_matches_single_values(self) -> None:
+        rng = random.Random(7)
+        chars = "0123456789 ()-+./x\u0663"
+        values = ["".join(rng.choice(chars) for _ in range(rng.randrange(20))) for _ in range(500)]
+        values += ["5511912345678", "11912345678", "55", "", "+55 (11) 91234-5678"]
+        overrides = [rng.choice([None, "", "55", "+1", "x"]) for _ in values]
+        for ddi_default, assume_ddi, min_len in (("55", True, 12), ("55", False, 12), ("1", True, None)):
+            expected = [normalize_phone(v, ddi_default, assume_ddi, o, min_len) for v, o in zip(values, overrides)]
+            for vectorize in (False, True):
+                with self.subTest(ddi_default=ddi_default, assume_ddi=assume_ddi, vectorize=vectorize):
+                    batch = normalize_phone_batch(
+                        values, overrides, ddi_default, assume_ddi, min_len, 12, 13, vectorize=vectorize
+                    )
+                    self.assertEqual(batch.normalized, expected)
+                    self.assertEqual(
+                        batch.length_suspect, [bool(value) and not 12 <= len(value) <= 13 for value in expected]
+                    )
+                    self.assertEqual(batch.vectorized, vectorize and load_numpy() is not None)
+
+    def test_batch_with_oversized_cell(self) -> None:
+        values = [f"11 9{idx:04d}-0000" for idx in range(200)]
+        values[17] = "ligar depois das 18h, " * 5000 + "11 91234-5678"
+        expected = [normalize_phone(value, "55", True, None, 12) for value in values]
+        batch = normalize_phone_batch(values, [None] * len(values), "55", True, 12, 12, 13)
+        self.assertEqual(batch.normalized, expected)
+        self.assertTrue(batch.length_suspect[17])
+        self.assertFalse(any(batch.length_suspect[:17]))
+        self.assertEqual(batch.vectorized, load_numpy() is not None)
+
+    @unittest.skipIf(load_numpy() is None, "numpy not installed")
+    def test_vectorized_pipeline_report_matches(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            crm_path = generate_crm_csv(temp_path / "crm.csv", GeneratorSpec(rows=3000, duplicate_ratio=0.3))
+            reports = []
+            for vectorize in (False, True):
+                report = run_pipeline(crm_path, temp_path / str(vectorize), Config(vectorize_phones=vectorize))
+                report.pop("caches")
+                files = [Path(report["suspects"].pop("file"))] + [Path(path) for path in report.pop("outputs")]
+                reports.append((report, [path.read_bytes() for path in files]))
+        self.assertEqual(reports[0], reports[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from benchmarks.generate import GeneratorSpec, generate_crm_csv, generate_google_csv
+from core.config import Config
+from core.pipeline import run_pipeline
+from core.progress import ProgressReporter
+
+
+def test_reporter_throttles_by_time_but_not_stage_changes():
+    now = [0.0]
+    updates = []
+    report = ProgressReporter(updates.append, bytes_total=1000, interval=0.5, clock=lambda: now[0])
+    for step in range(1, 21):
+        now[0] = step * 0.1
+        report("read", rows=step * 10, bytes_done=step * 25)
+    report("write", rows=200, bytes_done=1000)
+    report("write", rows=200, bytes_done=1000, force=True)
+
+    assert [update.rows for update in updates] == [10, 60, 110, 160, 200, 200]
+    middle = updates[2]
+    assert middle.stage == "read"
+    assert middle.percent == 27
+    assert middle.rows_per_s == 100.0
+    assert middle.bytes_per_s == 250.0
+    assert middle.eta_s == 2.9
+    assert updates[-1].eta_s is None
+    assert updates[-1].as_dict()["percent"] == 100
+
+
+def test_pipeline_reports_structured_progress(tmp_path):
+    crm_path = generate_crm_csv(tmp_path / "crm.csv", GeneratorSpec(rows=6000))
+    google_path = generate_google_csv(tmp_path / "google.csv", GeneratorSpec(rows=2000))
+    updates = []
+    run_pipeline(
+        crm_path, tmp_path / "out", Config(), google_path=google_path, on_progress=updates.append, progress_interval=60
+    )
+    # Far apart in time, so only stage changes and the final update get through.
+    assert [update.stage for update in updates] == [
+        "Processando Google",
+        "Processando CRM",
+        "Escrevendo CSVs",
+        "Concluído",
+    ]
+    final = updates[-1]
+    assert final.rows == 8000
+    assert final.bytes_done == final.bytes_total == crm_path.stat().st_size + google_path.stat().st_size
+    assert final.percent == 100
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from core.io.read_csv import iter_csv_chunk_projected, iter_csv_projected, iter_csv_rows
+
+
+def _write(temp_dir: str, payload: bytes) -> Path:
+    path = Path(temp_dir) / "input.csv"
+    path.write_bytes(payload)
+    return path
+
+
+def test_offsets_match_dict_reader_rows():
+    payload = (
+        "﻿Nome,Telefone\r\n"
+        "Maria,11912345678\r\n"
+        "\"João\nSilva\",11987654321\r\n"
+        "\r\n"
+        "Ana,11911112222\r\n"
+    ).encode("utf-8")
+    headers = ["Nome", "Telefone"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(temp_dir, payload)
+        expected = list(iter_csv_rows(path, "utf-8-sig", ","))
+        with_offsets = list(iter_csv_projected(path, "utf-8-sig", ",", headers, headers))
+
+    assert [(line, dict(zip(headers, values))) for line, values, _ in with_offsets] == expected
+    offsets = [offset for _, _, offset in with_offsets]
+    assert offsets == sorted(offsets)
+    assert offsets[0] == payload.index(b"\r\n\"") + 2
+    assert offsets[-1] == len(payload)
+
+
+def test_offsets_with_lone_carriage_returns():
+    payload = "Nome;Telefone\rMaria;119\rJoao;118\r".encode("cp1252")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(temp_dir, payload)
+        rows = list(iter_csv_projected(path, "cp1252", ";", ["Nome", "Telefone"], ["Nome"]))
+
+    assert [values for _, values, _ in rows] == [("Maria",), ("Joao",)]
+    assert rows[-1][2] == len(payload)
+
+
+def test_projected_rows_follow_dict_reader_semantics():
+    payload = (
+        "Nome,Telefone,Extra,Telefone\n"
+        "Maria,111,x,222\n"
+        "\n"
+        "Curta\n"
+        "\"Ana\nLuz\",333,y,444\n"
+    ).encode("utf-8")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(temp_dir, payload)
+        headers = ["Nome", "Telefone", "Extra", "Telefone"]
+        rows = list(iter_csv_projected(path, "utf-8-sig", ",", headers, ["Telefone", "Nome"]))
+        dict_rows = list(iter_csv_rows(path, "utf-8-sig", ","))
+
+    assert [line for line, _, _ in rows] == [line for line, _ in dict_rows]
+    assert [values for _, values, _ in rows] == [("222", "Maria"), ("", "Curta"), ("444", "Ana\nLuz")]
+    assert rows[-1][2] == len(payload)
+
+
+def test_lone_carriage_returns_in_final_line():
+    headers = ["Nome", "Telefone"]
+    for payload in (b"Nome;Telefone\nMaria;119\rJ", b"Nome;Telefone\nMaria;119\rJ;\r"):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _write(temp_dir, payload)
+            rows = list(iter_csv_projected(path, "cp1252", ";", headers, headers))
+
+        assert [values for _, values, _ in rows] == [("Maria", "119"), ("J", "")]
+        assert rows[-1][2] == len(payload)
+
+
+def test_lines_the_encoding_rejects_fall_back():
+    payload = "\ufeffNome;Telefone\r\nJosé;1\r\n".encode("utf-8") + "João;2\rMaria\x81;3\n".encode("latin-1")
+    headers = ["Nome", "Telefone"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(temp_dir, payload)
+        rows = list(iter_csv_projected(path, "utf-8-sig", ";", headers, ["Nome"]))
+        chunk = list(iter_csv_chunk_projected(path, "utf-8-sig", ";", headers, ["Nome"], 0, len(payload)))
+
+    assert [values for _, values, _ in rows] == [("José",), ("João",), ("Maria\x81",)]
+    assert [values for _, values in chunk] == [("Nome",)] + [values for _, values, _ in rows]
+    assert rows[-1][2] == len(payload)
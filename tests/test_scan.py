@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from core.config import Config, ColumnOverrides
+from core.io import scan
+from core.io.columns import resolve_crm_columns
+from core.io.read_csv import prepare_csv
+from core.io.scan import HyperLogLog, scan_phone_stats
+
+
+def _write_crm(path: Path, quoted: bool, newline: str = "\r\n") -> None:
+    lines = ["Nome;Telefone;DDI"]
+    for idx in range(500):
+        name = f"Cliente {idx}"
+        if quoted and idx % 9 == 0:
+            name = f"\"Cliente;\n{idx}\""
+        phone = f"11 9{idx % 120:04d}-0000"
+        if idx % 25 == 0:
+            phone = ""
+        elif idx % 10 == 0:
+            phone = f"{phone} ::: 11 97777-{idx % 3:04d}"
+        ddi = "1" if idx % 50 == 1 else ""
+        lines.append(f"{name};{phone};{ddi}")
+    path.write_text(newline.join(lines) + newline, encoding="utf-8")
+
+
+def _reference(path: Path, config: Config) -> tuple[int, int, int]:
+    from core.rows import RowNormalizer
+    from core.io.read_csv import iter_csv_projected
+
+    meta = prepare_csv(path)
+    columns = resolve_crm_columns(meta.headers, ColumnOverrides())
+    normalizer = RowNormalizer("crm", columns, config)
+    total = missing = duplicates = 0
+    seen: set[str] = set()
+    for line_num, values, _ in iter_csv_projected(meta.path, meta.encoding, meta.delimiter, meta.headers, normalizer.fields):
+        total += 1
+        result = normalizer.normalize(line_num, values)
+        if not result.phone_entries:
+            missing += 1
+            continue
+        for entry in result.phone_entries:
+            if entry.normalized in seen:
+                duplicates += 1
+            seen.add(entry.normalized)
+    return total, missing, duplicates
+
+
+def test_scan_matches_full_parse(monkeypatch):
+    monkeypatch.setattr(scan, "SCAN_BLOCK_BYTES", 700)
+    config = Config()
+    for quoted in (False, True):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "crm.csv"
+            _write_crm(path, quoted)
+            meta = prepare_csv(path)
+            columns = resolve_crm_columns(meta.headers, ColumnOverrides())
+            result = scan_phone_stats(meta, columns, config, exact_limit_bytes=10_000_000)
+            expected = _reference(path, config)
+
+        assert (result.line_count, result.without_phone, result.duplicates) == expected
+        assert not result.duplicates_estimated
+
+
+def test_scan_splits_cr_only_lines(monkeypatch):
+    monkeypatch.setattr(scan, "SCAN_BLOCK_BYTES", 700)
+    config = Config()
+    for quoted in (False, True):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "crm.csv"
+            _write_crm(path, quoted, newline="\r")
+            meta = prepare_csv(path)
+            columns = resolve_crm_columns(meta.headers, ColumnOverrides())
+            result = scan_phone_stats(meta, columns, config, exact_limit_bytes=10_000_000)
+            expected = _reference(path, config)
+
+        assert result.line_count == expected[0] == 500
+        assert (result.without_phone, result.duplicates) == expected[1:]
+
+
+def test_hyperloglog_estimate_is_close():
+    sketch = HyperLogLog()
+    for idx in range(50_000):
+        sketch.add(f"55119{idx:08d}")
+        sketch.add(f"55119{idx:08d}")
+    assert abs(sketch.estimate() - 50_000) < 50_000 * 0.03
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from benchmarks.generate import GeneratorSpec, generate_crm_csv, generate_google_csv
+from core.config import Config
+from core.pipeline import PipelineCancelled, run_pipeline
+from core.stages import StageGroup
+
+
+def test_stages_keep_order_and_apply_backpressure():
+    produced = []
+
+    def numbers():
+        for value in range(50):
+            produced.append(value)
+            yield value
+
+    with StageGroup(queue_size=2) as stages:
+        doubled = stages.thread("double", (value * 2 for value in stages.thread("source", numbers())))
+        first = next(doubled)
+        time.sleep(0.05)
+        # source queue (2) + one item held by the double stage + its queue (2) + the one consumed.
+        assert len(produced) <= 7
+        assert [first, *doubled] == [value * 2 for value in range(50)]
+        metrics = stages.metrics()
+    assert metrics["source"]["items"] == 50
+    assert metrics["source"]["max_depth"] <= 2
+
+
+def test_stage_errors_reach_the_consumer():
+    def broken():
+        yield 1
+        raise KeyError("boom")
+
+    with StageGroup() as stages:
+        items = stages.thread("broken", broken())
+        assert next(items) == 1
+        with pytest.raises(KeyError):
+            next(items)
+
+
+def test_cancellation_stops_every_stage_quickly():
+    threads_before = threading.active_count()
+    cancel = threading.Event()
+    with StageGroup(queue_size=1, should_cancel=cancel.is_set, cancelled=PipelineCancelled) as stages:
+        endless = stages.thread("endless", iter(int, 1))
+        items = stages.thread("pass", endless)
+        next(items)
+        cancel.set()
+        started = time.perf_counter()
+        with pytest.raises(PipelineCancelled):
+            for _ in items:
+                pass
+    assert time.perf_counter() - started < 0.5
+    assert threading.active_count() == threads_before
+
+
+def test_threaded_pipeline_matches_serial():
+    spec = GeneratorSpec(rows=5000, duplicate_ratio=0.3)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = generate_crm_csv(temp_path / "crm.csv", spec)
+        google_path = generate_google_csv(temp_path / "google.csv", spec)
+        reports = []
+        for threaded in (False, True):
+            config = Config(batch_size=1000, stage_threads=threaded, stage_queue_size=2)
+            report = run_pipeline(crm_path, temp_path / str(threaded), config, google_path=google_path)
+            report.pop("caches")
+            files = [Path(report["suspects"].pop("file"))] + [Path(path) for path in report.pop("outputs")]
+            reports.append((report, [path.read_bytes() for path in files]))
+
+    stage_metrics = reports[1][0].pop("stages")
+    assert reports[0] == reports[1]
+    assert set(stage_metrics) == {
+        "read_google", "parse_google", "normalize_google", "read_crm", "parse_crm", "normalize_crm", "sort"
+    }
+    assert stage_metrics["normalize_crm"]["items"] == 3
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from core.config import Config
+from core.pipeline import run_pipeline
+
+
+def _write_inputs(temp_path: Path) -> tuple[Path, Path]:
+    google_lines = ["Name,Given Name,Additional Name,Family Name,Phone 1 - Type,Phone 1 - Value"]
+    for idx in range(0, 200, 3):
+        name = f"Jo\u00c3\u00a3o {idx}" if idx % 9 == 3 else f"Google {idx}"
+        google_lines.append(f"{name},,,,Mobile,+55 11 9{idx:04d}-0000")
+    crm_lines = ["Nome;Telefone"]
+    for idx in range(0, 200, 2):
+        name = "." if idx % 6 == 0 else f"Concei\u00c3\u00a7\u00c3\u00a3o {idx}" if idx % 10 == 4 else f"Cliente {idx}"
+        crm_lines.append(f"{name};11 9{idx:04d}-0000")
+    google_path = temp_path / "google.csv"
+    crm_path = temp_path / "crm.csv"
+    google_path.write_text("\n".join(google_lines) + "\n", encoding="utf-8")
+    crm_path.write_text("\n".join(crm_lines) + "\n", encoding="utf-8")
+    return google_path, crm_path
+
+
+def _outputs(report: dict) -> list[bytes]:
+    return [Path(path).read_bytes() for path in report["outputs"]]
+
+
+def test_streaming_dedupe_matches_batch_for_sorted_inputs():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        google_path, crm_path = _write_inputs(temp_path)
+        batch = run_pipeline(crm_path, temp_path / "batch", Config(batch_size=40), google_path=google_path)
+        streamed = run_pipeline(
+            crm_path,
+            temp_path / "stream",
+            Config(batch_size=40, stream_output=True),
+            google_path=google_path,
+        )
+        assert _outputs(streamed) == _outputs(batch)
+        suspects = (temp_path / "stream" / "suspects.jsonl").read_bytes()
+        assert suspects == (temp_path / "batch" / "suspects.jsonl").read_bytes()
+        assert b'"google"' in suspects and b'"crm"' in suspects
+
+    assert streamed["suspects"]["sample"] == batch["suspects"]["sample"]
+    assert streamed["counts"]["duplicates_merged"] == batch["counts"]["duplicates_merged"] > 0
+    assert streamed["counts"]["deduped_contacts"] == batch["counts"]["deduped_contacts"]
+
+
+def test_streaming_without_dedupe_keeps_input_order():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        google_path, crm_path = _write_inputs(temp_path)
+        config = Config(batch_size=1000, dedupe_enabled=False, stream_output=True)
+        report = run_pipeline(crm_path, temp_path / "out", config, google_path=google_path)
+        rows = Path(report["outputs"][0]).read_text(encoding="utf-8-sig").splitlines()[1:]
+
+    assert len(rows) == report["counts"]["contacts_exploded_total"]
+    assert rows[0].startswith("Google 0,")
+    assert rows[-1].endswith(",5511901980000")
+
+
+def test_streaming_dedupe_rejects_unsorted_input():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        rows = [f"C{idx};11 9{idx:04d}-0000" for idx in range(1, 8)] + ["Z;11 90000-0000"]
+        crm_path.write_text("\n".join(["Nome;Telefone", *rows]) + "\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            run_pipeline(crm_path, temp_path / "out", Config(batch_size=2, stream_output=True))
+        # Batches written before the bad row are not left behind.
+        assert [path.name for path in (temp_path / "out").iterdir() if path.suffix == ".csv"] == []
+        assert not list((temp_path / "out").glob(".saida-*"))
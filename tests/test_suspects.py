@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from core.config import Config
+from core.io.suspects import SuspectIndex, SuspectSink, iter_suspects
+from core.pipeline import run_pipeline
+
+
+def test_sink_streams_everything_and_keeps_a_sample():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "suspects.jsonl"
+        with SuspectSink(path, sample_size=3) as sink:
+            for idx in range(10):
+                reason = "phone_length" if idx % 2 else "name_mojibake"
+                sink.add({"reason": reason, "source": "crm", "line": idx + 2})
+        summary = sink.summary()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        page = list(iter_suspects(path, start=4, limit=3))
+
+    assert len(lines) == 10
+    assert summary["total"] == 10
+    assert summary["by_reason"] == {"name_mojibake": 5, "phone_length": 5}
+    assert [item["line"] for item in summary["sample"]] == [2, 3, 4]
+    assert [item["line"] for item in page] == [6, 7, 8]
+
+
+def test_report_holds_aggregates_only():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        crm_path = temp_path / "crm.csv"
+        rows = ["Nome;Telefone"] + [f"Cliente {idx};{idx:06d}" for idx in range(1, 51)]
+        crm_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+        report = run_pipeline(crm_path, temp_path / "out", Config(suspects_sample_size=5), dry_run=True)
+        streamed = list(iter_suspects(report["suspects"]["file"]))
+        saved = json.loads((temp_path / "out" / "report.json").read_text(encoding="utf-8"))
+
+    assert report["counts"]["suspects"] == len(streamed) == 50
+    assert report["suspects"]["by_reason"] == {"phone_length": 50}
+    assert len(saved["suspects"]["sample"]) == 5
+
+
+def _write_suspects(path: Path, count: int) -> None:
+    with SuspectSink(path) as sink:
+        for idx in range(count):
+            sink.add(
+                {
+                    "reason": "name_mojibake" if idx % 3 == 0 else "phone_length",
+                    "source": "google" if idx % 2 else "crm",
+                    "line": idx + 2,
+                }
+            )
+
+
+def test_index_pages_lazily():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "suspects.jsonl"
+        _write_suspects(path, 1000)
+        index = SuspectIndex(path)
+        index.set_view()
+        assert index.available() == 0
+        assert index.fetch(100) == 100
+        assert index.can_fetch_more()
+        assert index.available() < 1000
+        assert index.item(99)["line"] == 101
+        while index.can_fetch_more():
+            index.fetch(300)
+        assert index.available() == 1000
+        index.close()
+
+
+def test_index_filters_and_sorts():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "suspects.jsonl"
+        _write_suspects(path, 60)
+        index = SuspectIndex(path)
+
+        index.set_view(reason="name_mojibake", source="google")
+        index.fetch(1000)
+        filtered = [index.item(row)["line"] for row in range(index.available())]
+
+        index.set_view(sort_key="source", descending=True)
+        ordered = [index.item(row) for row in range(index.available())]
+        index.close()
+
+    assert filtered == [idx + 2 for idx in range(60) if idx % 3 == 0 and idx % 2]
+    assert [item["source"] for item in ordered] == ["google"] * 30 + ["crm"] * 30
+    assert [item["line"] for item in ordered[:3]] == [3, 5, 7]
+
+
+def test_missing_inputs_leave_previous_suspects_alone():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "suspects.jsonl"
+        path.write_text('{"reason": "phone_length", "source": "crm"}\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="At least one input"):
+            run_pipeline(None, temp_dir, Config())
+        assert path.read_text(encoding="utf-8") != ""
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pstats
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.config import Config
+from core.pipeline import run_pipeline
+from core.timing import StageTimer
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_nested_stages_are_exclusive():
+    timer = StageTimer()
+
+    def slow_items():
+        for item in range(3):
+            time.sleep(0.01)
+            yield item
+
+    with timer.stage("outer"):
+        consumed = list(timer.iter("inner", slow_items()))
+    timer.add_rows("inner", len(consumed))
+    stages = timer.summary()["stages"]
+
+    assert consumed == [0, 1, 2]
+    assert stages["inner"]["wall_s"] >= 0.03
+    assert stages["outer"]["wall_s"] < stages["inner"]["wall_s"]
+    assert stages["inner"]["rows"] == 3
+
+
+def test_threads_keep_their_own_stages():
+    timer = StageTimer()
+    started = threading.Event()
+
+    def worker():
+        with timer.stage("worker"):
+            started.set()
+            time.sleep(0.05)
+
+    with timer.stage("main"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait()
+        time.sleep(0.01)
+    thread.join()
+    with timer.stage("main"):
+        pass
+    stages = timer.summary()["stages"]
+
+    assert stages["worker"]["wall_s"] >= 0.05
+    assert 0.01 <= stages["main"]["wall_s"] < 0.05
+
+
+def test_pipeline_reports_stage_timings_and_profile():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        profile_path = Path(temp_dir) / "profile.pstats"
+        report = run_pipeline(
+            FIXTURES / "crm_sample.csv",
+            temp_dir,
+            Config(),
+            google_path=FIXTURES / "google_sample.csv",
+            collect_timings=True,
+            profile_path=profile_path,
+        )
+        stats = pstats.Stats(str(profile_path))
+
+    stages = report["timings"]["stages"]
+    for name in ("prepare_csv", "read_google", "read_crm", "normalize", "dedupe", "sort", "rename", "write", "report"):
+        assert name in stages
+    assert stages["read_crm"]["rows"] == report["counts"]["crm_rows"]
+    assert report["timings"]["profile"].endswith("profile.pstats")
+    assert stats.total_calls > 0
+
+
+def test_timings_are_opt_in():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report = run_pipeline(FIXTURES / "crm_sample.csv", temp_dir, Config(), dry_run=True)
+    assert "timings" not in report
+
+
+def test_timings_and_profile_with_stage_threads():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        profile_path = Path(temp_dir) / "profile.pstats"
+        report = run_pipeline(
+            FIXTURES / "crm_sample.csv",
+            temp_dir,
+            Config(stage_threads=True),
+            google_path=FIXTURES / "google_sample.csv",
+            collect_timings=True,
+            profile_path=profile_path,
+        )
+        assert profile_path.is_file()
+
+    stages = report["timings"]["stages"]
+    for name in ("prepare_csv", "mojibake", "sort", "write"):
+        assert name in stages
+    assert all(stage["wall_s"] >= 0 and stage["cpu_s"] >= 0 for stage in stages.values())
+    assert "stages" in report
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.config import Config
+from core.io import scan
+from core.io.read_csv import ReadCancelled
+from core.io.scan import ScanCancelled
+from core.validate import validate_input
+
+
+def _write_crm(path: Path, rows: int) -> Path:
+    lines = ["Nome;Telefone;DDI;Tags;Criado em"]
+    for idx in range(rows):
+        name = f'"Cliente;\n{idx}"' if idx % 7 == 0 else f"Cliente {idx}"
+        phone = "" if idx % 11 == 0 else f" ::: 11 9{idx % 300:04d}-0000"
+        lines.append(f"{name};{phone};55;tag{idx % 3};2024-01-{idx % 28 + 1:02d}")
+    path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+    return path
+
+
+def test_preview_and_counts_come_from_one_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(scan, "SCAN_BLOCK_BYTES", 300)
+    crm_path = _write_crm(tmp_path / "crm.csv", 400)
+    events = []
+    counts = validate_input(
+        "crm", crm_path, Config(), preview_limit=20, on_preview=lambda payload: events.append(payload)
+    )
+
+    assert len(events) == 1
+    preview = events[0]
+    assert preview["info"]["delimiter"] == ";"
+    assert preview["info"]["columns"]["phone"] == "Telefone"
+    rows = preview["preview_rows"]
+    assert len(rows) == 20
+    assert rows[0] == {"name": "Cliente;\n0", "ddi": "55", "phone": "", "tags": "tag0", "created": "2024-01-01"}
+    assert rows[1] == {"name": "Cliente 1", "ddi": "55", "phone": "11 90001-0000", "tags": "tag1", "created": "2024-01-02"}
+    phones = [idx % 300 for idx in range(400) if idx % 11]
+    assert counts == {
+        "line_count": 400,
+        "without_phone": 400 - len(phones),
+        "duplicates": len(phones) - len(set(phones)),
+        "duplicates_estimated": False,
+    }
+
+
+def test_google_preview_and_short_files():
+    fixture = Path(__file__).parent / "fixtures" / "google_sample.csv"
+    events = []
+    counts = validate_input("google", fixture, Config(), preview_limit=50, on_preview=events.append)
+    rows = events[0]["preview_rows"]
+    assert rows[0]["name"] == "Maria Silva"
+    assert rows[0]["phone"] == "+55 11 91234-5678"
+    assert len(rows) == counts["line_count"] < 50
+
+
+def test_scan_can_be_cancelled(tmp_path, monkeypatch):
+    monkeypatch.setattr(scan, "CANCEL_CHECK_ROWS", 50)
+    crm_path = _write_crm(tmp_path / "crm.csv", 400)
+    previews = []
+    with pytest.raises(ScanCancelled):
+        validate_input("crm", crm_path, Config(), preview_limit=5, on_preview=previews.append, should_cancel=lambda: True)
+    assert len(previews[0]["preview_rows"]) == 5
+
+
+def test_preview_arrives_before_cancellable_encoding_check(tmp_path):
+    crm_path = _write_crm(tmp_path / "crm.csv", 400)
+    previews = []
+    # Too few rows for the scan to poll, so only the encoding check cancels.
+    with pytest.raises(ReadCancelled):
+        validate_input("crm", crm_path, Config(), preview_limit=5, on_preview=previews.append, should_cancel=lambda: True)
+    assert len(previews) == 1
+    assert previews[0]["info"]["encoding"]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+
+from core.config import Config
+from core.io.write_google_csv import GOOGLE_HEADERS, write_google_csv_batches
+from core.models import Contact
+
+
+def _contacts(count: int) -> list[Contact]:
+    return [Contact(name=f"Cliente \"{idx}\", SP", phone=f"55119{idx:08d}") for idx in range(count)]
+
+
+def test_batches_split_and_render():
+    config = Config(batch_size=3, phone_prefix_plus=True)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = write_google_csv_batches(iter(_contacts(7)), temp_dir, config)
+        assert [path.name for path in files] == ["saida_001.csv", "saida_002.csv", "saida_003.csv"]
+        raw = files[0].read_bytes()
+        assert raw.startswith(b"\xef\xbb\xbf")
+        with files[2].open(encoding="utf-8-sig", newline="") as handle:
+            rows = list(csv.reader(handle))
+    assert rows[0] == GOOGLE_HEADERS
+    assert len(rows) == 2
+    assert rows[1][0] == 'Cliente "6", SP'
+    assert rows[1][17:] == ["Mobile", "+5511900000006"]
+    assert all(value == "" for value in rows[1][1:17])
+
+
+def test_pooled_writer_matches_serial():
+    contacts = _contacts(1000)
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as pooled_dir:
+        serial = write_google_csv_batches(contacts, serial_dir, Config(batch_size=37))
+        pooled = write_google_csv_batches(iter(contacts), pooled_dir, Config(batch_size=37, workers=4))
+        assert [path.name for path in serial] == [path.name for path in pooled]
+        for left, right in zip(serial, pooled):
+            assert left.read_bytes() == right.read_bytes()
+
+
+def test_single_batch_skips_the_pool(monkeypatch):
+    import concurrent.futures
+
+    def _no_pool(*args, **kwargs):
+        raise AssertionError("pool started for a single batch")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _no_pool)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = write_google_csv_batches(iter(_contacts(5)), temp_dir, Config(batch_size=10, workers=4))
+        assert [path.name for path in files] == ["saida_001.csv"]
+        assert files[0].read_bytes().count(b"\n") == 6
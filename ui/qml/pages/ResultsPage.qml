@@ -146,6 +146,47 @@ Item {
                         color: theme.text
                     }
 
+                    RowLayout {
+                        Layout.fillWidth: true
+                        spacing: 12
+
+                        function applyFilter() {
+                            controller.suspectsModel.setFilter(
+                                reasonFilter.currentIndex > 0 ? controller.suspectReasons[reasonFilter.currentIndex - 1] : "",
+                                sourceFilter.currentIndex > 0 ? controller.suspectSources[sourceFilter.currentIndex - 1] : ""
+                            )
+                        }
+
+                        ComboBox {
+                            id: reasonFilter
+                            Layout.preferredWidth: 220
+                            model: ["Todos os motivos"].concat(controller.suspectReasons.map(reasonLabel))
+                            onActivated: parent.applyFilter()
+                        }
+                        ComboBox {
+                            id: sourceFilter
+                            Layout.preferredWidth: 160
+                            model: ["Todas as fontes"].concat(controller.suspectSources)
+                            onActivated: parent.applyFilter()
+                        }
+                        ComboBox {
+                            id: sortOrder
+                            Layout.preferredWidth: 200
+                            model: ["Ordem do arquivo", "Ordenar por motivo", "Ordenar por fonte"]
+                            onActivated: controller.suspectsModel.setSort(["", "reason", "source"][currentIndex], false)
+                        }
+                        Item { Layout.fillWidth: true }
+
+                        Connections {
+                            target: controller
+                            function onReportChanged() {
+                                reasonFilter.currentIndex = 0
+                                sourceFilter.currentIndex = 0
+                                sortOrder.currentIndex = 0
+                            }
+                        }
+                    }
+
                     Rectangle {
                         Layout.fillWidth: true
                         Layout.preferredHeight: 260
@@ -52,6 +52,12 @@ Item {
                             enabled: !controller.busy
                             onClicked: controller.startRun()
                         }
+                        AppButton {
+                            theme: theme
+                            text: "Retomar"
+                            enabled: controller.canResume
+                            onClicked: controller.resumeRun()
+                        }
                         AppButton {
                             theme: theme
                             text: "Cancelar"
@@ -60,6 +66,13 @@ Item {
                         }
                     }
 
+                    CheckBox {
+                        text: "Salvar pontos de retomada (a cada 60 s; deixa arquivos grandes mais lentos)"
+                        checked: controller.checkpointEnabled
+                        enabled: !controller.busy
+                        onToggled: controller.checkpointEnabled = checked
+                    }
+
                     ProgressBar {
                         Layout.fillWidth: true
                         from: 0
@@ -96,9 +109,9 @@ Item {
                     }
 
                     TextArea {
+                        id: logArea
                         Layout.fillWidth: true
                         Layout.preferredHeight: 260
-                        text: controller.logText
                         readOnly: true
                         wrapMode: TextArea.Wrap
                         color: theme.text
@@ -110,6 +123,31 @@ Item {
                             border.width: 1
                             radius: 8
                         }
+
+                        // Paragraphs held; lineCount would count wrapped lines.
+                        property int entries: 0
+
+                        Component.onCompleted: {
+                            text = controller.logText
+                            entries = text.length ? text.split("\n").length : 0
+                        }
+
+                        Connections {
+                            target: controller
+                            function onLogAppended(line) {
+                                logArea.append(line)
+                                logArea.entries += 1
+                                // Same cap as the controller's ring buffer.
+                                if (logArea.entries > controller.logMaxLines) {
+                                    logArea.remove(0, logArea.text.indexOf("\n") + 1)
+                                    logArea.entries -= 1
+                                }
+                            }
+                            function onLogCleared() {
+                                logArea.clear()
+                                logArea.entries = 0
+                            }
+                        }
                     }
                 }
             }